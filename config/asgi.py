@@ -9,8 +9,45 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 
 import os
 
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
 from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interview.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+def closing(wsgi_application):
+    # WsgiToAsgi never closes the response, which is what sends
+    # request_finished and so closes the database connection.
+    def application(environ, start_response):
+        response = wsgi_application(environ, start_response)
+        try:
+            yield from response
+        finally:
+            response.close()
+
+    return application
+
+
+# Django 4.1 iterates streaming responses on the event loop, where the
+# export's server-side cursor cannot run. Exports are served as WSGI on a
+# thread of their own instead.
+export_application = WsgiToAsgi(closing(get_wsgi_application()))
+
+# Imported after Django is set up, the SSE endpoint needs the app registry.
+from interview.order.sse import order_events_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Long-lived event streams are served directly so they do not tie up a
+    # Django request thread.
+    if scope['type'] == 'http' and scope['path'] == '/orders/events/':
+        return await order_events_app(scope, receive, send)
+    if scope['type'] == 'http' and scope['path'].startswith('/exports/'):
+        async with ThreadSensitiveContext():
+            return await export_application(scope, receive, send)
+
+    return await django_application(scope, receive, send)
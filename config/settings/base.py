@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 
@@ -51,8 +52,10 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'interview.core.throttling.ThrottleReleaseMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'interview.core.profiling.RequestProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -128,7 +131,282 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = 'interview/static'
 
+# Uploads waiting for a background job, shared with the workers.
+MEDIA_ROOT = BASE_DIR.parent / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Facet counts
+# Unfiltered counter caches are adjusted on writes and re-primed after this
+# timeout to correct any drift; filtered counts are memoized briefly. Both
+# live in the shared FACETS_CACHE_ALIAS cache (see Caches below).
+
+FACETS_CACHE_ALIAS = 'facets'
+FACETS_COUNTER_TIMEOUT = 60 * 60
+FACETS_FILTERED_TIMEOUT = 30
+
+
+# Inventory upsert
+# Natural keys the upsert API and CSV import can match on, as field paths
+# into the item payload (dotted paths reach into metadata). Every title
+# stores each key its values provide, so items match on any of them.
+
+INVENTORY_NATURAL_KEYS = {
+    'name_type_language': ('name', 'type', 'language'),
+    'external_id': ('metadata.external_id',),
+}
+INVENTORY_DEFAULT_NATURAL_KEY = 'name_type_language'
+INVENTORY_UPSERT_BATCH_SIZE = 1000
+
+
+# Change feeds
+# Rows written after the start of the oldest open transaction, and within
+# CHANGES_FEED_SAFETY_LAG seconds before it, are held back so transactions
+# that commit out of timestamp order are not skipped. Tombstones are pruned
+# after CHANGES_FEED_TOMBSTONE_DAYS by the `core.prune_tombstones` job, and
+# since tokens that have not read them by then expire (410).
+
+CHANGES_FEED_PAGE_SIZE = 100
+CHANGES_FEED_MAX_PAGE_SIZE = 1000
+CHANGES_FEED_SAFETY_LAG = 2
+CHANGES_FEED_TOMBSTONE_DAYS = 30
+
+
+# Order events
+# Server-Sent Events for orders are served by config.asgi at /orders/events/.
+
+ORDER_EVENTS_CHANNEL = 'order_events'
+ORDER_EVENTS_QUEUE_SIZE = 1000
+ORDER_EVENTS_HEARTBEAT = 15
+
+
+# Background jobs
+# Run with `python manage.py run_worker`. Handlers are resolved lazily by
+# dotted path when a job of that kind is picked up.
+
+JOB_HANDLERS = {
+    'core.prune_tombstones': 'interview.core.jobs.prune_tombstones',
+    'core.reseed': 'interview.core.jobs.reseed',
+    'inventory.import': 'interview.inventory.jobs.bulk_import',
+    'inventory.import_csv': 'interview.inventory.jobs.import_csv',
+    'inventory.purge': 'interview.inventory.jobs.purge',
+    'inventory.similarity': 'interview.inventory.jobs.similarity',
+    'order.archive': 'interview.order.jobs.archive',
+    'order.deactivate': 'interview.order.jobs.bulk_deactivate',
+    'order.expire_embargoes': 'interview.order.jobs.expire_embargoes',
+}
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30
+JOB_TIMEOUT = 10 * 60
+JOB_POLL_INTERVAL = 1.0
+# Periodic jobs the worker queues itself, kind to interval in seconds.
+JOB_SCHEDULES = {
+    'core.prune_tombstones': 24 * 60 * 60,
+    'inventory.similarity': 60,
+    'order.expire_embargoes': 5 * 60,
+}
+
+ORDER_DEACTIVATE_BATCH_SIZE = 500
+
+
+# Order partitions
+# order_order is range partitioned on start_date. `manage.py order_partitions`
+# keeps ORDER_PARTITION_PREMAKE future partitions ahead of today.
+
+ORDER_PARTITION_INTERVAL = 'month'
+ORDER_PARTITION_PREMAKE = 12
+
+
+# Order archive
+# Orders inactive (by updated_at) for this many days are moved to the archive
+# table by `manage.py archive_orders` or the `order.archive` job.
+
+ORDER_ARCHIVE_INACTIVE_DAYS = 180
+ORDER_ARCHIVE_BATCH_SIZE = 1000
+
+
+# Order calendar
+# `GET orders/calendar/?start=&end=&bucket=day|week` counts orders starting
+# and hitting embargo per period and tag. Periods that ended more than
+# ORDER_CALENDAR_ROLLUP_DELAY days ago are stored as rollups on first read;
+# `manage.py clear_order_calendar` drops them after backdated bulk edits.
+
+ORDER_CALENDAR_MAX_PERIODS = 400
+ORDER_CALENDAR_ROLLUP_DELAY = 1
+
+
+# Embargo expiry
+# Active orders whose embargo_date has passed are deactivated by the
+# `order.expire_embargoes` job (scheduled in JOB_SCHEDULES) or
+# `manage.py expire_embargoes`, ORDER_EMBARGO_BATCH_SIZE rows per UPDATE.
+
+ORDER_EMBARGO_BATCH_SIZE = 500
+
+
+# Inventory purge
+# DELETE on inventory only soft deletes; `manage.py purge_inventory` or the
+# `inventory.purge` job removes rows past the grace period, in chunks.
+
+INVENTORY_PURGE_GRACE_DAYS = 7
+INVENTORY_PURGE_CHUNK_SIZE = 500
+
+
+# Table exports
+# Bulk exports for analytics. Parquet and Arrow need pyarrow, requests for
+# them fail with a 400 without it, including when EXPORT_DEFAULT_FORMAT is
+# one of them.
+
+EXPORT_TABLES = {
+    'inventory': 'interview.inventory.export.inventory_export',
+    'orders': 'interview.order.export.order_export',
+}
+EXPORT_DEFAULT_FORMAT = 'csv'
+EXPORT_CHUNK_SIZE = 10000
+EXPORT_MAX_CHUNK_SIZE = 100000
+
+
+# Inventory CSV import
+# Uploads are stored under INVENTORY_CSV_UPLOAD_DIR in the default storage
+# and imported by an `inventory.import_csv` job: rows are validated in
+# batches and loaded with COPY into a staging table, then merged on the
+# natural key. Tags are names joined by INVENTORY_CSV_TAG_SEPARATOR.
+
+INVENTORY_CSV_UPLOAD_DIR = 'imports/inventory'
+INVENTORY_CSV_BATCH_SIZE = 10000
+INVENTORY_CSV_TAG_SEPARATOR = '|'
+INVENTORY_CSV_MAX_ERRORS = 100
+
+
+# Query budgets
+# Views declare `query_budget`; QueryBudgetMiddleware logs ('log') or fails
+# ('raise') requests that exceed it. Off unless a mode is set.
+
+QUERY_BUDGET_MODE = None
+QUERY_BUDGET_STACK_DEPTH = 6
+
+
+# Request profiler
+# Opt-in per request through a signed REQUEST_PROFILER_HEADER token
+# (`manage.py profile_token`) or `?profile=1` for staff, plus a random
+# sample of REQUEST_PROFILER_SAMPLE_PATHS. Disabled, the middleware unloads.
+
+REQUEST_PROFILER_ENABLED = False
+REQUEST_PROFILER_HEADER = 'X-Profile'
+REQUEST_PROFILER_TOKEN_MAX_AGE = 3600
+REQUEST_PROFILER_MODE = 'sampling'
+REQUEST_PROFILER_INTERVAL = 0.005
+REQUEST_PROFILER_SAMPLE_RATE = 0.0
+REQUEST_PROFILER_SAMPLE_PATHS = ['/orders/']
+REQUEST_PROFILER_DIR = BASE_DIR.parent / 'profiles'
+
+
+# Caches
+# `responses` holds rendered list responses and `facets` the facet counters,
+# both shared by all workers: on disk by default, in Redis when REDIS_URL is
+# set (where counter increments are also atomic). `throttle` holds the rate
+# limit counters, per process unless REDIS_URL is set.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR.parent / '.cache' / 'responses',
+    },
+    'facets': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR.parent / '.cache' / 'facets',
+    },
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+    },
+}
+if os.environ.get('REDIS_URL'):
+    for alias in ('responses', 'facets', 'throttle'):
+        CACHES[alias] = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = 60
+RESPONSE_CACHE_STALE_TIMEOUT = 300
+RESPONSE_CACHE_LOCK_TIMEOUT = 30
+RESPONSE_CACHE_LOCK_WAIT = 5
+
+
+# Multi-get
+# `?ids=1,2,3` on the inventory and order lists.
+
+MULTIGET_MAX_IDS = 500
+
+
+# Batch PATCH
+# `PATCH inventory/batch/` and `orders/batch/` apply up to BATCH_PATCH_MAX_ITEMS
+# partial updates in one transaction, written BATCH_PATCH_UPDATE_SIZE rows per
+# UPDATE statement.
+
+BATCH_PATCH_MAX_ITEMS = 5000
+BATCH_PATCH_UPDATE_SIZE = 1000
+
+
+# Throttling
+# Views pick a scope with `throttle_scope` (a name, or a dict keyed by
+# method). `rate` and `burst` configure a token bucket per client, and
+# `concurrency` caps a client's requests in flight for the scope.
+
+REST_FRAMEWORK = {
+    'DEFAULT_THROTTLE_CLASSES': [
+        'interview.core.throttling.TokenBucketThrottle',
+        'interview.core.throttling.ConcurrencyThrottle',
+    ],
+}
+
+THROTTLES = {
+    'expensive': {'rate': '60/min', 'burst': 10, 'concurrency': 2},
+    'cheap': {'rate': '1200/min', 'burst': 100},
+}
+THROTTLE_CACHE_ALIAS = 'throttle'
+THROTTLE_BUCKET_TIMEOUT = 24 * 60 * 60
+THROTTLE_CONCURRENCY_TIMEOUT = 300
+
+
+# Estimated counts
+# Admin changelists and paginated lists (`?limit=&offset=`) count large
+# tables from pg_class or the query plan; below this estimate an exact
+# COUNT(*) is cheap enough to run. API counts are cached per query.
+
+ESTIMATED_COUNT_THRESHOLD = 10000
+COUNT_CACHE_TIMEOUT = 300
+PAGINATION_MAX_LIMIT = 1000
+
+
+# Fan-out
+# Independent read queries (e.g. assembling an /orders/ page) run on a
+# shared pool of FAN_OUT_WORKERS threads, each holding its own database
+# connection. 0 runs them one after another in the request thread.
+
+FAN_OUT_WORKERS = 4
+
+
+# Related titles
+# `GET inventory/<id>/related/` reads the SIMILARITY_TOP_K neighbours stored
+# per title. The `inventory.similarity` job (scheduled in JOB_SCHEDULES)
+# refreshes titles written since its last run and rebuilds everything every
+# SIMILARITY_REBUILD_INTERVAL seconds, or when queued with `{"full": true}`.
+# Titles score by shared actors and tags (weighted by rarity, features on
+# more than SIMILARITY_MAX_POSTINGS titles are ignored), same type and
+# release years within SIMILARITY_YEAR_WINDOW.
+
+SIMILARITY_TOP_K = 20
+SIMILARITY_WEIGHTS = {'actor': 1.0, 'tag': 0.5, 'type': 0.5, 'year': 0.5}
+SIMILARITY_YEAR_WINDOW = 10
+SIMILARITY_MAX_POSTINGS = 1000
+SIMILARITY_BATCH_SIZE = 500
+SIMILARITY_REBUILD_INTERVAL = 24 * 60 * 60
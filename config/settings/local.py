@@ -1 +1,5 @@
-from .base import *
\ No newline at end of file
+from .base import *
+
+MIDDLEWARE = [*MIDDLEWARE, 'interview.core.querybudget.QueryBudgetMiddleware']
+
+QUERY_BUDGET_MODE = 'log'
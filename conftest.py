@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+from rest_framework.test import APIClient
+
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryTag, InventoryType
+from interview.order.models import Order, OrderTag
+
+
+pytest_plugins = ['interview.core.pytest_plugin']
+
+METADATA = {'year': 1979, 'actors': ['Sigourney Weaver'], 'imdb_rating': 8.5, 'rotten_tomatoes_rating': 98}
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def inventory_type(db):
+    return InventoryType.objects.create(name='Movie')
+
+
+@pytest.fixture
+def inventory_language(db):
+    return InventoryLanguage.objects.create(name='English')
+
+
+@pytest.fixture
+def inventory_tag(db):
+    return InventoryTag.objects.create(name='Classic')
+
+
+@pytest.fixture
+def order_tag(db):
+    return OrderTag.objects.create(name='QC')
+
+
+@pytest.fixture
+def make_inventory(inventory_type, inventory_language):
+    def make(name='Alien', metadata=None, **kwargs):
+        return Inventory.objects.create(
+            name=name,
+            type=kwargs.pop('type', inventory_type),
+            language=kwargs.pop('language', inventory_language),
+            metadata=dict(METADATA) if metadata is None else metadata,
+            **kwargs,
+        )
+    return make
+
+
+@pytest.fixture
+def inventory(make_inventory):
+    return make_inventory()
+
+
+@pytest.fixture
+def make_order(inventory):
+    def make(start_date=datetime.date(2023, 1, 10), embargo_date=datetime.date(2023, 2, 10), **kwargs):
+        return Order.objects.create(
+            inventory=kwargs.pop('inventory', inventory), start_date=start_date, embargo_date=embargo_date, **kwargs
+        )
+    return make
+
+
+@pytest.fixture
+def order(make_order):
+    return make_order()
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+PRECONDITION_FIELDS = ('id', 'updated_at')
+
+
+class BatchPatchError(ValueError):
+    status = 400
+
+    def __init__(self, message: str, errors: list = None):
+        self.errors = errors or []
+        super().__init__(message)
+
+
+class BatchPatchConflict(BatchPatchError):
+    status = 409
+
+
+def apply_batch_patch(queryset, patches: list, validate=None, batch_size: int = None) -> dict:
+    """
+    Apply partial updates to many rows of ``queryset`` in one transaction.
+
+    ``patches`` are dicts of field names to new values plus the row ``id``
+    and, optionally, the ``updated_at`` the client last read. The rows are
+    locked, every ``updated_at`` precondition is checked and
+    ``validate(rows, patches)`` may reject or normalize the batch before
+    anything is written. Patches are then grouped by the set of fields they
+    actually change and each group is written with ``bulk_update``, so the
+    statement count depends on the field combinations, not the patch count.
+    Nothing is written unless every patch applies. ``changed`` in the result
+    maps each updated id to the attnames that changed.
+    """
+    model = queryset.model
+    batch_size = batch_size or settings.BATCH_PATCH_UPDATE_SIZE
+    ids = [patch['id'] for patch in patches]
+
+    with transaction.atomic():
+        # Locked in id order so concurrent batches cannot deadlock each other.
+        rows = queryset.select_for_update(of=('self',)).order_by('pk').in_bulk(ids)
+        missing = [pk for pk in ids if pk not in rows]
+        if missing:
+            raise BatchPatchError('Unknown ids', [{'id': pk, 'error': 'Not found'} for pk in missing])
+
+        conflicts = [
+            {'id': patch['id'], 'updated_at': rows[patch['id']].updated_at}
+            for patch in patches
+            if patch.get('updated_at') is not None and patch['updated_at'] != rows[patch['id']].updated_at
+        ]
+        if conflicts:
+            raise BatchPatchConflict('Rows were modified since they were read', conflicts)
+
+        if validate is not None:
+            validate(rows, patches)
+
+        now = timezone.now()
+        groups, unchanged = {}, []
+        for patch in patches:
+            row = rows[patch['id']]
+            changed = []
+            for name, value in patch.items():
+                if name in PRECONDITION_FIELDS:
+                    continue
+                attname = model._meta.get_field(name).attname
+                if getattr(row, attname) != value:
+                    setattr(row, attname, value)
+                    changed.append(attname)
+            if not changed:
+                unchanged.append(row.pk)
+                continue
+            row.updated_at = now
+            groups.setdefault(tuple(sorted(changed)), []).append(row)
+
+        for fields, group in groups.items():
+            model._base_manager.bulk_update(group, [*fields, 'updated_at'], batch_size=batch_size)
+
+    return {
+        'updated': [row.pk for group in groups.values() for row in group],
+        'unchanged': unchanged,
+        'updated_at': now,
+        'changed': {row.pk: fields for fields, group in groups.items() for row in group},
+    }
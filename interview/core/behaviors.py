@@ -1,5 +1,8 @@
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.utils import timezone
+
+from interview.core.signals import is_active_changed, soft_deleted
 
 
 class UUIDModel(models.Model):
@@ -23,6 +26,10 @@ class TimestampedModel(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def touch(cls, pks):
+        return cls.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+
 
 class IsActiveModel(models.Model):
     is_active = models.BooleanField(default=True)
@@ -32,11 +39,57 @@ class IsActiveModel(models.Model):
     
     @classmethod
     def activate(cls, pk: int):
-        cls.objects.filter(pk=pk).update(is_active=False)
+        cls.set_is_active([pk], True)
     
     @classmethod
     def deactivate(cls, pk: int):
-        cls.objects.filter(pk=pk).update(is_active=True)
+        cls.set_is_active([pk], False)
+
+    @classmethod
+    def set_is_active(cls, pks: list, is_active: bool) -> int:
+        updated = cls.objects.filter(pk__in=pks).update(is_active=is_active, **cls._touch_fields())
+        is_active_changed.send(sender=cls, pks=pks, is_active=is_active)
+        return updated
+
+    @classmethod
+    def _touch_fields(cls) -> dict:
+        # update() skips auto_now, keep updated_at moving for change feeds.
+        if issubclass(cls, TimestampedModel):
+            return {'updated_at': timezone.now()}
+        return {}
+        
+
+class SoftDeleteQuerySet(models.QuerySet):
+
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def dead(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
+class SoftDeleteModel(models.Model):
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        update_fields = ['deleted_at']
+        if isinstance(self, TimestampedModel):
+            update_fields.append('updated_at')
+        self.save(update_fields=update_fields)
+        soft_deleted.send(sender=type(self), instance=self)
         
 
 class NameModel(models.Model):
@@ -0,0 +1,137 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from interview.core.horizon import change_horizon
+from interview.core.models import Tombstone
+
+
+class ExpiredToken(ValueError):
+    pass
+
+
+def prune_tombstones(retention_days: int, batch_size: int = 10000) -> dict:
+    """
+    Delete tombstones older than ``retention_days``, ``batch_size`` per
+    transaction. Since tokens that have not caught up with them expire.
+    """
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    pruned = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Tombstone.objects.filter(deleted_at__lt=cutoff).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return {'pruned': pruned}
+            pruned += Tombstone.objects.filter(id__in=ids).delete()[0]
+
+
+def encode_token(cursor: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode()).decode()
+
+
+def decode_token(token: str) -> dict:
+    """
+    ``u`` is the ``(updated_at, id)`` keyset position, ``d`` the last
+    tombstone id and ``t`` a lower bound for the ``deleted_at`` of the
+    tombstones not read yet.
+    """
+    if not token:
+        return {'u': None, 'd': 0, 't': None}
+
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+        updated = cursor['u']
+        if updated is not None:
+            updated = [parse_datetime(updated[0]), int(updated[1])]
+            if updated[0] is None:
+                raise ValueError
+        # Tokens issued before tombstones were pruned have no ``t``.
+        tombstones = parse_datetime(cursor['t']) if cursor.get('t') else None
+        decoded = {'u': updated, 'd': int(cursor['d']), 't': tombstones}
+    except (ValueError, KeyError, TypeError, IndexError):
+        raise ValueError('Invalid since token')
+
+    cutoff = timezone.now() - timedelta(days=settings.CHANGES_FEED_TOMBSTONE_DAYS)
+    if tombstones is not None and tombstones < cutoff:
+        raise ExpiredToken('Since token expired, deletions it has not seen were pruned. Sync again without it.')
+
+    return decoded
+
+
+class ChangeFeedView(APIView):
+    """
+    Rows created, updated or deleted since an opaque ``since`` token.
+
+    Upserts are read by keyset on ``(updated_at, id)`` and deletes from the
+    tombstone table by id, so a sync costs O(changes). Rows past the
+    ``change_horizon`` are held back so transactions that commit out of
+    timestamp order are not skipped. Tokens expire once tombstones they
+    have not read are pruned (``CHANGES_FEED_TOMBSTONE_DAYS``).
+    """
+    resource = None
+    queryset = None
+    serializer_class = None
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            cursor = decode_token(request.query_params.get('since'))
+            limit = int(request.query_params.get('limit', settings.CHANGES_FEED_PAGE_SIZE))
+        except ExpiredToken as e:
+            return Response({'error': str(e)}, status=410)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        limit = max(1, min(limit, settings.CHANGES_FEED_MAX_PAGE_SIZE))
+
+        horizon = change_horizon()
+        queryset = self.get_queryset().filter(updated_at__lte=horizon)
+        if cursor['u'] is not None:
+            updated_at, last_id = cursor['u']
+            queryset = queryset.filter(
+                Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id),
+                updated_at__gte=updated_at,
+            )
+        changed = list(queryset.order_by('updated_at', 'id')[:limit + 1])
+
+        # Tombstone ids are taken at insert time too, so they are held back
+        # by the same horizon.
+        deleted = list(
+            Tombstone.objects.filter(resource=self.resource, id__gt=cursor['d'], deleted_at__lte=horizon)
+            .order_by('id')[:limit + 1]
+        )
+
+        has_more = len(changed) > limit or len(deleted) > limit
+        changed, deleted = changed[:limit], deleted[:limit]
+        if changed:
+            cursor['u'] = [changed[-1].updated_at.isoformat(), changed[-1].id]
+        elif cursor['u'] is not None:
+            cursor['u'] = [cursor['u'][0].isoformat(), cursor['u'][1]]
+        if deleted:
+            cursor['d'] = deleted[-1].id
+        # Unread tombstones were written after the last one read, or after
+        # the horizon when every visible one has been read.
+        tombstones = deleted[-1].deleted_at if len(deleted) == limit else horizon
+        cursor['t'] = tombstones.isoformat()
+
+        return Response({
+            'changed': self.serializer_class(changed, many=True).data,
+            'deleted': [
+                {'id': tombstone.object_id, 'deleted_at': tombstone.deleted_at}
+                for tombstone in deleted
+            ],
+            'next': encode_token(cursor),
+            'has_more': has_more,
+        }, status=200)
+
+    def get_queryset(self):
+        return self.queryset.all()
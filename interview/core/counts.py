@@ -0,0 +1,94 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from interview.core.response_cache import response_cache
+
+
+def table_estimate(model, using: str = 'default') -> int:
+    """
+    Row estimate for ``model``'s table from ``pg_class.reltuples``, summed
+    over the partitions of a partitioned table. Kept current by autovacuum.
+    """
+    with connections[using].cursor() as cursor:
+        # A partitioned parent is only analyzed manually, sum its partitions.
+        cursor.execute(
+            '''
+            SELECT CASE WHEN parent.relkind = 'p' THEN (
+                SELECT coalesce(sum(greatest(partition.reltuples, 0)), 0) FROM pg_inherits
+                JOIN pg_class partition ON partition.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = parent.oid
+            ) ELSE greatest(parent.reltuples, 0) END::bigint
+            FROM pg_class parent WHERE parent.oid = %s::regclass
+            ''',
+            [model._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def plan_estimate(queryset) -> int:
+    """The planner's row estimate for ``queryset``, from ``EXPLAIN``."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset) -> tuple:
+    """
+    ``(count, exact)`` for ``queryset`` without a full ``COUNT(*)`` on large
+    tables.
+
+    Unfiltered querysets use the table statistics and filtered ones the
+    planner's estimate. When the estimate is below
+    ``ESTIMATED_COUNT_THRESHOLD`` an exact count is cheap and used instead.
+    Other databases always count exactly.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count(), True
+
+    if not queryset.query.where and not queryset.query.distinct and not queryset.query.is_sliced:
+        estimate = table_estimate(queryset.model, queryset.db)
+    else:
+        estimate = plan_estimate(queryset)
+    if estimate < settings.ESTIMATED_COUNT_THRESHOLD:
+        return queryset.count(), True
+
+    return estimate, False
+
+
+def cached_count(queryset, tags=(), timeout: int = None) -> tuple:
+    """
+    ``estimated_count`` memoized in the shared response cache for
+    ``COUNT_CACHE_TIMEOUT`` seconds. The key includes the current versions
+    of the response cache ``tags``, so writes that invalidate a list's
+    responses also drop its counts.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha1(repr((sql, params, response_cache.tag_versions(tags))).encode()).hexdigest()
+    key = f'count:{queryset.db}:{digest}'
+
+    cached = response_cache.cache.get(key)
+    if cached is not None:
+        return tuple(cached)
+    result = estimated_count(queryset)
+    response_cache.cache.set(key, result, timeout=timeout or settings.COUNT_CACHE_TIMEOUT)
+
+    return result
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose ``count`` comes from ``estimated_count``, for admin changelists."""
+
+    @cached_property
+    def count(self) -> int:
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        return estimated_count(self.object_list)[0]
@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+# Format name -> (content type, file extension).
+EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    'csv': ('text/csv', 'csv'),
+}
+
+
+@lru_cache(maxsize=None)
+def load_pyarrow():
+    """pyarrow is optional and slow to import, load it on the first Arrow or Parquet export."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        return None
+
+    return pyarrow
+
+
+def _to_int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_string(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+
+def _to_string_list(value):
+    if not isinstance(value, list):
+        return None
+    return [_to_string(item) for item in value]
+
+
+COLUMN_CASTS = {
+    'int': _to_int,
+    'float': _to_float,
+    'string': _to_string,
+    'int_list': lambda value: list(value) if value is not None else None,
+    'string_list': _to_string_list,
+}
+
+
+class Column:
+    """
+    One output column. ``source`` names the key in the ``.values()`` row, or
+    pass ``get`` to derive the value from the whole row.
+    """
+
+    def __init__(self, name: str, type: str, source: str = None, get=None):
+        self.name = name
+        self.type = type
+        self.get = get or (lambda row, key=source or name: row[key])
+        self.cast = COLUMN_CASTS.get(type)
+
+    def value(self, row: dict):
+        value = self.get(row)
+        return self.cast(value) if self.cast is not None else value
+
+    def arrow_type(self):
+        pyarrow = load_pyarrow()
+        return {
+            'int': pyarrow.int64(),
+            'float': pyarrow.float64(),
+            'string': pyarrow.string(),
+            'bool': pyarrow.bool_(),
+            'date': pyarrow.date32(),
+            'timestamp': pyarrow.timestamp('us', tz='UTC'),
+            'int_list': pyarrow.list_(pyarrow.int64()),
+            'string_list': pyarrow.list_(pyarrow.string()),
+        }[self.type]
+
+
+class TableExport:
+    """
+    A table exposed for bulk export.
+
+    ``queryset`` is a callable returning a ``.values()`` queryset; rows are
+    read through a server-side cursor and handed out as columnar chunks so
+    memory stays bounded by ``chunk_size`` whatever the table size.
+    """
+
+    def __init__(self, name: str, queryset, columns: list):
+        self.name = name
+        self.queryset = queryset
+        self.columns = columns
+
+    def chunks(self, chunk_size: int):
+        # Inside a transaction the named cursor is not declared WITH HOLD, so
+        # PostgreSQL streams rows instead of materializing the result first.
+        with transaction.atomic():
+            chunk = []
+            for row in self.queryset().iterator(chunk_size=chunk_size):
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield self._columnar(chunk)
+                    chunk = []
+            if chunk:
+                yield self._columnar(chunk)
+
+    def _columnar(self, rows: list) -> dict:
+        return {column.name: [column.value(row) for row in rows] for column in self.columns}
+
+
+class ExportSink:
+    """Write-only file object that buffers output until it is drained."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.buffer.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+
+class CSVWriter:
+
+    def __init__(self, sink: ExportSink, columns: list):
+        self.sink = sink
+        self.text = io.StringIO()
+        self.writer = csv.writer(self.text)
+        self.write_rows([[column.name for column in columns]])
+
+    def write(self, chunk: dict) -> None:
+        self.write_rows(zip(*[[self._cell(value) for value in values] for values in chunk.values()]))
+
+    def write_rows(self, rows) -> None:
+        self.writer.writerows(rows)
+        self.sink.write(self.text.getvalue().encode())
+        self.text.seek(0)
+        self.text.truncate()
+
+    def close(self) -> None:
+        pass
+
+    def _cell(self, value):
+        if isinstance(value, list):
+            return json.dumps(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+
+class ArrowWriter:
+
+    def __init__(self, sink: ExportSink, columns: list):
+        self.pyarrow = pyarrow = load_pyarrow()
+        self.schema = pyarrow.schema([(column.name, column.arrow_type()) for column in columns])
+        self.writer = pyarrow.ipc.new_stream(sink, self.schema)
+
+    def write(self, chunk: dict) -> None:
+        self.writer.write_batch(self.pyarrow.RecordBatch.from_pydict(chunk, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ParquetWriter:
+
+    def __init__(self, sink: ExportSink, columns: list):
+        self.pyarrow = pyarrow = load_pyarrow()
+        self.schema = pyarrow.schema([(column.name, column.arrow_type()) for column in columns])
+        self.writer = pyarrow.parquet.ParquetWriter(sink, self.schema, compression='zstd')
+
+    def write(self, chunk: dict) -> None:
+        # Each chunk becomes one row group.
+        self.writer.write_table(self.pyarrow.Table.from_pydict(chunk, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+WRITERS = {'parquet': ParquetWriter, 'arrow': ArrowWriter, 'csv': CSVWriter}
+
+
+def get_table_export(name: str) -> TableExport:
+    if name not in settings.EXPORT_TABLES:
+        raise LookupError(f'Unknown export table "{name}"')
+
+    return import_string(settings.EXPORT_TABLES[name])
+
+
+def resolve_format(name: str = None) -> str:
+    """Validate an export format. Without one the configured default is used."""
+    name = name or settings.EXPORT_DEFAULT_FORMAT
+    if name not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export format "{name}", expected one of {", ".join(EXPORT_FORMATS)}')
+    if name != 'csv' and load_pyarrow() is None:
+        raise ValueError(f'The {name} format requires pyarrow, use csv instead')
+
+    return name
+
+
+def stream_export(table: TableExport, format: str, chunk_size: int = None):
+    """Yield the encoded export of ``table`` one chunk at a time."""
+    sink = ExportSink()
+    writer = WRITERS[format](sink, table.columns)
+    for chunk in table.chunks(chunk_size or settings.EXPORT_CHUNK_SIZE):
+        writer.write(chunk)
+        data = sink.drain()
+        if data:
+            yield data
+
+    writer.close()
+    yield sink.drain()
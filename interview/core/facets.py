@@ -0,0 +1,197 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count
+
+
+FACETS_CACHE_PREFIX = 'facets'
+
+
+def facets_cache():
+    # Shared by every worker, so adjustments made by one are seen by all.
+    return caches[settings.FACETS_CACHE_ALIAS]
+
+
+class FacetCounter:
+    """
+    Counter cache for one facet dimension (a FK or M2M field) of a model.
+
+    Unfiltered counts live in the shared facets cache as one integer per value,
+    primed with a single GROUP BY and then adjusted in place with ``incr`` on
+    writes.
+    Changes that cannot be applied incrementally drop the index so the next
+    read re-primes the dimension.
+    """
+
+    def __init__(self, scope: str, dimension: str, model, field: str, base_filters: dict = None):
+        self.scope = scope
+        self.dimension = dimension
+        self.model = model
+        self.field = field
+        self.base_filters = base_filters or {}
+
+    @property
+    def index_key(self) -> str:
+        return f'{FACETS_CACHE_PREFIX}:{self.scope}:{self.dimension}'
+
+    def value_key(self, value_id) -> str:
+        return f'{self.index_key}:{value_id}'
+
+    def compute(self, queryset=None) -> dict:
+        base = self.model.objects.filter(**self.base_filters)
+        if queryset is not None:
+            # Filtering on the counted relation inside the same query would
+            # make Django reuse that join and only count the filtered values.
+            base = base.filter(pk__in=queryset.values('pk'))
+
+        rows = (
+            base.order_by()
+            .filter(**{f'{self.field}__isnull': False})
+            .values_list(self.field)
+            .annotate(count=Count('pk', distinct=True))
+        )
+        return dict(rows)
+
+    def counts(self) -> dict:
+        cache = facets_cache()
+        index = cache.get(self.index_key)
+        if index is not None:
+            values = cache.get_many([self.value_key(value_id) for value_id in index])
+            if len(values) == len(index):
+                return {value_id: values[self.value_key(value_id)] for value_id in index}
+
+        return self.prime()
+
+    def prime(self) -> dict:
+        counts = self.compute()
+        timeout = settings.FACETS_COUNTER_TIMEOUT
+        cache = facets_cache()
+        cache.set_many({self.value_key(k): v for k, v in counts.items()}, timeout=timeout)
+        cache.set(self.index_key, list(counts), timeout=timeout)
+
+        return counts
+
+    def invalidate(self) -> None:
+        transaction.on_commit(lambda: facets_cache().delete(self.index_key))
+
+    def adjust(self, value_id, delta: int) -> None:
+        if value_id is None or not delta:
+            return
+
+        def apply():
+            cache = facets_cache()
+            try:
+                cache.incr(self.value_key(value_id), delta)
+            except ValueError:
+                # Value was never primed (new value or evicted key).
+                cache.delete(self.index_key)
+
+        transaction.on_commit(apply)
+
+    @property
+    def removed_attribute(self) -> str:
+        return f'_{FACETS_CACHE_PREFIX}_{self.scope}_{self.dimension}_removed'
+
+    def linked(self, instance, reverse: bool, pk_set) -> set:
+        """The ids in ``pk_set`` that ``instance`` is currently linked to."""
+        field = self.model._meta.get_field(self.field)
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        if reverse:
+            source, target = target, source
+
+        links = field.remote_field.through.objects.filter(**{source: instance.pk, f'{target}__in': pk_set})
+        return set(links.values_list(target, flat=True))
+
+    def m2m_changed(self, action: str, instance, reverse: bool, pk_set) -> None:
+        if action == 'pre_remove':
+            # Django passes every requested id to remove(), linked or not, and
+            # the links are gone by post_remove, so the real ones are kept here.
+            setattr(instance, self.removed_attribute, self.linked(instance, reverse, pk_set))
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+
+        if action == 'post_clear':
+            self.invalidate()
+            return
+
+        delta = 1
+        if action == 'post_remove':
+            delta = -1
+            pk_set = instance.__dict__.pop(self.removed_attribute, set())
+        if reverse:
+            self.adjust(instance.pk, delta * len(pk_set))
+        else:
+            for value_id in pk_set:
+                self.adjust(value_id, delta)
+
+
+class FacetSet:
+    """
+    The facet dimensions exposed for one model, keyed by dimension name.
+    ``base_filters`` restrict the counted rows to the ones the model's list
+    shows.
+    """
+
+    def __init__(self, scope: str, model, base_filters: dict = None, **dimensions):
+        self.scope = scope
+        self.model = model
+        self.counters = {
+            dimension: FacetCounter(scope, dimension, model, field, base_filters)
+            for dimension, field in dimensions.items()
+        }
+
+    def __getitem__(self, dimension: str) -> FacetCounter:
+        return self.counters[dimension]
+
+    def invalidate(self) -> None:
+        for counter in self.counters.values():
+            counter.invalidate()
+
+    def counts(self, queryset=None, filters: dict = None) -> dict:
+        if not filters:
+            return {dimension: counter.counts() for dimension, counter in self.counters.items()}
+
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+        key = f'{FACETS_CACHE_PREFIX}:{self.scope}:filtered:{digest}'
+        result = facets_cache().get(key)
+        if result is None:
+            result = {dimension: counter.compute(queryset) for dimension, counter in self.counters.items()}
+            facets_cache().set(key, result, settings.FACETS_FILTERED_TIMEOUT)
+
+        return result
+
+
+def parse_facet_filters(query_params, allowed: dict) -> dict:
+    """
+    Turn ``?type=1&tags=2,3`` into ORM lookups using the ``allowed`` mapping of
+    query parameter to lookup. Raises ``ValueError`` on malformed ids.
+    """
+    filters = {}
+    for param, lookup in allowed.items():
+        raw = query_params.get(param)
+        if raw in (None, ''):
+            continue
+
+        if lookup.endswith('__in'):
+            filters[lookup] = sorted({int(value) for value in raw.split(',') if value})
+        elif lookup.endswith('is_active'):
+            filters[lookup] = raw.lower() in ('1', 'true', 'yes')
+        else:
+            filters[lookup] = int(raw)
+
+    return filters
+
+
+def serialize_counts(counts: dict) -> dict:
+    return {
+        dimension: [
+            {'id': value_id, 'count': count}
+            for value_id, count in sorted(values.items(), key=lambda item: (-item[1], item[0]))
+            if count > 0
+        ]
+        for dimension, values in counts.items()
+    }
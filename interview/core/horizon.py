@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+
+# The start of the oldest transaction open on another connection that has
+# written (holds a transaction id). Its rows can still commit with
+# updated_at (or deleted_at) values from that point on. Read-only ones, like
+# a long export, commit nothing and do not hold the feeds back.
+HORIZON_SQL = '''
+SELECT min(xact_start) FROM pg_stat_activity
+WHERE datname = current_database() AND pid <> pg_backend_pid()
+AND backend_type = 'client backend' AND xact_start IS NOT NULL
+AND backend_xid IS NOT NULL
+'''
+
+
+def change_horizon(using: str = 'default'):
+    """
+    Rows written before this instant are safe to hand out by timestamp.
+
+    ``updated_at`` is taken when a statement runs, not when its transaction
+    commits, so a long transaction (an upsert batch, an import, a job) can
+    commit rows older than ones already read. The horizon stays behind the
+    start of the oldest open writing transaction, and ``CHANGES_FEED_SAFETY_LAG``
+    behind that, for timestamps taken just before a transaction starts and
+    clock skew between the app servers and the database.
+    """
+    horizon = timezone.now()
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(HORIZON_SQL)
+            oldest = cursor.fetchone()[0]
+        if oldest is not None:
+            horizon = min(horizon, oldest)
+
+    return horizon - timedelta(seconds=settings.CHANGES_FEED_SAFETY_LAG)
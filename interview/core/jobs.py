@@ -0,0 +1,181 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from interview.core.locks import advisory_lock_id, advisory_xact_lock
+from interview.core.models import Job
+from interview.core.response_cache import response_cache
+
+
+logger = logging.getLogger(__name__)
+
+# A worker holds the session advisory lock (JOB_LOCK_CLASS, job id) while it
+# runs a job, PostgreSQL releases it if the worker dies. The two-key form
+# takes int4 keys.
+JOB_LOCK_CLASS = advisory_lock_id('core.jobs') & 0x7FFFFFFF
+
+
+def enqueue(kind: str, **payload) -> Job:
+    if kind not in settings.JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind "{kind}"')
+
+    return Job.objects.create(kind=kind, payload=payload)
+
+
+def enqueue_scheduled() -> list:
+    """
+    Queue the periodic jobs in ``JOB_SCHEDULES`` (kind to interval in
+    seconds) that have none queued or running and none that finished
+    within their interval.
+    """
+    queued = []
+    for kind, interval in settings.JOB_SCHEDULES.items():
+        # Workers check and enqueue under a per-kind lock, so two of them
+        # cannot both find nothing queued and queue the same job.
+        with transaction.atomic():
+            advisory_xact_lock(f'core.jobs.schedule:{kind}')
+            recent = Job.objects.filter(kind=kind).filter(
+                Q(status__in=[Job.Status.QUEUED, Job.Status.RUNNING])
+                | Q(updated_at__gte=timezone.now() - timedelta(seconds=interval))
+            )
+            if not recent.exists():
+                queued.append(enqueue(kind))
+
+    return queued
+
+
+def claim(worker: str):
+    """Lock and mark the next runnable job as running, skipping rows other workers hold."""
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_after__lte=timezone.now())
+            .order_by('run_after', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = Job.Status.RUNNING
+        job.started_at = timezone.now()
+        job.attempts += 1
+        job.worker = worker
+        job.save(update_fields=['status', 'started_at', 'attempts', 'worker', 'updated_at'])
+        _job_lock('pg_advisory_lock', job)
+
+    return job
+
+
+def run(job: Job) -> None:
+    handler = import_string(settings.JOB_HANDLERS[job.kind])
+    try:
+        result = handler(job, **job.payload)
+    except Exception:
+        logger.exception('Job %s failed', job)
+        job.error = traceback.format_exc()
+        if job.attempts < settings.JOB_MAX_ATTEMPTS:
+            job.status = Job.Status.QUEUED
+            job.run_after = timezone.now() + timedelta(seconds=settings.JOB_RETRY_DELAY * job.attempts)
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'run_after', 'finished_at', 'updated_at'])
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.result = result
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'finished_at', 'updated_at'])
+    finally:
+        _job_lock('pg_advisory_unlock', job)
+
+
+def requeue_stale() -> int:
+    """
+    Put back running jobs that stopped reporting progress and whose worker
+    no longer holds their lock, it died, so another worker picks them up.
+    Jobs that run longer than ``JOB_TIMEOUT`` without calling
+    ``set_progress`` are left alone while their worker is alive.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_TIMEOUT)
+    stale = Job.objects.filter(status=Job.Status.RUNNING, updated_at__lt=cutoff)
+    if connection.vendor == 'postgresql':
+        # Taking the lock only succeeds once its worker's session is gone,
+        # and is released again when the update commits.
+        stale = stale.filter(
+            RawSQL('pg_try_advisory_xact_lock(%s, id::int)', [JOB_LOCK_CLASS], output_field=BooleanField())
+        )
+
+    return stale.update(status=Job.Status.QUEUED, run_after=timezone.now(), updated_at=timezone.now())
+
+
+def _job_lock(function: str, job: Job) -> None:
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {function}(%s, %s)', [JOB_LOCK_CLASS, job.pk])
+
+
+def prune_tombstones(job, retention_days: int = None) -> dict:
+    from interview.core.changes import prune_tombstones
+
+    return prune_tombstones(retention_days or settings.CHANGES_FEED_TOMBSTONE_DAYS)
+
+
+def reseed(job) -> dict:
+    """
+    Truncate the inventory and order tables and load the seed data in
+    database.py.
+
+    Change feed consumers get a tombstone for every live row removed, and
+    inventory and order ids keep counting from where they were, so no id
+    they hold comes back as a different row.
+    """
+    import runpy
+
+    from django.db import connection
+
+    from interview.core.models import Tombstone
+    from interview.inventory.facets import inventory_facets
+    from interview.inventory.models import Inventory, InventoryLanguage, InventoryTag, InventoryType
+    from interview.order.facets import order_facets
+    from interview.order.models import Order, OrderCalendarRollup, OrderTag
+
+    tables = ', '.join(
+        model._meta.db_table
+        for model in (InventoryLanguage, InventoryType, InventoryTag, OrderTag, OrderCalendarRollup)
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            sequences = []
+            for resource, model in (('inventory', Inventory), ('orders', Order)):
+                live = 'WHERE deleted_at IS NULL' if model is Inventory else ''
+                cursor.execute(
+                    f'INSERT INTO {Tombstone._meta.db_table} (resource, object_id, deleted_at) '
+                    f'SELECT %s, id, now() FROM {model._meta.db_table} {live}',
+                    [resource],
+                )
+                cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [model._meta.db_table])
+                sequence = cursor.fetchone()[0]
+                cursor.execute(f'SELECT last_value, is_called FROM {sequence}')
+                sequences.append((sequence, *cursor.fetchone()))
+            # The seed script refers to languages by id, so restart sequences.
+            cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+            for sequence, value, is_called in sequences:
+                cursor.execute('SELECT setval(%s, %s, %s)', [sequence, value, is_called])
+        runpy.run_path(str(settings.BASE_DIR.parent / 'database.py'))
+
+    inventory_facets.invalidate()
+    order_facets.invalidate()
+    response_cache.invalidate(
+        'inventory', 'inventory-tags', 'inventory-types', 'inventory-languages', 'orders', 'order-tags'
+    )
+
+    return {'reseeded': True}
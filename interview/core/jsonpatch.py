@@ -0,0 +1,125 @@
+import json
+
+from rest_framework.parsers import JSONParser
+
+
+MERGE_PATCH_MEDIA_TYPE = 'application/merge-patch+json'
+JSON_PATCH_MEDIA_TYPE = 'application/json-patch+json'
+JSON_PATCH_OPERATIONS = ('add', 'remove', 'replace', 'test')
+
+
+class JSONPatchError(ValueError):
+    pass
+
+
+class MergePatchParser(JSONParser):
+    media_type = MERGE_PATCH_MEDIA_TYPE
+
+
+class JSONPatchParser(JSONParser):
+    media_type = JSON_PATCH_MEDIA_TYPE
+
+
+def parse_pointer(pointer) -> list:
+    """Split an RFC 6901 JSON pointer into path segments for ``#>``/``jsonb_set``."""
+    if not isinstance(pointer, str) or not pointer.startswith('/'):
+        raise JSONPatchError(f'Invalid JSON pointer "{pointer}"')
+
+    return [segment.replace('~1', '/').replace('~0', '~') for segment in pointer[1:].split('/')]
+
+
+def merge_patch_sql(column: str, patch: dict) -> tuple:
+    """
+    Compile an RFC 7396 merge patch into a jsonb expression over ``column``.
+
+    Nulls drop keys with ``-``, other non-object values are merged with
+    ``||`` and nested objects recurse through ``jsonb_set``, so only the
+    patched keys travel to the database. Returns ``(sql, params)``.
+    """
+    if not isinstance(patch, dict):
+        raise JSONPatchError('A merge patch must be a JSON object')
+
+    return _merge_sql((column, []), patch, top_level=True)
+
+
+def _merge_sql(target: tuple, patch, top_level: bool = False) -> tuple:
+    if not isinstance(patch, dict):
+        return '%s::jsonb', [json.dumps(patch)]
+
+    target_sql, target_params = target
+    if top_level:
+        sql, params = target_sql, list(target_params)
+    else:
+        # Merging into a missing key or a non-object starts from {}.
+        sql = f"(CASE WHEN jsonb_typeof({target_sql}) = 'object' THEN {target_sql} ELSE '{{}}'::jsonb END)"
+        params = [*target_params, *target_params]
+
+    removed = [key for key, value in patch.items() if value is None]
+    if removed:
+        sql, params = f'({sql} - %s::text[])', [*params, removed]
+    merged = {key: value for key, value in patch.items() if value is not None and not isinstance(value, dict)}
+    if merged:
+        sql, params = f'({sql} || %s::jsonb)', [*params, json.dumps(merged)]
+    for key, value in patch.items():
+        if isinstance(value, dict):
+            child_sql, child_params = _merge_sql((f'({target_sql} -> %s)', [*target_params, key]), value)
+            sql, params = f'jsonb_set({sql}, %s::text[], {child_sql})', [*params, [key], *child_params]
+
+    return sql, params
+
+
+def json_patch_sql(column: str, operations: list) -> tuple:
+    """
+    Compile RFC 6902 ``add``, ``remove`` and ``replace`` operations into one
+    jsonb expression over ``column`` and ``test`` operations into a
+    condition. Returns ``(sql, params, condition_sql, condition_params)``.
+
+    Each operation wraps the previous expression once, keeping the statement
+    linear in the number of operations. ``test`` is checked against the
+    stored document, before the other operations apply; ``move`` and
+    ``copy`` are not supported.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise JSONPatchError('A JSON patch must be a non-empty list of operations')
+
+    sql, params = column, []
+    conditions, condition_params = [], []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or operation.get('op') not in JSON_PATCH_OPERATIONS:
+            raise JSONPatchError(f'Operation {index}: op must be one of {", ".join(JSON_PATCH_OPERATIONS)}')
+        op = operation['op']
+        path = parse_pointer(operation.get('path'))
+        if op != 'remove' and 'value' not in operation:
+            raise JSONPatchError(f'Operation {index}: "{op}" needs a value')
+        value = json.dumps(operation.get('value'))
+
+        if op == 'test':
+            conditions.append(f'{column} #> %s::text[] = %s::jsonb')
+            condition_params.extend([path, value])
+        elif op == 'remove':
+            sql, params = f'({sql} #- %s::text[])', [*params, path]
+        elif op == 'replace':
+            sql, params = f'jsonb_set({sql}, %s::text[], %s::jsonb, false)', [*params, path, value]
+        elif path[-1] == '-' or path[-1].isdigit():
+            sql, params = _add_sql(sql, params, path, value)
+        else:
+            sql, params = f'jsonb_set({sql}, %s::text[], %s::jsonb)', [*params, path, value]
+
+    return sql, params, ' AND '.join(conditions) or 'true', condition_params
+
+
+def _add_sql(sql: str, params: list, path: list, value: str) -> tuple:
+    # "-" and all-digit segments index into arrays but name members of
+    # objects, so the parent's type is checked when the patch applies.
+    # Array indexes insert before the element and "-" appends, as the RFC
+    # requires. The previous expression is evaluated once, in the subquery.
+    if path[-1] == '-':
+        insert_path, after = [*path[:-1], '-1'], 'true'
+    else:
+        insert_path, after = path, 'false'
+
+    return (
+        "(SELECT CASE WHEN jsonb_typeof(doc #> %s::text[]) = 'array' "
+        f"THEN jsonb_insert(doc, %s::text[], %s::jsonb, {after}) "
+        f"ELSE jsonb_set(doc, %s::text[], %s::jsonb) END FROM (SELECT {sql} AS doc) previous)"
+    ), [path[:-1], insert_path, value, path, value, *params]
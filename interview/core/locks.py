@@ -0,0 +1,20 @@
+import zlib
+
+from django.db import connections
+
+
+def advisory_lock_id(name: str) -> int:
+    return zlib.crc32(name.encode())
+
+
+def advisory_xact_lock(name: str, using: str = 'default') -> None:
+    """
+    Wait for the PostgreSQL advisory lock ``name``, held until the current
+    transaction ends. Other databases have no such lock and do not wait.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [advisory_lock_id(name)])
@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.core.startup import parse_importtime, run_target
+
+
+PROJECT_PREFIXES = ('interview', 'config')
+
+
+class Command(BaseCommand):
+    help = 'Report the slowest imports of a startup target using python -X importtime.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', nargs='?', default='setup',
+                            help='setup, urls, wsgi, asgi or command:<name>.')
+        parser.add_argument('--top', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            records = parse_importtime(run_target(options['target'], importtime=True).stderr)
+        except (ValueError, RuntimeError) as e:
+            raise CommandError(str(e))
+        top = options['top']
+
+        total = sum(record.cumulative_us for record in records if record.depth == 0)
+        self.stdout.write(f"{options['target']}: {len(records)} modules, {total / 1000:.1f} ms importing\n")
+
+        packages = defaultdict(int)
+        for record in records:
+            packages[record.package] += record.self_us
+        self.stdout.write('Self time by top-level package:')
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms  {package}')
+
+        # Which project module first pulls in each heavy third-party package.
+        self.stdout.write('\nThird-party packages pulled in by project modules:')
+        seen = set()
+        for record in sorted(records, key=lambda record: -record.cumulative_us):
+            if record.package in seen or record.name.startswith(PROJECT_PREFIXES):
+                continue
+            importer = record.importer(PROJECT_PREFIXES)
+            if importer is None or record.depth <= importer.depth:
+                continue
+            seen.add(record.package)
+            self.stdout.write(f'  {record.cumulative_us / 1000:8.1f} ms  {record.name} <- {importer.name}')
+            if len(seen) == top:
+                break
+
+        self.stdout.write('\nSlowest project modules (cumulative):')
+        project = [record for record in records if record.name.startswith(PROJECT_PREFIXES)]
+        for record in sorted(project, key=lambda record: -record.cumulative_us)[:top]:
+            self.stdout.write(f'  {record.cumulative_us / 1000:8.1f} ms  {record.name}')
@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.core.startup import STARTUP_TARGETS, time_target
+
+
+class Command(BaseCommand):
+    help = 'Measure cold start time of Django setup, the entry points and management commands.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='*', default=list(STARTUP_TARGETS),
+                            help='setup, urls, wsgi, asgi, interpreter or command:<name>.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--json', action='store_true', help='Print results as JSON for tracking.')
+        parser.add_argument('--max-ms', type=float, default=None,
+                            help='Fail when any target has a median above this.')
+
+    def handle(self, *args, **options):
+        results = {}
+        try:
+            for target in options['targets']:
+                results[target] = time_target(target, options['repeat'])
+        except (ValueError, RuntimeError) as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(f"{'target':<32} {'min':>8} {'median':>8} {'max':>8}")
+            for target, timing in results.items():
+                self.stdout.write(
+                    f"{target:<32} {timing['min_ms']:>8} {timing['median_ms']:>8} {timing['max_ms']:>8}"
+                )
+
+        slow = [target for target, timing in results.items()
+                if options['max_ms'] is not None and timing['median_ms'] > options['max_ms']]
+        if slow:
+            raise CommandError(f"Median cold start above {options['max_ms']} ms: {', '.join(slow)}")
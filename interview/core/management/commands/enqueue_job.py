@@ -0,0 +1,22 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.core.jobs import enqueue
+
+
+class Command(BaseCommand):
+    help = 'Queue a background job, e.g. `enqueue_job core.reseed`.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind')
+        parser.add_argument('--payload', default='{}', help='Handler keyword arguments as a JSON object.')
+
+    def handle(self, *args, **options):
+        try:
+            job = enqueue(options['kind'], **json.loads(options['payload']))
+        except (ValueError, TypeError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'Queued {job}')
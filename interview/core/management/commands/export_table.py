@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.core.export import EXPORT_FORMATS, get_table_export, resolve_format, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Export a whole table to a Parquet, Arrow IPC or CSV file.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('table')
+        parser.add_argument('--file-format', choices=list(EXPORT_FORMATS), default=None)
+        parser.add_argument('--output', help='Defaults to <table>.<extension>, "-" writes to stdout.')
+        parser.add_argument('--chunk-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            table = get_table_export(options['table'])
+            file_format = resolve_format(options['file_format'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+
+        output = options['output'] or f'{table.name}.{EXPORT_FORMATS[file_format][1]}'
+        size = 0
+        stream = open(output, 'wb') if output != '-' else sys.stdout.buffer
+        try:
+            for data in stream_export(table, file_format, options['chunk_size']):
+                stream.write(data)
+                size += len(data)
+        finally:
+            if output != '-':
+                stream.close()
+
+        if output != '-':
+            self.stdout.write(f'Wrote {size} bytes of {file_format} to {output}')
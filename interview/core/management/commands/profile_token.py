@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interview.core.profiling import make_profile_token
+
+
+class Command(BaseCommand):
+    help = 'Print a signed header value that makes the request profiler capture a request.'
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{settings.REQUEST_PROFILER_HEADER}: {make_profile_token()}')
+        self.stderr.write(f'Valid for {settings.REQUEST_PROFILER_TOKEN_MAX_AGE} seconds.')
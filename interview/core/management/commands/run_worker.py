@@ -0,0 +1,57 @@
+import os
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from interview.core.jobs import claim, enqueue_scheduled, requeue_stale, run
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs until stopped.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty.')
+        parser.add_argument('--poll-interval', type=float, default=settings.JOB_POLL_INTERVAL)
+        parser.add_argument('--max-jobs', type=int, default=None, help='Exit after running this many jobs.')
+
+    def handle(self, *args, **options):
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        processed = 0
+        # No schedule is due more often than its shortest interval.
+        schedule_interval = min(settings.JOB_SCHEDULES.values(), default=None)
+        next_schedule = time.monotonic()
+        self.stdout.write(f'Worker {worker} started')
+        while not self.stopping:
+            close_old_connections()
+            requeue_stale()
+            if schedule_interval is not None and time.monotonic() >= next_schedule:
+                enqueue_scheduled()
+                next_schedule = time.monotonic() + schedule_interval
+
+            job = claim(worker)
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Running {job}')
+            run(job)
+            processed += 1
+            if options['max_jobs'] and processed >= options['max_jobs']:
+                break
+
+        self.stdout.write(f'Worker {worker} stopped after {processed} job(s)')
+
+    def stop(self, signum, frame):
+        # Finish the current job, then exit.
+        self.stopping = True
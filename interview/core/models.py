@@ -0,0 +1,66 @@
+from django.db import models
+from django.utils import timezone
+
+from interview.core.behaviors import TimestampedModel
+
+
+class Tombstone(models.Model):
+    resource = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['resource', 'id'])]
+
+    def __str__(self) -> str:
+        return f'{self.resource} {self.object_id}'
+
+    @classmethod
+    def record(cls, resource: str, object_id: int):
+        return cls.objects.create(resource=resource, object_id=object_id)
+
+
+class Job(TimestampedModel, models.Model):
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued'
+        RUNNING = 'running'
+        SUCCEEDED = 'succeeded'
+        FAILED = 'failed'
+
+    kind = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['run_after', 'id'],
+                condition=models.Q(status='queued'),
+                name='core_job_queued_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(status='running'),
+                name='core_job_running_idx',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.kind} #{self.pk} ({self.status})'
+
+    def set_progress(self, progress: int, total: int = None) -> None:
+        self.progress = progress
+        fields = {'progress': progress, 'updated_at': timezone.now()}
+        if total is not None:
+            self.total = fields['total'] = total
+        Job.objects.filter(pk=self.pk).update(**fields)
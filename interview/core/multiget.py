@@ -0,0 +1,29 @@
+from django.conf import settings
+
+
+def parse_ids(raw: str):
+    """
+    Parse ``?ids=3,1,2`` into unique ids in request order, or None when the
+    parameter is absent. Raises ``ValueError`` on malformed or too many ids.
+    """
+    if raw is None:
+        return None
+
+    try:
+        ids = list(dict.fromkeys(int(value) for value in raw.split(',') if value.strip()))
+    except ValueError:
+        raise ValueError('ids must be a comma separated list of integers')
+    if not ids:
+        raise ValueError('ids must not be empty')
+    if len(ids) > settings.MULTIGET_MAX_IDS:
+        raise ValueError(f'At most {settings.MULTIGET_MAX_IDS} ids per request')
+
+    return ids
+
+
+def multiget_data(ids: list, found: dict) -> dict:
+    """Serialized rows in request order plus the ids that were not found."""
+    return {
+        'results': [found[pk] for pk in ids if pk in found],
+        'missing': [pk for pk in ids if pk not in found],
+    }
@@ -0,0 +1,48 @@
+from django.conf import settings
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from interview.core.counts import cached_count
+
+
+class CountStrategyPagination(LimitOffsetPagination):
+    """
+    Opt-in ``?limit=&offset=`` pagination whose total comes from
+    ``cached_count``. The response reports ``count_exact``, and ``next`` is
+    decided by fetching one extra row, so an estimated total never hides
+    or invents a page. Views list the response cache tags their rows
+    depend on in ``count_tags``.
+    """
+    default_limit = None
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.max_limit = settings.PAGINATION_MAX_LIMIT
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        self.count, self.count_exact = cached_count(queryset, getattr(view, 'count_tags', ()))
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_exact': self.count_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
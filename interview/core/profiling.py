@@ -0,0 +1,219 @@
+import cProfile
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from django.utils.text import slugify
+
+from interview.core.fanout import helper_threads
+
+
+PROFILE_TOKEN_SALT = 'interview.core.profiling'
+PROFILE_MODES = ('sampling', 'cprofile')
+
+
+def make_profile_token() -> str:
+    """A token for the profiler header, valid for ``REQUEST_PROFILER_TOKEN_MAX_AGE`` seconds."""
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign(uuid.uuid4().hex)
+
+
+def check_profile_token(token: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(
+            token, max_age=settings.REQUEST_PROFILER_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def _short_path(filename: str) -> str:
+    if 'site-packages/' in filename:
+        return filename.split('site-packages/', 1)[1]
+    if '/lib/python' in filename:
+        return filename.split('/lib/python', 1)[1].split('/', 1)[-1]
+    root = str(Path(settings.BASE_DIR).parent) + '/'
+    return filename[len(root):] if filename.startswith(root) else filename
+
+
+class StackSampler:
+    """
+    Samples one thread's stack every ``interval`` seconds from a helper
+    thread and aggregates the samples as folded stacks, the input format of
+    flamegraph.pl, speedscope and most flame graph viewers. The stacks of
+    ``fan_out`` pool threads working for that thread are sampled too.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._names = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in (self.thread_id, *helper_threads(self.thread_id)):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[self._fold(frame)] += 1
+
+    def _fold(self, frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            name = self._names.get(code)
+            if name is None:
+                name = self._names[code] = f'{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})'
+            names.append(name)
+            frame = frame.f_back
+
+        return ';'.join(reversed(names))
+
+    def folded(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+
+class SQLTimeline:
+    """Start offset, duration and SQL of every query run while active."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            end = time.perf_counter()
+            self.queries.append({
+                'alias': context['connection'].alias,
+                'start_ms': round((start - self.started) * 1000, 3),
+                'duration_ms': round((end - start) * 1000, 3),
+                'sql': sql,
+            })
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles single requests on demand.
+
+    A request is profiled when it carries a valid signed token in the
+    ``REQUEST_PROFILER_HEADER`` header (see ``manage.py profile_token``),
+    when a staff user adds ``?profile=1``, or when it is picked by
+    ``REQUEST_PROFILER_SAMPLE_RATE`` on one of ``REQUEST_PROFILER_SAMPLE_PATHS``.
+    Results are written to ``REQUEST_PROFILER_DIR``: folded stacks or a
+    pstats dump plus a JSON summary with the SQL timeline. The SQL timeline
+    and the sampling profiler include the work of ``fan_out`` pool threads;
+    ``cprofile`` only sees the request thread. When
+    ``REQUEST_PROFILER_ENABLED`` is off the middleware removes itself.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = 'HTTP_' + settings.REQUEST_PROFILER_HEADER.upper().replace('-', '_')
+
+    def __call__(self, request):
+        mode = self.profile_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        return self.profile(request, mode)
+
+    def profile_mode(self, request):
+        token = request.META.get(self.header)
+        if token and check_profile_token(token):
+            return self._requested_mode(request)
+        if request.GET.get('profile') and getattr(request, 'user', None) is not None and request.user.is_staff:
+            return self._requested_mode(request)
+        if (
+            settings.REQUEST_PROFILER_SAMPLE_RATE
+            and random.random() < settings.REQUEST_PROFILER_SAMPLE_RATE
+            and request.path.startswith(tuple(settings.REQUEST_PROFILER_SAMPLE_PATHS))
+        ):
+            # Background samples always use the cheap sampling profiler.
+            return 'sampling'
+        return None
+
+    def _requested_mode(self, request) -> str:
+        mode = request.GET.get('profile_mode') or settings.REQUEST_PROFILER_MODE
+        return mode if mode in PROFILE_MODES else settings.REQUEST_PROFILER_MODE
+
+    def profile(self, request, mode: str):
+        started = time.perf_counter()
+        timeline = SQLTimeline(started)
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+        else:
+            profiler = StackSampler(threading.get_ident(), settings.REQUEST_PROFILER_INTERVAL)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timeline))
+            if mode == 'cprofile':
+                profiler.enable()
+            else:
+                profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                if mode == 'cprofile':
+                    profiler.disable()
+                else:
+                    profiler.stop()
+        duration = time.perf_counter() - started
+
+        profile_id = self.save(request, response, mode, profiler, timeline, duration)
+        response['X-Profile-Id'] = profile_id
+
+        return response
+
+    def save(self, request, response, mode: str, profiler, timeline: SQLTimeline, duration: float) -> str:
+        directory = Path(settings.REQUEST_PROFILER_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        now = timezone.now()
+        profile_id = f'{now:%Y%m%dT%H%M%S}-{request.method.lower()}-{slugify(request.path)[:60]}-{uuid.uuid4().hex[:8]}'
+
+        if mode == 'cprofile':
+            profiler.dump_stats(directory / f'{profile_id}.prof')
+        else:
+            (directory / f'{profile_id}.folded').write_text(profiler.folded())
+
+        summary = {
+            'id': profile_id,
+            'mode': mode,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'started_at': now.isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'sql_count': len(timeline.queries),
+            'sql_ms': round(sum(query['duration_ms'] for query in timeline.queries), 3),
+            'sql': timeline.queries,
+        }
+        (directory / f'{profile_id}.json').write_text(json.dumps(summary, indent=2))
+
+        return profile_id
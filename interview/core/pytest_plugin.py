@@ -0,0 +1,37 @@
+import pytest
+
+from interview.core.querybudget import assert_max_queries
+
+
+QUERY_BUDGET_MIDDLEWARE = 'interview.core.querybudget.QueryBudgetMiddleware'
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Fail any request whose view runs more queries than its ``query_budget``."""
+    if QUERY_BUDGET_MIDDLEWARE not in settings.MIDDLEWARE:
+        settings.MIDDLEWARE = [*settings.MIDDLEWARE, QUERY_BUDGET_MIDDLEWARE]
+    settings.QUERY_BUDGET_MODE = 'raise'
+
+
+@pytest.fixture
+def max_queries():
+    """``with max_queries(3): ...`` fails with the repeated SQL and call sites on overrun."""
+    return assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def isolate_caches(settings):
+    """
+    Start every test with empty in-memory caches (full token buckets, no
+    requests in flight, no cached responses or counters) instead of the
+    shared ones.
+    """
+    from django.core.cache import caches
+
+    settings.CACHES = {
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'test-{alias}'}
+        for alias in settings.CACHES
+    }
+    for alias in settings.CACHES:
+        caches[alias].clear()
@@ -0,0 +1,147 @@
+import logging
+import traceback
+from collections import Counter
+from contextlib import ContextDecorator, ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def budget_for(view_class, method: str):
+    """
+    The query budget a view declares for ``method``.
+
+    Views set ``query_budget`` to an int for every method or to a dict keyed
+    by lower-case method name. ``None`` means no budget.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(method.lower())
+    return budget
+
+
+# Savepoints are only issued inside an outer transaction, e.g. the one
+# wrapping each test, so they are not counted against a budget.
+TRANSACTION_CONTROL = ('SAVEPOINT ', 'RELEASE SAVEPOINT ', 'ROLLBACK TO SAVEPOINT ')
+
+
+class QueryRecorder:
+    """
+    Records every query on all connections along with the project frames
+    that issued it, leaving out savepoint statements.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.project_root = str(Path(settings.BASE_DIR).parent)
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.startswith(TRANSACTION_CONTROL):
+            self.queries.append((sql, self._project_frames()))
+        return execute(sql, params, many, context)
+
+    def _project_frames(self) -> list:
+        return [
+            frame for frame in traceback.extract_stack()[:-2]
+            if frame.filename.startswith(self.project_root)
+            and 'site-packages' not in frame.filename
+            and frame.filename != __file__
+        ]
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def report(self, budget: int, label: str) -> str:
+        lines = [f'{label} ran {len(self.queries)} queries, budget is {budget}.']
+        duplicates = [(sql, count) for sql, count in Counter(sql for sql, _ in self.queries).most_common() if count > 1]
+        if duplicates:
+            lines.append('Repeated queries:')
+        for sql, count in duplicates:
+            lines.append(f'  {count}x {sql}')
+            stack = next(frames for query, frames in self.queries if query == sql)
+            lines.extend(f'      {line.rstrip()}' for line in traceback.format_list(stack[-settings.QUERY_BUDGET_STACK_DEPTH:]))
+        if not duplicates:
+            lines.append('Queries:')
+            lines.extend(f'  {sql}' for sql, _ in self.queries)
+
+        return '\n'.join(lines)
+
+
+class assert_max_queries(ContextDecorator):
+    """
+    Fails with the repeated SQL and the code that issued it when the block
+    runs more than ``budget`` queries. Works as a decorator or ``with`` block.
+    """
+
+    def __init__(self, budget: int, label: str = 'Block'):
+        self.budget = budget
+        self.label = label
+
+    def __enter__(self) -> QueryRecorder:
+        self.recorder = QueryRecorder().__enter__()
+        return self.recorder
+
+    def __exit__(self, exc_type, *exc_info):
+        self.recorder.__exit__(exc_type, *exc_info)
+        if exc_type is None and len(self.recorder) > self.budget:
+            raise QueryBudgetExceeded(self.recorder.report(self.budget, self.label))
+
+
+class QueryBudgetMiddleware:
+    """
+    Enforces the ``query_budget`` declared on views.
+
+    With ``QUERY_BUDGET_MODE = 'log'`` an overrun is logged as an error,
+    with ``'raise'`` (used by the pytest plugin) the request fails with
+    ``QueryBudgetExceeded``.
+    """
+
+    def __init__(self, get_response):
+        if settings.QUERY_BUDGET_MODE not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            if hasattr(request, '_query_budget'):
+                request._query_budget[0].__exit__(None, None, None)
+
+        if not hasattr(request, '_query_budget'):
+            return response
+
+        recorder, budget, label = request._query_budget
+        if len(recorder) > budget:
+            report = recorder.report(budget, label)
+            if settings.QUERY_BUDGET_MODE == 'raise':
+                raise QueryBudgetExceeded(report)
+            logger.error(report)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        budget = budget_for(view_class, request.method)
+        if budget is not None:
+            label = f'{request.method} {request.path} ({view_class.__name__})'
+            request._query_budget = (QueryRecorder().__enter__(), budget, label)
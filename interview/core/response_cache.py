@@ -0,0 +1,176 @@
+import hashlib
+import threading
+import time
+import uuid
+import weakref
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+
+RESPONSE_CACHE_PREFIX = 'rc'
+
+
+class ResponseCache:
+    """
+    Rendered GET responses shared by every worker through a cache backend.
+
+    Each entry's key embeds the current version of every tag it depends on,
+    so invalidating a tag bumps its version and all dependent entries become
+    unreachable at once. Entries past ``RESPONSE_CACHE_TIMEOUT`` are served
+    stale for up to ``RESPONSE_CACHE_STALE_TIMEOUT`` while a single worker,
+    holding a ``cache.add`` lock, rebuilds them. On a cold miss the other
+    workers wait for that rebuild instead of running the same queries.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def cache(self):
+        return caches[settings.RESPONSE_CACHE_ALIAS]
+
+    def tag_key(self, tag: str) -> str:
+        return f'{RESPONSE_CACHE_PREFIX}:tag:{tag}'
+
+    def tag_versions(self, tags) -> list:
+        keys = [self.tag_key(tag) for tag in tags]
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # A fresh start value, so an evicted tag never reuses an old version.
+                self.cache.add(key, time.time_ns(), timeout=None)
+                versions[key] = self.cache.get(key)
+
+        return [versions[key] for key in keys]
+
+    def invalidate(self, *tags, using: str = None) -> None:
+        """
+        Bump ``tags`` once the current transaction commits. Row signals fire
+        per object, so tags are collected per connection and flushed by a
+        single callback.
+        """
+        connection = transaction.get_connection(using)
+        batches = self._local.__dict__.setdefault('batches', {})
+        batch = batches.get(connection.alias)
+        batch = batch and batch()
+        if batch is None or batch.flushed:
+            batch = PendingTags(self)
+            batch.tags.update(tags)
+            # Only the callback holds the batch: a rollback drops both, and
+            # the next transaction starts a new one.
+            batches[connection.alias] = weakref.ref(batch)
+            transaction.on_commit(batch.flush, using=connection.alias)
+        else:
+            batch.tags.update(tags)
+
+    def bump(self, tags) -> None:
+        for tag in tags:
+            try:
+                self.cache.incr(self.tag_key(tag))
+            except ValueError:
+                self.cache.set(self.tag_key(tag), time.time_ns(), timeout=None)
+
+    def entry_key(self, request, tags) -> str:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            scope = 'anon'
+        else:
+            scope = 'staff' if user.is_staff else f'user:{user.pk}'
+        parts = [
+            request.path,
+            sorted(request.GET.lists()),
+            request.META.get('HTTP_ACCEPT', ''),
+            scope,
+            self.tag_versions(tags),
+        ]
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+
+        return f'{RESPONSE_CACHE_PREFIX}:entry:{digest}'
+
+    def fetch(self, request, tags, build, timeout: int = None):
+        timeout = timeout or settings.RESPONSE_CACHE_TIMEOUT
+        key = self.entry_key(request, tags)
+        lock_key = f'{key}:lock'
+
+        entry = self.cache.get(key)
+        if entry is not None and entry['expires'] > time.time():
+            return self.to_response(entry, 'HIT')
+
+        token = uuid.uuid4().hex
+        if not self.cache.add(lock_key, token, timeout=settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+            if entry is not None:
+                return self.to_response(entry, 'STALE')
+            entry = self.wait(key)
+            if entry is not None:
+                return self.to_response(entry, 'HIT')
+
+        try:
+            response = build()
+            if response.status_code == 200:
+                self.cache.set(
+                    key,
+                    {
+                        'expires': time.time() + timeout,
+                        'status': response.status_code,
+                        'content': response.content,
+                        'content_type': response['Content-Type'],
+                    },
+                    timeout=timeout + settings.RESPONSE_CACHE_STALE_TIMEOUT,
+                )
+        finally:
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+        response['X-Cache'] = 'MISS'
+
+        return response
+
+    def wait(self, key: str):
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def to_response(self, entry: dict, state: str) -> HttpResponse:
+        response = HttpResponse(entry['content'], status=entry['status'], content_type=entry['content_type'])
+        response['X-Cache'] = state
+        return response
+
+
+class PendingTags:
+    """Tags invalidated in one transaction, bumped when it commits."""
+
+    def __init__(self, response_cache: ResponseCache):
+        self.response_cache = response_cache
+        self.tags = set()
+        self.flushed = False
+
+    def flush(self) -> None:
+        self.flushed = True
+        self.response_cache.bump(self.tags)
+
+
+response_cache = ResponseCache()
+
+
+def cache_response(*tags, timeout: int = None):
+    """Serve a view's GET handler from the shared response cache, keyed on ``tags``."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            def build():
+                response = method(view, request, *args, **kwargs)
+                return view.finalize_response(request, response, *args, **kwargs).render()
+
+            return response_cache.fetch(request, tags, build, timeout)
+
+        return wrapper
+
+    return decorator
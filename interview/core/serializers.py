@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from interview.core.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'status', 'progress', 'total', 'attempts', 'result', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
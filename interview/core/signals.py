@@ -0,0 +1,17 @@
+from django.dispatch import Signal
+
+
+# Sent by IsActiveModel.activate()/deactivate(), which use queryset updates and
+# so bypass post_save. Receivers get ``pks`` and the new ``is_active`` value.
+is_active_changed = Signal()
+
+# Sent by SoftDeleteModel.soft_delete() after the row is hidden, with ``instance``.
+soft_deleted = Signal()
+
+
+def touch_on_m2m_changed(model, related_name: str, instance, action: str, reverse: bool, pk_set) -> None:
+    """Bump ``updated_at`` on the owning rows when an M2M relation changes."""
+    if action in ('post_add', 'post_remove') and pk_set:
+        model.touch(pk_set if reverse else [instance.pk])
+    elif action == 'pre_clear':
+        model.touch(getattr(instance, related_name).values('pk') if reverse else [instance.pk])
@@ -0,0 +1,100 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+# Python snippets run in a fresh interpreter for each startup measurement.
+STARTUP_TARGETS = {
+    'interpreter': 'pass',
+    'setup': 'import django; django.setup()',
+    'urls': 'import django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns',
+    'wsgi': 'import config.wsgi',
+    'asgi': 'import config.asgi',
+}
+
+
+def target_code(target: str) -> str:
+    """Code for a named target, or ``command:<name>`` to load one management command."""
+    if target.startswith('command:'):
+        name = target.split(':', 1)[1]
+        return (
+            'import django; django.setup(); '
+            'from django.core.management import get_commands, load_command_class; '
+            f'load_command_class(get_commands()[{name!r}], {name!r})'
+        )
+    if target not in STARTUP_TARGETS:
+        raise ValueError(f'Unknown target "{target}", expected one of {", ".join(STARTUP_TARGETS)} or command:<name>')
+
+    return STARTUP_TARGETS[target]
+
+
+def run_target(target: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', target_code(target)]
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+    result = subprocess.run(command, cwd=Path(settings.BASE_DIR).parent, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f'{target} failed:\n{result.stderr[-2000:]}')
+
+    return result
+
+
+def time_target(target: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_target(target)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'min_ms': round(min(timings), 1),
+        'median_ms': round(statistics.median(timings), 1),
+        'max_ms': round(max(timings), 1),
+    }
+
+
+class ImportRecord:
+
+    def __init__(self, name: str, self_us: int, cumulative_us: int, depth: int):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+        self.parent = None
+
+    @property
+    def package(self) -> str:
+        return self.name.split('.', 1)[0]
+
+    def importer(self, prefixes: tuple):
+        """The closest project module up the import chain, if any."""
+        record = self.parent
+        while record is not None:
+            if record.name.startswith(prefixes):
+                return record
+            record = record.parent
+        return None
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse ``-X importtime`` output. Children are printed before their
+    parent with deeper indentation, so parents are linked as they appear.
+    """
+    records, pending = [], []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        record = ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth)
+        while pending and pending[-1].depth > depth:
+            pending.pop().parent = record
+        pending.append(record)
+        records.append(record)
+
+    return records
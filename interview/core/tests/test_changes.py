@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.utils import timezone
+
+from interview.core.changes import encode_token, prune_tombstones
+from interview.core.horizon import change_horizon
+from interview.core.models import Tombstone
+from interview.inventory.models import Inventory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_safety_lag(settings):
+    settings.CHANGES_FEED_SAFETY_LAG = 0
+
+
+def test_feed_pages_through_changes_and_deletes(api_client, make_inventory):
+    alien, aliens, alien3 = make_inventory('Alien'), make_inventory('Aliens'), make_inventory('Alien 3')
+    deleted_id = alien3.id
+    alien3.delete()
+
+    response = api_client.get('/changes/inventory/', {'limit': 1})
+    assert response.status_code == 200
+    assert [row['id'] for row in response.data['changed']] == [alien.id]
+    assert [row['id'] for row in response.data['deleted']] == [deleted_id]
+    assert response.data['has_more']
+
+    response = api_client.get('/changes/inventory/', {'since': response.data['next']})
+    assert [row['id'] for row in response.data['changed']] == [aliens.id]
+    assert response.data['deleted'] == []
+    assert not response.data['has_more']
+
+
+def test_feed_holds_back_rows_past_the_horizon(api_client, make_inventory):
+    alien = make_inventory('Alien')
+    # As if written by a transaction that started after the horizon.
+    Inventory.objects.filter(id=alien.id).update(updated_at=timezone.now() + timedelta(minutes=1))
+
+    response = api_client.get('/changes/inventory/')
+    assert response.data['changed'] == []
+
+    Inventory.objects.filter(id=alien.id).update(updated_at=timezone.now() - timedelta(minutes=1))
+    response = api_client.get('/changes/inventory/', {'since': response.data['next']})
+    assert [row['id'] for row in response.data['changed']] == [alien.id]
+
+
+@pytest.fixture
+def other_transaction():
+    connection = connections.create_connection('default')
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute('BEGIN')
+        yield cursor
+        cursor.execute('ROLLBACK')
+    connection.close()
+
+
+def test_horizon_ignores_read_only_transactions(other_transaction):
+    other_transaction.execute('SELECT count(*) FROM inventory_inventory')
+    opened = timezone.now()
+
+    assert change_horizon() >= opened
+
+
+def test_horizon_stays_behind_writing_transactions(other_transaction):
+    other_transaction.execute('SELECT txid_current()')
+    opened = timezone.now()
+
+    assert change_horizon() < opened
+
+
+def test_feed_expires_tokens_behind_pruned_tombstones(api_client, settings):
+    stale = (timezone.now() - timedelta(days=settings.CHANGES_FEED_TOMBSTONE_DAYS + 1)).isoformat()
+
+    response = api_client.get('/changes/inventory/', {'since': encode_token({'u': None, 'd': 0, 't': stale})})
+    assert response.status_code == 410
+
+
+def test_prune_tombstones_keeps_recent_ones():
+    old, recent = Tombstone.record('inventory', 1), Tombstone.record('inventory', 2)
+    Tombstone.objects.filter(id=old.id).update(deleted_at=timezone.now() - timedelta(days=31))
+
+    assert prune_tombstones(30, batch_size=1) == {'pruned': 1}
+    assert list(Tombstone.objects.values_list('id', flat=True)) == [recent.id]
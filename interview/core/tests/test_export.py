@@ -0,0 +1,49 @@
+import csv
+import io
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from interview.core.export import resolve_format
+
+
+def call_asgi(path: str, query_string: bytes = b'') -> tuple:
+    from config.asgi import application
+
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string,
+        'headers': [], 'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80),
+    }
+    async_to_sync(application)(scope, receive, send)
+
+    return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_streams_under_asgi(make_inventory):
+    make_inventory('Alien')
+    make_inventory('Aliens')
+
+    status, body = call_asgi('/exports/inventory/', b'file_format=csv&chunk_size=1')
+
+    assert status == 200
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert [row['name'] for row in rows] == ['Alien', 'Aliens']
+
+
+def test_formats_needing_pyarrow_are_rejected_without_it(settings, monkeypatch):
+    monkeypatch.setattr('interview.core.export.load_pyarrow', lambda: None)
+
+    with pytest.raises(ValueError):
+        resolve_format('parquet')
+    settings.EXPORT_DEFAULT_FORMAT = 'parquet'
+    with pytest.raises(ValueError):
+        resolve_format()
@@ -0,0 +1,102 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.utils import timezone
+
+from interview.core.jobs import JOB_LOCK_CLASS, claim, enqueue, enqueue_scheduled, requeue_stale, reseed, run
+from interview.core.management.commands import run_worker
+from interview.core.models import Job, Tombstone
+from interview.inventory.models import Inventory
+from interview.order.calendar import order_calendar
+from interview.order.models import Order, OrderCalendarRollup
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def other_session():
+    connection = connections.create_connection('default')
+    yield connection
+    connection.close()
+
+
+def test_requeue_stale_leaves_jobs_whose_worker_holds_the_lock(settings, other_session):
+    job = enqueue('core.prune_tombstones')
+    assert claim('worker').pk == job.pk
+    Job.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(seconds=settings.JOB_TIMEOUT + 1))
+    # This session's own lock is reentrant, another session stands in for
+    # the live worker.
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_unlock(%s, %s)', [JOB_LOCK_CLASS, job.pk])
+
+    with other_session.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s, %s)', [JOB_LOCK_CLASS, job.pk])
+        assert requeue_stale() == 0
+        cursor.execute('SELECT pg_advisory_unlock(%s, %s)', [JOB_LOCK_CLASS, job.pk])
+
+    assert requeue_stale() == 1
+    assert Job.objects.get(pk=job.pk).status == Job.Status.QUEUED
+
+
+def test_run_releases_the_job_lock(other_session):
+    enqueue('core.prune_tombstones')
+    job = claim('worker')
+    run(job)
+
+    assert Job.objects.get(pk=job.pk).status == Job.Status.SUCCEEDED
+    with other_session.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s, %s)', [JOB_LOCK_CLASS, job.pk])
+        assert cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_workers_queue_each_scheduled_job_once(settings):
+    settings.JOB_SCHEDULES = {'core.prune_tombstones': 60}
+    barrier = threading.Barrier(4)
+
+    def worker():
+        barrier.wait()
+        try:
+            enqueue_scheduled()
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert Job.objects.filter(kind='core.prune_tombstones').count() == 1
+
+
+def test_worker_checks_schedules_once_per_shortest_interval(settings, monkeypatch):
+    settings.JOB_SCHEDULES = {'core.prune_tombstones': 60, 'order.expire_embargoes': 300}
+    checks, claims = [], iter([Job(pk=1), Job(pk=2), Job(pk=3), None])
+    monkeypatch.setattr(run_worker, 'enqueue_scheduled', lambda: checks.append(1))
+    monkeypatch.setattr(run_worker, 'claim', lambda worker: next(claims))
+    monkeypatch.setattr(run_worker, 'run', lambda job: None)
+    monkeypatch.setattr(run_worker, 'close_old_connections', lambda: None)
+
+    call_command('run_worker', '--once')
+
+    assert checks == [1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reseed_tombstones_removed_rows_and_keeps_ids_counting(order):
+    order_calendar(order.start_date, order.start_date, 'day')
+    inventory_id = order.inventory_id
+
+    reseed(enqueue('core.reseed'))
+
+    assert set(Tombstone.objects.values_list('resource', 'object_id')) == {
+        ('inventory', inventory_id), ('orders', order.id)
+    }
+    assert not OrderCalendarRollup.objects.exists()
+    assert Inventory.objects.order_by('id').first().id > inventory_id
+    assert Order.objects.order_by('id').first().id > order.id
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from django.db import connection
+
+from interview.core.jsonpatch import json_patch_sql
+
+
+pytestmark = pytest.mark.django_db
+
+
+def apply(document, operations: list):
+    sql, params, _, _ = json_patch_sql('doc', operations)
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {sql} FROM (SELECT %s::jsonb AS doc) source', [*params, json.dumps(document)])
+        result = cursor.fetchone()[0]
+
+    return json.loads(result) if isinstance(result, str) else result
+
+
+def test_add_with_an_index_inserts_into_arrays():
+    document = {'actors': ['Sigourney Weaver', 'Ian Holm']}
+
+    assert apply(document, [{'op': 'add', 'path': '/actors/1', 'value': 'Tom Skerritt'}]) == {
+        'actors': ['Sigourney Weaver', 'Tom Skerritt', 'Ian Holm']
+    }
+    assert apply(document, [{'op': 'add', 'path': '/actors/-', 'value': 'John Hurt'}]) == {
+        'actors': ['Sigourney Weaver', 'Ian Holm', 'John Hurt']
+    }
+
+
+def test_add_with_a_digit_member_sets_it_on_objects():
+    document = {'awards': {'1980': 'Oscar'}}
+
+    assert apply(document, [{'op': 'add', 'path': '/awards/1979', 'value': 'Saturn'}]) == {
+        'awards': {'1979': 'Saturn', '1980': 'Oscar'}
+    }
+    assert apply(document, [{'op': 'add', 'path': '/awards/-', 'value': 'n/a'}]) == {
+        'awards': {'-': 'n/a', '1980': 'Oscar'}
+    }
+
+
+def test_chained_adds_apply_in_order():
+    operations = [
+        {'op': 'add', 'path': '/actors/0', 'value': 'Tom Skerritt'},
+        {'op': 'add', 'path': '/actors/0', 'value': 'John Hurt'},
+        {'op': 'remove', 'path': '/actors/2'},
+    ]
+
+    assert apply({'actors': ['Sigourney Weaver']}, operations) == {'actors': ['John Hurt', 'Tom Skerritt']}
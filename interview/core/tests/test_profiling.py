@@ -0,0 +1,110 @@
+import json
+import pstats
+import threading
+import time
+
+import pytest
+from django.core import signing
+
+from interview.core.fanout import fan_out
+from interview.core.profiling import PROFILE_TOKEN_SALT, StackSampler, make_profile_token
+
+
+@pytest.fixture
+def profiles(settings, tmp_path):
+    settings.REQUEST_PROFILER_ENABLED = True
+    settings.REQUEST_PROFILER_DIR = tmp_path
+    settings.REQUEST_PROFILER_INTERVAL = 0.001
+    return tmp_path
+
+
+def artifacts(directory) -> list:
+    return sorted(path.suffix for path in directory.iterdir())
+
+
+@pytest.mark.django_db
+def test_a_valid_token_profiles_the_request(api_client, profiles, order):
+    response = api_client.get('/orders/', HTTP_X_PROFILE=make_profile_token())
+
+    profile_id = response['X-Profile-Id']
+    assert artifacts(profiles) == ['.folded', '.json']
+    summary = json.loads((profiles / f'{profile_id}.json').read_text())
+    assert (summary['mode'], summary['method'], summary['path'], summary['status']) == (
+        'sampling', 'GET', '/orders/', 200
+    )
+    assert summary['sql_count'] == len(summary['sql']) > 0
+    assert all(query['sql'] and query['duration_ms'] >= 0 for query in summary['sql'])
+
+
+@pytest.mark.django_db
+def test_cprofile_mode_writes_a_pstats_dump(api_client, profiles, order):
+    response = api_client.get('/orders/', {'profile_mode': 'cprofile'}, HTTP_X_PROFILE=make_profile_token())
+
+    assert artifacts(profiles) == ['.json', '.prof']
+    assert pstats.Stats(str(profiles / f'{response["X-Profile-Id"]}.prof')).total_calls > 0
+
+
+@pytest.mark.django_db
+def test_expired_and_forged_tokens_are_ignored(monkeypatch, settings, api_client, profiles):
+    settings.REQUEST_PROFILER_TOKEN_MAX_AGE = 60
+    two_minutes_ago = time.time() - 120
+    with monkeypatch.context() as patch:
+        patch.setattr(signing.time, 'time', lambda: two_minutes_ago)
+        expired = make_profile_token()
+    forged = signing.TimestampSigner(salt=PROFILE_TOKEN_SALT, key='not the secret').sign('token')
+
+    for token in (expired, forged, make_profile_token() + 'x'):
+        response = api_client.get('/orders/', HTTP_X_PROFILE=token)
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response
+    assert artifacts(profiles) == []
+
+
+@pytest.mark.django_db
+def test_only_staff_can_profile_with_the_query_parameter(django_user_model, api_client, profiles):
+    assert 'X-Profile-Id' not in api_client.get('/orders/', {'profile': 1})
+    api_client.force_login(django_user_model.objects.create_user('clerk'))
+    assert 'X-Profile-Id' not in api_client.get('/orders/', {'profile': 1})
+
+    api_client.force_login(django_user_model.objects.create_user('admin', is_staff=True))
+    assert 'X-Profile-Id' in api_client.get('/orders/', {'profile': 1})
+
+
+@pytest.mark.django_db
+def test_sampled_requests_are_limited_to_the_sample_paths(settings, api_client, profiles):
+    settings.REQUEST_PROFILER_SAMPLE_RATE = 1.0
+    settings.REQUEST_PROFILER_SAMPLE_PATHS = ['/orders/']
+
+    assert 'X-Profile-Id' not in api_client.get('/inventory/')
+    response = api_client.get('/orders/')
+
+    assert 'X-Profile-Id' in response
+    assert json.loads((profiles / f'{response["X-Profile-Id"]}.json').read_text())['mode'] == 'sampling'
+
+
+@pytest.mark.django_db
+def test_the_disabled_profiler_leaves_requests_alone(settings, api_client, tmp_path):
+    settings.REQUEST_PROFILER_DIR = tmp_path
+
+    response = api_client.get('/orders/', HTTP_X_PROFILE=make_profile_token())
+
+    assert 'X-Profile-Id' not in response
+    assert artifacts(tmp_path) == []
+
+
+def test_the_sampler_follows_fan_out_tasks(settings):
+    settings.FAN_OUT_WORKERS = 2
+
+    def waiting_in_the_pool():
+        time.sleep(0.05)
+        return threading.current_thread().name
+
+    sampler = StackSampler(threading.get_ident(), 0.001)
+    sampler.start()
+    try:
+        names = fan_out(waiting_in_the_pool, waiting_in_the_pool)
+    finally:
+        sampler.stop()
+
+    assert all(name.startswith('fan-out') for name in names)
+    assert any('waiting_in_the_pool' in stack for stack in sampler.samples)
@@ -0,0 +1,129 @@
+import time
+
+import pytest
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from interview.core import response_cache as response_cache_module
+from interview.core.response_cache import response_cache
+
+
+def version(tag: str):
+    return response_cache.cache.get(response_cache.tag_key(tag))
+
+
+@pytest.fixture
+def versions():
+    response_cache.tag_versions(['orders', 'inventory'])
+    return lambda: (version('orders'), version('inventory'))
+
+
+@pytest.fixture
+def listing():
+    return RequestFactory().get('/orders/', {'page': 1})
+
+
+@pytest.fixture
+def builds():
+    built = []
+
+    def build():
+        built.append(len(built) + 1)
+        return HttpResponse(f'build {len(built)}')
+
+    build.calls = built
+    return build
+
+
+def expire(request, tags):
+    key = response_cache.entry_key(request, tags)
+    entry = response_cache.cache.get(key)
+    response_cache.cache.set(key, {**entry, 'expires': time.time() - 1})
+    return key
+
+
+@pytest.mark.django_db(transaction=True)
+def test_tags_are_bumped_once_the_transaction_commits(versions):
+    orders, inventory = versions()
+
+    with transaction.atomic():
+        response_cache.invalidate('orders')
+        response_cache.invalidate('orders', 'inventory')
+        assert versions() == (orders, inventory)
+
+    assert versions() == (orders + 1, inventory + 1)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_tags_of_a_rolled_back_transaction_are_dropped(versions):
+    orders, inventory = versions()
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        response_cache.invalidate('inventory')
+        raise RuntimeError
+
+    with transaction.atomic():
+        response_cache.invalidate('orders')
+
+    assert versions() == (orders + 1, inventory)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_tags_outside_a_transaction_are_bumped_at_once(versions):
+    orders, inventory = versions()
+
+    response_cache.invalidate('orders')
+    response_cache.invalidate('orders')
+
+    assert versions() == (orders + 2, inventory)
+
+
+def test_expired_entries_are_served_stale_while_one_worker_rebuilds(listing, builds):
+    assert response_cache.fetch(listing, ['orders'], builds)['X-Cache'] == 'MISS'
+    assert response_cache.fetch(listing, ['orders'], builds)['X-Cache'] == 'HIT'
+    key = expire(listing, ['orders'])
+    response_cache.cache.add(f'{key}:lock', 'other worker')
+
+    response = response_cache.fetch(listing, ['orders'], builds)
+
+    assert (response['X-Cache'], response.content) == ('STALE', b'build 1')
+    assert builds.calls == [1]
+
+    response_cache.cache.delete(f'{key}:lock')
+    response = response_cache.fetch(listing, ['orders'], builds)
+    assert (response['X-Cache'], response.content) == ('MISS', b'build 2')
+
+
+def test_cold_misses_wait_for_the_worker_holding_the_lock(monkeypatch, listing, builds):
+    key = response_cache.entry_key(listing, ['orders'])
+    response_cache.cache.add(f'{key}:lock', 'other worker')
+    entry = {'expires': time.time() + 60, 'status': 200, 'content': b'built elsewhere', 'content_type': 'text/plain'}
+    # The other worker finishes while this one sleeps.
+    monkeypatch.setattr(response_cache_module.time, 'sleep', lambda seconds: response_cache.cache.set(key, entry))
+
+    response = response_cache.fetch(listing, ['orders'], builds)
+
+    assert (response['X-Cache'], response.content) == ('HIT', b'built elsewhere')
+    assert builds.calls == []
+
+
+def test_cold_misses_build_once_the_wait_runs_out(settings, listing, builds):
+    settings.RESPONSE_CACHE_LOCK_WAIT = 0.1
+    key = response_cache.entry_key(listing, ['orders'])
+    response_cache.cache.add(f'{key}:lock', 'other worker')
+
+    response = response_cache.fetch(listing, ['orders'], builds)
+
+    assert (response['X-Cache'], response.content) == ('MISS', b'build 1')
+    # The lock is left to its owner.
+    assert response_cache.cache.get(f'{key}:lock') == 'other worker'
+
+
+def test_invalidated_tags_reach_new_keys(listing, builds):
+    response_cache.fetch(listing, ['orders'], builds)
+
+    response_cache.bump(['orders'])
+
+    response = response_cache.fetch(listing, ['orders'], builds)
+    assert (response['X-Cache'], response.content) == ('MISS', b'build 2')
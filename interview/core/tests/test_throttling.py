@@ -0,0 +1,160 @@
+import time
+
+import pytest
+from django.core.cache import caches
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from interview.core import throttling
+from interview.core.throttling import ConcurrencyThrottle, ThrottleReleaseMiddleware, TokenBucketThrottle
+
+
+class View:
+    throttle_scope = 'test'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(throttling.time, 'time', lambda: now[0])
+
+    def advance(seconds: float):
+        now[0] += seconds
+
+    return advance
+
+
+def make_request(ip: str = '10.0.0.1') -> Request:
+    return Request(APIRequestFactory().get('/', REMOTE_ADDR=ip))
+
+
+def in_flight(scope: str, client: str = 'ip:10.0.0.1') -> int:
+    return caches['throttle'].get(f'throttle:inflight:{scope}:{client}', 0)
+
+
+def allowed(throttle, count: int, ip: str = '10.0.0.1') -> list:
+    return [throttle.allow_request(make_request(ip), View()) for _ in range(count)]
+
+
+def test_token_bucket_admits_a_burst_then_refills_at_the_rate(settings, clock):
+    settings.THROTTLES = {'test': {'rate': '60/min', 'burst': 3}}
+    throttle = TokenBucketThrottle()
+
+    assert allowed(throttle, 4) == [True, True, True, False]
+    assert throttle.wait() == 1.0
+
+    clock(0.5)
+    assert allowed(throttle, 1) == [False]
+    assert throttle.wait() == 0.5
+
+    clock(0.5)
+    assert allowed(throttle, 2) == [True, False]
+
+    clock(10)
+    assert allowed(throttle, 4) == [True, True, True, False]
+
+
+def test_token_buckets_are_per_client(settings, clock):
+    settings.THROTTLES = {'test': {'rate': '60/min', 'burst': 1}}
+    throttle = TokenBucketThrottle()
+
+    assert allowed(throttle, 2) == [True, False]
+    assert allowed(throttle, 2, ip='10.0.0.2') == [True, False]
+
+
+def test_scopes_without_a_rate_are_not_limited(settings):
+    settings.THROTTLES = {'test': {'concurrency': 1}}
+
+    assert allowed(TokenBucketThrottle(), 5) == [True] * 5
+
+
+def test_concurrency_is_capped_per_client(settings):
+    settings.THROTTLES = {'test': {'concurrency': 2}}
+    throttle = ConcurrencyThrottle()
+
+    assert allowed(throttle, 3) == [True, True, False]
+    # The rejected request gave its slot back.
+    assert in_flight('test') == 2
+    assert throttle.wait() == 1
+
+
+@pytest.fixture
+def slotted(settings):
+    settings.THROTTLES = {'test': {'concurrency': 1}}
+
+    def make(response=None, error=None):
+        request = make_request()
+
+        def get_response(django_request):
+            assert ConcurrencyThrottle().allow_request(request, View())
+            if error:
+                raise error
+            return response
+
+        return request._request, ThrottleReleaseMiddleware(get_response)
+
+    return make
+
+
+def test_slots_are_released_with_the_response(slotted):
+    request, middleware = slotted(HttpResponse('done'))
+
+    middleware(request)
+
+    assert in_flight('test') == 0
+
+
+def test_slots_are_released_when_the_view_raises(slotted):
+    request, middleware = slotted(error=RuntimeError('boom'))
+
+    with pytest.raises(RuntimeError):
+        middleware(request)
+
+    assert in_flight('test') == 0
+
+
+def test_streamed_responses_hold_their_slot_until_the_last_chunk(slotted):
+    request, middleware = slotted(StreamingHttpResponse(iter([b'a', b'b'])))
+
+    response = middleware(request)
+    chunks = iter(response)
+    assert next(chunks) == b'a'
+    assert in_flight('test') == 1
+
+    assert list(chunks) == [b'b']
+    assert in_flight('test') == 0
+
+
+def test_streamed_responses_release_their_slot_on_disconnect(slotted):
+    request, middleware = slotted(StreamingHttpResponse(iter([b'a', b'b'])))
+
+    response = middleware(request)
+    next(iter(response))
+    response.close()
+
+    assert in_flight('test') == 0
+
+
+@pytest.mark.django_db
+def test_throttled_responses_release_their_slot(api_client, settings, inventory):
+    settings.THROTTLES = {'expensive': {'rate': '1/min', 'burst': 1, 'concurrency': 1}}
+
+    assert api_client.get('/inventory/').status_code == 200
+    response = api_client.get('/inventory/')
+
+    assert response.status_code == 429
+    assert in_flight('expensive', 'ip:127.0.0.1') == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_exports_hold_their_slot_while_streaming(api_client, settings, inventory):
+    settings.THROTTLES = {'expensive': {'concurrency': 1}}
+    params = {'file_format': 'csv', 'chunk_size': 1}
+
+    export = api_client.get('/exports/inventory/', params)
+    assert api_client.get('/exports/inventory/', params).status_code == 429
+
+    assert b''.join(export.streaming_content).startswith(b'id,')
+    assert in_flight('expensive', 'ip:127.0.0.1') == 0
+    assert api_client.get('/exports/inventory/', params).status_code == 200
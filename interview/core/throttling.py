@@ -0,0 +1,174 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+THROTTLE_CACHE_PREFIX = 'throttle'
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate: str) -> float:
+    """Requests per second for a rate like ``'100/min'``."""
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period]
+
+
+def scope_for(view, method: str):
+    """
+    The throttle scope a view declares for ``method``: ``throttle_scope`` is
+    a scope name for every method or a dict keyed by lower-case method name.
+    """
+    scope = getattr(view, 'throttle_scope', None)
+    if isinstance(scope, dict):
+        return scope.get(method.lower())
+    return scope
+
+
+class ScopedThrottle(BaseThrottle):
+    """Shared plumbing: resolves the view's scope, its config in ``THROTTLES`` and the client."""
+
+    def get_config(self, request, view):
+        scope = scope_for(view, request.method)
+        if scope is None:
+            return None, None
+
+        return scope, settings.THROTTLES.get(scope)
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_client(self, request) -> str:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+
+class TokenBucketThrottle(ScopedThrottle):
+    """
+    Token bucket per client and scope, refilled at the scope's ``rate`` and
+    holding up to ``burst`` tokens.
+
+    Stored as a single integer in the throttle cache using GCRA: the key
+    holds the time (ms) at which the bucket will be full again and each
+    request moves it forward by one token with ``incr``, so admitting a
+    request is one atomic round trip on backends with an atomic ``incr``
+    such as Redis. A rejected request gives its token back with ``decr``.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        scope, config = self.get_config(request, view)
+        if not config or not config.get('rate'):
+            return True
+
+        interval = int(1000 / parse_rate(config['rate']))
+        capacity = interval * config.get('burst', 1)
+        key = f'{THROTTLE_CACHE_PREFIX}:bucket:{scope}:{self.get_client(request)}'
+        now = int(time.time() * 1000)
+
+        try:
+            full_at = self.cache.incr(key, interval)
+        except ValueError:
+            if self.cache.add(key, now + interval, timeout=settings.THROTTLE_BUCKET_TIMEOUT):
+                return True
+            full_at = self.cache.incr(key, interval)
+
+        if full_at - interval < now:
+            # The bucket had refilled completely, restart from now. A missing
+            # or expired key means the same, so keys only need to outlive
+            # clients that stay throttled.
+            self.cache.set(key, now + interval, timeout=settings.THROTTLE_BUCKET_TIMEOUT)
+            return True
+        if full_at - now > capacity:
+            self.cache.decr(key, interval)
+            self.wait_seconds = (full_at - now - capacity) / 1000
+            return False
+
+        return True
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class ConcurrencyThrottle(ScopedThrottle):
+    """
+    Caps the requests a client has in flight for a scope at its
+    ``concurrency``.
+
+    The slot is taken here and released by ``ThrottleReleaseMiddleware``
+    once the response is done, which for streamed exports is after the
+    last chunk. Counters expire ``THROTTLE_CONCURRENCY_TIMEOUT`` seconds
+    after the last request so slots held by a killed worker do not leak.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        scope, config = self.get_config(request, view)
+        if not config or not config.get('concurrency'):
+            return True
+
+        key = f'{THROTTLE_CACHE_PREFIX}:inflight:{scope}:{self.get_client(request)}'
+        try:
+            in_flight = self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, timeout=settings.THROTTLE_CONCURRENCY_TIMEOUT):
+                in_flight = 1
+            else:
+                in_flight = self.cache.incr(key)
+        if in_flight > config['concurrency']:
+            self.release(key)
+            return False
+
+        self.cache.touch(key, settings.THROTTLE_CONCURRENCY_TIMEOUT)
+        request._request.throttle_slots = [*getattr(request._request, 'throttle_slots', []), key]
+        return True
+
+    def release(self, key: str) -> None:
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass
+
+    def wait(self):
+        return 1
+
+
+class ThrottleReleaseMiddleware:
+    """
+    Frees the concurrency slots a request took once its response is done:
+    right away for regular responses, after the last chunk (or a client
+    disconnect) for streamed ones.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.release(request)
+            raise
+
+        if not getattr(request, 'throttle_slots', None):
+            return response
+        if response.streaming:
+            response.streaming_content = self.release_after(request, response.streaming_content)
+        else:
+            self.release(request)
+
+        return response
+
+    def release_after(self, request, content):
+        try:
+            yield from content
+        finally:
+            self.release(request)
+
+    def release(self, request) -> None:
+        throttle = ConcurrencyThrottle()
+        for key in getattr(request, 'throttle_slots', []):
+            throttle.release(key)
+        request.throttle_slots = []
@@ -0,0 +1,13 @@
+
+from django.urls import path
+from interview.core.views import ExportView, JobRetrieveView
+from interview.inventory.views import InventoryChangesView
+from interview.order.views import OrderChangesView
+
+
+urlpatterns = [
+    path('changes/inventory/', InventoryChangesView.as_view(), name='changes-inventory'),
+    path('changes/orders/', OrderChangesView.as_view(), name='changes-orders'),
+    path('exports/<str:table>/', ExportView.as_view(), name='export'),
+    path('jobs/<int:id>/', JobRetrieveView.as_view(), name='job-detail'),
+]
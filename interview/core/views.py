@@ -1,3 +1,50 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from interview.core.export import EXPORT_FORMATS, get_table_export, resolve_format, stream_export
+from interview.core.models import Job
+from interview.core.serializers import JobSerializer
+
+
+class JobRetrieveView(APIView):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            job = self.get_queryset(id=kwargs['id'])
+        except Job.DoesNotExist:
+            return Response({'error': 'Job not found'}, status=404)
+        serializer = self.serializer_class(job)
+
+        return Response(serializer.data, status=200)
+
+    def get_queryset(self, **kwargs):
+        return self.queryset.get(**kwargs)
+
+
+class ExportView(APIView):
+    """Streams a whole table as Parquet, Arrow IPC or CSV (``?file_format=``)."""
+    throttle_scope = 'expensive'
+
+    def get(self, request: Request, *args, **kwargs):
+        try:
+            table = get_table_export(kwargs['table'])
+        except LookupError as e:
+            return Response({'error': str(e)}, status=404)
+        try:
+            file_format = resolve_format(request.query_params.get('file_format'))
+            chunk_size = int(request.query_params.get('chunk_size', settings.EXPORT_CHUNK_SIZE))
+            if not 0 < chunk_size <= settings.EXPORT_MAX_CHUNK_SIZE:
+                raise ValueError(f'chunk_size must be between 1 and {settings.EXPORT_MAX_CHUNK_SIZE}')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        content_type, extension = EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(stream_export(table, file_format, chunk_size), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{table.name}.{extension}"'
+
+        return response
@@ -1,3 +1,61 @@
 from django.contrib import admin
 
-# Register your models here.
+from interview.core.counts import EstimatedCountPaginator
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryTag, InventoryType
+
+
+class DeletedListFilter(admin.SimpleListFilter):
+    title = 'deleted'
+    parameter_name = 'deleted'
+
+    def lookups(self, request, model_admin):
+        return (('no', 'No'), ('yes', 'Yes'))
+
+    def queryset(self, request, queryset):
+        if self.value() == 'no':
+            return queryset.alive()
+        if self.value() == 'yes':
+            return queryset.dead()
+        return queryset
+
+
+@admin.register(Inventory)
+class InventoryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'type', 'language', 'updated_at', 'deleted_at')
+    list_select_related = ('type', 'language')
+    list_filter = (DeletedListFilter, 'type', 'language')
+    # Newest first on the (updated_at, id) index; other columns are unindexed.
+    ordering = ('-updated_at', '-id')
+    sortable_by = ('id', 'updated_at')
+    search_fields = ('=id', '=natural_keys__value')
+    search_help_text = 'Exact id or natural key.'
+    autocomplete_fields = ('type', 'language', 'tags')
+    readonly_fields = ('created_at', 'updated_at', 'deleted_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Soft deleted rows stay reachable here, see DeletedListFilter.
+        return Inventory.all_objects.all()
+
+
+@admin.register(InventoryTag)
+class InventoryTagAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'is_active')
+    list_filter = ('is_active',)
+    ordering = ('name',)
+    search_fields = ('name',)
+
+
+@admin.register(InventoryLanguage)
+class InventoryLanguageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    ordering = ('name',)
+    search_fields = ('name',)
+
+
+@admin.register(InventoryType)
+class InventoryTypeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    ordering = ('name',)
+    search_fields = ('name',)
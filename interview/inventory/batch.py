@@ -0,0 +1,50 @@
+from django.db import transaction
+
+from interview.core.batch import BatchPatchError, apply_batch_patch
+from interview.core.response_cache import response_cache
+from interview.inventory.facets import inventory_facets
+from interview.inventory.metadata import validate_metadata_batch
+from interview.inventory.models import Inventory
+from interview.inventory.natural_keys import NATURAL_KEY_FIELDS, sync_natural_keys
+
+
+def batch_patch_inventory(patches: list) -> dict:
+    """
+    Apply validated inventory patches (``name``, ``type``, ``language`` and
+    ``metadata``) atomically, see ``apply_batch_patch``. Soft deleted rows
+    cannot be patched.
+    """
+    with transaction.atomic():
+        result = apply_batch_patch(Inventory.objects.all(), patches, validate=_validate_metadata)
+        sync_natural_keys(pk for pk, fields in result['changed'].items() if NATURAL_KEY_FIELDS & set(fields))
+
+    if result['updated']:
+        response_cache.invalidate('inventory')
+    fields = {field for fields in result['changed'].values() for field in fields}
+    if 'type_id' in fields:
+        inventory_facets['types'].invalidate()
+    if 'language_id' in fields:
+        inventory_facets['languages'].invalidate()
+
+    return result
+
+
+def _validate_metadata(rows: dict, patches: list) -> None:
+    # A new type can invalidate the stored metadata, so both are checked
+    # against the schema of the type the row ends up with.
+    checked = [patch for patch in patches if 'type' in patch or 'metadata' in patch]
+    results, errors = validate_metadata_batch([
+        (
+            patch.get('type', rows[patch['id']].type_id),
+            patch.get('metadata', rows[patch['id']].metadata),
+        )
+        for patch in checked
+    ])
+    if errors:
+        raise BatchPatchError(
+            'Invalid metadata',
+            [{'id': checked[index]['id'], 'metadata': [error]} for index, error in sorted(errors.items())],
+        )
+
+    for index, patch in enumerate(checked):
+        patch['metadata'] = results[index]
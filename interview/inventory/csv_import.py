@@ -0,0 +1,403 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from interview.core.response_cache import response_cache
+from interview.inventory.facets import inventory_facets
+from interview.inventory.metadata import MetadataValidationError, get_metadata_validator
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryNaturalKey, InventoryTag, InventoryType
+from interview.inventory.natural_keys import natural_keys, resolve_natural_key
+
+
+REQUIRED_COLUMNS = ('name', 'type', 'language')
+METADATA_PREFIX = 'metadata_'
+
+STAGING_TABLE = 'inventory_import_staging'
+SOURCE_TABLE = 'inventory_import_source'
+TAG_CHANGES_TABLE = 'inventory_import_tag_changes'
+
+
+class CSVImportError(ValueError):
+
+    def __init__(self, message: str, errors: list = None, invalid: int = 0):
+        self.errors = errors or []
+        self.invalid = invalid
+        super().__init__(message)
+
+
+class RowParser:
+    """
+    Turns CSV rows into staging rows.
+
+    Names are resolved from maps loaded once per import. Metadata comes from a
+    ``metadata`` JSON column and/or flattened ``metadata_<field>`` columns
+    (the layout produced by ``export_table``). It is validated against the
+    schema of the row's type in the staging table (``check_metadata``),
+    unless the schema has fields without SQL rules.
+    """
+
+    def __init__(self, fieldnames: list, key: str):
+        self.key, _ = resolve_natural_key(key)
+        self.types = dict(InventoryType.objects.values_list('name', 'id'))
+        self.languages = dict(InventoryLanguage.objects.values_list('name', 'id'))
+        self.tags = dict(InventoryTag.objects.values_list('name', 'id'))
+        self.validators = {name: get_metadata_validator(type_name=name) for name in self.types}
+        # Types whose metadata is checked in the database, by validator.
+        self.checked = {}
+        for name, validator in list(self.validators.items()):
+            if validator.sql is not None:
+                self.checked.setdefault(validator, []).append(self.types[name])
+                del self.validators[name]
+        self.has_tags = 'tags' in fieldnames
+        self.tag_separator = settings.INVENTORY_CSV_TAG_SEPARATOR
+        self.metadata_columns = [
+            (column, column[len(METADATA_PREFIX):])
+            for column in fieldnames
+            if column.startswith(METADATA_PREFIX) and column != 'metadata_extra'
+        ]
+        self.has_metadata_extra = 'metadata_extra' in fieldnames
+
+    def __call__(self, row: dict) -> tuple:
+        name = (row['name'] or '').strip()
+        if not name:
+            raise ValueError('name is required')
+        if len(name) > 255:
+            raise ValueError('name is longer than 255 characters')
+
+        type_name = (row['type'] or '').strip()
+        if type_name not in self.types:
+            raise ValueError(f'Unknown type "{type_name}"')
+        language = (row['language'] or '').strip()
+        if language not in self.languages:
+            raise ValueError(f'Unknown language "{language}"')
+
+        metadata = self._metadata(row)
+        if type_name in self.validators:
+            metadata = self.validators[type_name](metadata)
+        tag_ids = self._tag_ids(row['tags']) if self.has_tags else None
+        type_id, language_id = self.types[type_name], self.languages[language]
+        keys = natural_keys(
+            {'name': name, 'type': type_id, 'language': language_id, 'metadata': metadata}, first=self.key
+        )
+
+        return keys, name, type_id, language_id, json.dumps(metadata), tag_ids
+
+    def _metadata(self, row: dict) -> dict:
+        metadata = json.loads(row['metadata']) if row.get('metadata') else {}
+        if not isinstance(metadata, dict):
+            raise ValueError('metadata must be a JSON object')
+        if self.has_metadata_extra and row['metadata_extra']:
+            metadata.update(json.loads(row['metadata_extra']))
+
+        for column, field in self.metadata_columns:
+            value = row[column]
+            if value is None or value == '':
+                continue
+            if value[0] in '[{':
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            metadata[field] = value
+
+        return metadata
+
+    def _tag_ids(self, value: str) -> list:
+        tag_ids = set()
+        for tag in (value or '').split(self.tag_separator):
+            tag = tag.strip()
+            if not tag:
+                continue
+            if tag not in self.tags:
+                raise ValueError(f'Unknown tag "{tag}"')
+            tag_ids.add(self.tags[tag])
+
+        return sorted(tag_ids)
+
+
+def import_inventory_csv(
+    stream, key: str = None, skip_invalid: bool = False, batch_size: int = None, progress=None
+) -> dict:
+    """
+    Load a CSV catalog from the text ``stream`` and merge it into inventory.
+
+    Rows are parsed in batches of ``batch_size`` and each batch is sent with
+    ``COPY`` to a temporary staging table. Once the file is read, metadata
+    is validated there and a few set-based statements upsert on the natural
+    key and sync tags, all in one transaction. Invalid rows fail the whole
+    import unless ``skip_invalid``.
+    ``progress`` is called with the rows read after each batch.
+    """
+    batch_size = batch_size or settings.INVENTORY_CSV_BATCH_SIZE
+    reader = csv.DictReader(stream)
+    fieldnames = reader.fieldnames or []
+    missing = [column for column in REQUIRED_COLUMNS if column not in fieldnames]
+    if missing:
+        raise CSVImportError(f'Missing columns: {", ".join(missing)}')
+
+    parse = RowParser(fieldnames, key)
+    errors, invalid, rows = [], 0, 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            CREATE TEMPORARY TABLE {STAGING_TABLE} (
+                line integer NOT NULL,
+                natural_key varchar(128) NOT NULL,
+                natural_keys varchar(128)[] NOT NULL,
+                name varchar(255) NOT NULL,
+                type_id bigint NOT NULL,
+                language_id bigint NOT NULL,
+                metadata jsonb NOT NULL,
+                tag_ids bigint[]
+            ) ON COMMIT DROP
+            '''
+        )
+
+        batch = []
+        for row in reader:
+            rows += 1
+            try:
+                batch.append((reader.line_num, *parse(row)))
+            except (ValueError, MetadataValidationError) as e:
+                invalid += 1
+                if len(errors) < settings.INVENTORY_CSV_MAX_ERRORS:
+                    errors.append({'line': reader.line_num, 'error': str(e)})
+                continue
+            if len(batch) == batch_size:
+                _copy_batch(cursor, batch)
+                batch = []
+                if progress is not None:
+                    progress(rows)
+        if batch:
+            _copy_batch(cursor, batch)
+
+        checked_invalid, checked_errors, metadata = check_metadata(cursor, parse.checked)
+        invalid += checked_invalid
+        errors = sorted(errors + checked_errors, key=lambda error: error['line'])[:settings.INVENTORY_CSV_MAX_ERRORS]
+        if invalid and not skip_invalid:
+            raise CSVImportError(f'{invalid} invalid rows', errors, invalid)
+
+        counts = _merge(cursor, metadata)
+
+    if counts['created'] or counts['updated']:
+        inventory_facets.invalidate()
+        response_cache.invalidate('inventory')
+
+    return {'rows': rows, **counts, 'invalid': invalid, 'errors': errors}
+
+
+def _copy_batch(cursor, batch: list) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for line, keys, name, type_id, language_id, metadata, tag_ids in batch:
+        tags = None if tag_ids is None else '{' + ','.join(map(str, tag_ids)) + '}'
+        writer.writerow((line, keys[0], '{' + ','.join(keys) + '}', name, type_id, language_id, metadata, tags))
+    buffer.seek(0)
+
+    cursor.copy_expert(f'COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT csv)', buffer)
+
+
+def check_metadata(cursor, checked: dict) -> tuple:
+    """
+    Validate the staged metadata of the types in ``checked`` (validators to
+    type ids) with the validators' SQL, in one scan, and drop invalid rows.
+    Returns the invalid row count, the first errors and the SQL expression
+    for the normalized metadata, applied as the rows are merged.
+    """
+    if not checked:
+        return 0, [], 'metadata'
+    errors, values, params = [], [], []
+    for validator, type_ids in checked.items():
+        error, value = validator.sql
+        errors.append(f'WHEN type_id = ANY(%s) THEN {error}')
+        values.append(f'WHEN type_id = ANY(%s) THEN {value}')
+        params.append(type_ids)
+    error, metadata = f"CASE {' '.join(errors)} END", f"CASE {' '.join(values)} ELSE metadata END"
+    # The normalized metadata is inlined with its type ids, the merge
+    # statements take no parameters.
+    metadata = cursor.mogrify(metadata, params).decode()
+
+    cursor.execute(
+        f'''
+        SELECT line, error, count(*) OVER () FROM (SELECT line, {error} AS error FROM {STAGING_TABLE}) checked
+        WHERE error IS NOT NULL ORDER BY line LIMIT %s
+        ''',
+        [*params, settings.INVENTORY_CSV_MAX_ERRORS],
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return 0, [], metadata
+    cursor.execute(f'DELETE FROM {STAGING_TABLE} WHERE ({error}) IS NOT NULL', params)
+
+    return rows[0][2], [{'line': line, 'error': error} for line, error, _ in rows], metadata
+
+
+def _merge(cursor, metadata: str) -> dict:
+    inventory = Inventory._meta.db_table
+    through = Inventory.tags.through._meta.db_table
+    keys = InventoryNaturalKey._meta.db_table
+
+    # Later lines win when the file repeats a natural key.
+    cursor.execute(
+        f'''
+        CREATE TEMPORARY TABLE {SOURCE_TABLE} ON COMMIT DROP AS
+        SELECT DISTINCT ON (natural_key) line, natural_key, natural_keys, name, type_id, language_id,
+            {metadata} AS metadata, tag_ids, NULL::bigint AS id, false AS created, false AS written
+        FROM {STAGING_TABLE} ORDER BY natural_key, line DESC
+        '''
+    )
+    cursor.execute(f'CREATE UNIQUE INDEX ON {SOURCE_TABLE} (natural_key)')
+
+    # Each line matches the title holding its first stored natural key, so
+    # catalogs can switch keys without duplicating titles. The others get
+    # ids from the inventory sequence up front, to insert them with their
+    # keys and tags below.
+    cursor.execute(
+        f'''
+        UPDATE {SOURCE_TABLE} source SET id = (
+            SELECT stored.inventory_id
+            FROM unnest(source.natural_keys) WITH ORDINALITY AS wanted (value, position)
+            JOIN {keys} stored ON stored.value = wanted.value
+            ORDER BY wanted.position LIMIT 1
+        )
+        '''
+    )
+    cursor.execute(
+        f'''
+        UPDATE {SOURCE_TABLE} SET created = true, written = true,
+            id = nextval(pg_get_serial_sequence('{inventory}', 'id'))
+        WHERE id IS NULL
+        '''
+    )
+
+    # New titles claim their keys first, see claim_natural_keys: the unique
+    # index makes writers wait only on the keys they share. Lines that lost
+    # a key to a title another import or upsert created meanwhile give back
+    # what they claimed and match that title instead.
+    cursor.execute(
+        f'''
+        INSERT INTO {keys} (inventory_id, key, value)
+        SELECT source.id, split_part(wanted.value, ':', 1), wanted.value
+        FROM {SOURCE_TABLE} source CROSS JOIN LATERAL unnest(source.natural_keys) AS wanted (value)
+        WHERE source.created
+        ORDER BY wanted.value
+        ON CONFLICT (value) DO NOTHING
+        '''
+    )
+    cursor.execute(
+        f'''
+        WITH lost AS (
+            SELECT DISTINCT ON (source.line) source.line, source.id AS reserved, stored.inventory_id AS owner
+            FROM {SOURCE_TABLE} source
+            CROSS JOIN LATERAL unnest(source.natural_keys) WITH ORDINALITY AS wanted (value, position)
+            JOIN {keys} stored ON stored.value = wanted.value
+            WHERE source.created
+            AND stored.inventory_id NOT IN (SELECT id FROM {SOURCE_TABLE} WHERE created)
+            ORDER BY source.line, wanted.position
+        ), released AS (
+            DELETE FROM {keys} WHERE inventory_id IN (SELECT reserved FROM lost)
+        )
+        UPDATE {SOURCE_TABLE} source SET id = lost.owner, created = false, written = false
+        FROM lost WHERE source.line = lost.line
+        '''
+    )
+
+    # Lines reaching the same title through different keys: the later wins.
+    cursor.execute(
+        f'''
+        DELETE FROM {SOURCE_TABLE} source USING (
+            SELECT line, row_number() OVER (PARTITION BY id ORDER BY line DESC) AS position
+            FROM {SOURCE_TABLE}
+        ) ranked
+        WHERE ranked.line = source.line AND ranked.position > 1
+        '''
+    )
+    cursor.execute(f'CREATE UNIQUE INDEX ON {SOURCE_TABLE} (id)')
+    cursor.execute(f'ANALYZE {SOURCE_TABLE}')
+    cursor.execute(f'SELECT count(*) FROM {SOURCE_TABLE}')
+    total = cursor.fetchone()[0]
+
+    cursor.execute(
+        f'''
+        INSERT INTO {inventory} (id, name, type_id, language_id, metadata, created_at, updated_at, deleted_at)
+        SELECT id, name, type_id, language_id, metadata, now(), now(), NULL FROM {SOURCE_TABLE} WHERE created
+        '''
+    )
+    created = cursor.rowcount
+
+    # Rows already holding the same values are left alone, soft deleted
+    # rows are restored.
+    cursor.execute(
+        f'''
+        WITH updated AS (
+            UPDATE {inventory} current SET
+                name = source.name,
+                type_id = source.type_id,
+                language_id = source.language_id,
+                metadata = source.metadata,
+                updated_at = now(),
+                deleted_at = NULL
+            FROM {SOURCE_TABLE} source
+            WHERE current.id = source.id AND NOT source.created
+            AND (current.name, current.type_id, current.language_id, current.metadata, current.deleted_at)
+                IS DISTINCT FROM (source.name, source.type_id, source.language_id, source.metadata, NULL)
+            RETURNING current.id
+        )
+        UPDATE {SOURCE_TABLE} source SET written = true FROM updated WHERE source.id = updated.id
+        '''
+    )
+    updated = cursor.rowcount
+
+    # Updated titles hold exactly the keys their new values provide, unless
+    # another title already claimed one.
+    cursor.execute(
+        f'''
+        DELETE FROM {keys} stored USING {SOURCE_TABLE} source
+        WHERE stored.inventory_id = source.id AND source.written AND NOT source.created
+        AND stored.value <> ALL(source.natural_keys)
+        '''
+    )
+    cursor.execute(
+        f'''
+        INSERT INTO {keys} (inventory_id, key, value)
+        SELECT source.id, split_part(wanted.value, ':', 1), wanted.value
+        FROM {SOURCE_TABLE} source CROSS JOIN LATERAL unnest(source.natural_keys) AS wanted (value)
+        WHERE source.written AND NOT source.created
+        ORDER BY wanted.value
+        ON CONFLICT DO NOTHING
+        '''
+    )
+
+    # Only rows whose tag set differs are rewritten, a tag-only change
+    # still bumps updated_at for the change feeds.
+    cursor.execute(
+        f'''
+        CREATE TEMPORARY TABLE {TAG_CHANGES_TABLE} ON COMMIT DROP AS
+        SELECT source.id, source.tag_ids, source.written
+        FROM {SOURCE_TABLE} source
+        WHERE source.tag_ids IS NOT NULL
+        AND source.tag_ids IS DISTINCT FROM coalesce((
+            SELECT array_agg(link.inventorytag_id ORDER BY link.inventorytag_id)
+            FROM {through} link WHERE link.inventory_id = source.id
+        ), '{{}}')
+        '''
+    )
+    cursor.execute(f'DELETE FROM {through} WHERE inventory_id IN (SELECT id FROM {TAG_CHANGES_TABLE})')
+    cursor.execute(
+        f'''
+        INSERT INTO {through} (inventory_id, inventorytag_id)
+        SELECT id, unnest(tag_ids) FROM {TAG_CHANGES_TABLE}
+        '''
+    )
+    cursor.execute(
+        f'''
+        UPDATE {inventory} SET updated_at = now()
+        WHERE id IN (SELECT id FROM {TAG_CHANGES_TABLE} WHERE NOT written)
+        '''
+    )
+    updated += cursor.rowcount
+
+    return {'created': created, 'updated': updated, 'unchanged': total - created - updated}
@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import F, OuterRef
+
+from interview.core.export import Column, TableExport
+from interview.inventory.models import Inventory
+from interview.inventory.schemas import METADATA_SCHEMAS, InventoryMetaData
+
+
+def _metadata_type(field) -> str:
+    if field.shape != 1:
+        return 'string_list' if field.type_ is str else 'string'
+    if field.type_ is int:
+        return 'int'
+    if field.type_ in (float, Decimal):
+        return 'float'
+    return 'string'
+
+
+def _metadata_fields() -> dict:
+    fields = {}
+    for schema in (InventoryMetaData, *METADATA_SCHEMAS.values()):
+        for name, field in schema.__fields__.items():
+            fields.setdefault(name, _metadata_type(field))
+
+    return fields
+
+
+METADATA_FIELDS = _metadata_fields()
+
+
+def _metadata_value(name: str):
+    def get(row):
+        metadata = row['metadata']
+        return metadata.get(name) if isinstance(metadata, dict) else None
+
+    return get
+
+
+def _metadata_extra(row):
+    # Keys outside the registered schemas, kept as a JSON object.
+    metadata = row['metadata']
+    if not isinstance(metadata, dict):
+        return metadata
+    extra = {key: value for key, value in metadata.items() if key not in METADATA_FIELDS}
+    return extra or None
+
+
+def inventory_queryset():
+    tags = Inventory.tags.through.objects.filter(inventory_id=OuterRef('pk')).values('inventorytag_id')
+
+    return (
+        Inventory.objects.order_by('id')
+        .annotate(type_name=F('type__name'), language_name=F('language__name'), tag_ids=ArraySubquery(tags))
+        .values(
+            'id', 'name', 'type_id', 'type_name', 'language_id', 'language_name',
+            'tag_ids', 'metadata', 'created_at', 'updated_at',
+        )
+    )
+
+
+inventory_export = TableExport(
+    'inventory',
+    inventory_queryset,
+    [
+        Column('id', 'int'),
+        Column('name', 'string'),
+        Column('type_id', 'int'),
+        Column('type', 'string', 'type_name'),
+        Column('language_id', 'int'),
+        Column('language', 'string', 'language_name'),
+        Column('tags', 'int_list', 'tag_ids'),
+        *[Column(f'metadata_{name}', type, get=_metadata_value(name)) for name, type in METADATA_FIELDS.items()],
+        Column('metadata_extra', 'string', get=_metadata_extra),
+        Column('created_at', 'timestamp'),
+        Column('updated_at', 'timestamp'),
+    ],
+)
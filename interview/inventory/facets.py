@@ -0,0 +1,11 @@
+from interview.core.facets import FacetSet
+from interview.inventory.models import Inventory
+
+
+inventory_facets = FacetSet('inventory', Inventory, tags='tags', types='type', languages='language')
+
+INVENTORY_FACET_FILTERS = {
+    'type': 'type_id',
+    'language': 'language_id',
+    'tags': 'tags__id__in',
+}
@@ -0,0 +1,83 @@
+import io
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from interview.core.models import Job
+from interview.inventory.csv_import import CSVImportError, import_inventory_csv
+from interview.inventory.purge import purge_deleted_inventory
+from interview.inventory.similarity import sync_similarity
+from interview.inventory.upsert import upsert_inventory
+
+
+def bulk_import(job, items: list, key: str = None) -> dict:
+    batch_size = settings.INVENTORY_UPSERT_BATCH_SIZE
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+
+    job.set_progress(0, total=len(items))
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        for name, count in upsert_inventory(batch, key=key).items():
+            counts[name] += count
+        job.set_progress(start + len(batch))
+
+    return counts
+
+
+def import_csv(job, path: str, key: str = None, skip_invalid: bool = False) -> dict:
+    """
+    Import a catalog stored by ``InventoryCSVImportView``, then delete it
+    unless the job will be retried. A rejected file is reported in the
+    result (``error``, ``invalid``, ``errors``) rather than retried, it
+    would be rejected again.
+    """
+    retry = False
+    try:
+        with default_storage.open(path, 'rb') as upload:
+            return import_inventory_csv(
+                io.TextIOWrapper(upload, encoding='utf-8-sig', newline=''),
+                key=key,
+                skip_invalid=skip_invalid,
+                progress=job.set_progress,
+            )
+    except CSVImportError as e:
+        return {'error': str(e), 'invalid': e.invalid, 'errors': e.errors}
+    except (ValueError, UnicodeDecodeError) as e:
+        return {'error': str(e)}
+    except Exception:
+        retry = job.attempts < settings.JOB_MAX_ATTEMPTS
+        raise
+    finally:
+        if not retry:
+            default_storage.delete(path)
+
+
+def purge(job, grace_days: int = None, chunk_size: int = None) -> dict:
+    return purge_deleted_inventory(
+        grace_days if grace_days is not None else settings.INVENTORY_PURGE_GRACE_DAYS,
+        chunk_size or settings.INVENTORY_PURGE_CHUNK_SIZE,
+        progress=job.set_progress,
+    )
+
+
+def similarity(job, full: bool = False) -> dict:
+    # Picks up where the last successful run left off. Incremental refreshes
+    # leave other titles' scores stale as feature frequencies drift, so the
+    # index is also rebuilt every SIMILARITY_REBUILD_INTERVAL seconds.
+    previous = (
+        Job.objects.filter(kind=job.kind, status=Job.Status.SUCCEEDED)
+        .order_by('-finished_at', '-id')
+        .values_list('result', flat=True)
+        .first()
+    ) or {}
+    started_at = timezone.now()
+    rebuilt_at = parse_datetime(previous['rebuilt_at']) if previous.get('rebuilt_at') else None
+    if rebuilt_at is None or rebuilt_at < started_at - timedelta(seconds=settings.SIMILARITY_REBUILD_INTERVAL):
+        full = True
+
+    result = sync_similarity(previous.get('watermark'), full=full, progress=job.set_progress)
+
+    return {**result, 'rebuilt_at': started_at.isoformat() if full else previous['rebuilt_at']}
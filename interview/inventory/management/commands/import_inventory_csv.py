@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.inventory.csv_import import CSVImportError, import_inventory_csv
+
+
+class Command(BaseCommand):
+    help = 'Load an inventory catalog CSV through COPY and merge it on the natural key.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--key', default=None)
+        parser.add_argument('--skip-invalid', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            try:
+                result = import_inventory_csv(
+                    stream, options['key'], options['skip_invalid'], options['batch_size']
+                )
+            except CSVImportError as e:
+                for error in e.errors:
+                    self.stderr.write(f"line {error['line']}: {error['error']}")
+                raise CommandError(str(e))
+            except ValueError as e:
+                raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            f"{result['rows']} rows in {elapsed:.1f}s ({result['rows'] / max(elapsed, 1e-9):.0f} rows/s): "
+            f"{result['created']} created, {result['updated']} updated, "
+            f"{result['unchanged']} unchanged, {result['invalid']} invalid"
+        )
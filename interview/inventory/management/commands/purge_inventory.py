@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interview.inventory.purge import purge_deleted_inventory
+
+
+class Command(BaseCommand):
+    help = 'Hard delete soft deleted inventory and its orders in bounded chunks.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-days', type=int, default=settings.INVENTORY_PURGE_GRACE_DAYS)
+        parser.add_argument('--chunk-size', type=int, default=settings.INVENTORY_PURGE_CHUNK_SIZE)
+        parser.add_argument('--max-items', type=int, default=None)
+
+    def handle(self, *args, **options):
+        counts = purge_deleted_inventory(options['grace_days'], options['chunk_size'], options['max_items'])
+        self.stdout.write(
+            f"Purged {counts['inventory']} inventory items, {counts['orders']} orders "
+            f"and {counts['archived_orders']} archived orders"
+        )
@@ -0,0 +1,197 @@
+from decimal import Decimal
+from functools import cached_property, lru_cache
+
+from interview.core.response_cache import response_cache
+from interview.inventory.models import InventoryType
+
+
+# Strings pydantic accepts for int and Decimal fields.
+INTEGER_PATTERN = r'^\s*[-+]?\d+\s*$'
+NUMBER_PATTERN = r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$'
+
+# Per field type: the SQL telling whether a jsonb value ``{v}`` is accepted,
+# the SQL for the value pydantic would produce from it, and the error.
+SQL_FIELD_TYPES = {
+    int: (
+        "jsonb_typeof({v}) IN ('number', 'boolean') OR jsonb_typeof({v}) = 'string' AND {v} #>> '{{}}' ~ '"
+        + INTEGER_PATTERN + "'",
+        "CASE jsonb_typeof({v}) WHEN 'boolean' THEN to_jsonb(({v})::boolean::int) "
+        "ELSE to_jsonb(trunc(({v} #>> '{{}}')::numeric)) END",
+        'value is not a valid integer',
+    ),
+    Decimal: (
+        "jsonb_typeof({v}) = 'number' OR jsonb_typeof({v}) = 'string' AND {v} #>> '{{}}' ~ '" + NUMBER_PATTERN + "'",
+        "to_jsonb(({v} #>> '{{}}')::numeric::float8)",
+        'value is not a valid decimal',
+    ),
+    str: (
+        "jsonb_typeof({v}) IN ('string', 'number')",
+        "to_jsonb({v} #>> '{{}}')",
+        'str type expected',
+    ),
+}
+
+
+class MetadataValidationError(ValueError):
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(str(errors))
+
+
+class MetadataValidator:
+    """
+    Validates metadata dicts against one schema.
+
+    Uses pydantic's ``validate_model`` directly, which skips building a model
+    instance and the ``.dict()`` copy, and returns JSON-ready values (decimals
+    become floats) merged over the input so keys outside the schema are kept.
+    """
+
+    def __init__(self, schema):
+        from pydantic import validate_model
+
+        self.schema = schema
+        self.validate_model = validate_model
+        self.decimal_fields = tuple(
+            name for name, field in schema.__fields__.items() if field.outer_type_ is Decimal
+        )
+
+    def __call__(self, data) -> dict:
+        if not isinstance(data, dict):
+            raise MetadataValidationError('Expected an object.')
+
+        values, fields_set, error = self.validate_model(self.schema, data)
+        if error:
+            raise MetadataValidationError(str(error))
+
+        for name in self.decimal_fields:
+            if values.get(name) is not None:
+                values[name] = float(values[name])
+
+        return {**data, **{name: value for name, value in values.items() if name in fields_set}}
+
+    @cached_property
+    def sql(self):
+        """
+        ``(error, metadata)`` SQL expressions over a jsonb ``metadata``
+        column, for validating many rows at once in the database: the first
+        error of a row (NULL when valid) and its metadata as ``__call__``
+        would return it. None when a field has a type without SQL rules.
+        """
+        from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+        errors, values = [], []
+        for name, field in self.schema.__fields__.items():
+            if field.type_ not in SQL_FIELD_TYPES or field.shape not in (SHAPE_SINGLETON, SHAPE_LIST):
+                return None
+            v = f"metadata -> '{name}'"
+            valid, value, message = SQL_FIELD_TYPES[field.type_]
+            if field.required:
+                errors.append(f"WHEN {v} IS NULL THEN '{name}: field required'")
+            if not field.allow_none:
+                errors.append(f"WHEN jsonb_typeof({v}) = 'null' THEN '{name}: none is not an allowed value'")
+            if field.shape == SHAPE_LIST:
+                errors.append(
+                    f"WHEN jsonb_typeof({v}) NOT IN ('null', 'array') THEN '{name}: value is not a valid list'"
+                )
+                valid = (
+                    f"jsonb_typeof({v}) <> 'array' OR NOT EXISTS ("
+                    f"SELECT 1 FROM jsonb_array_elements({v}) AS elements (element) "
+                    f"WHERE NOT ({valid.format(v='element')}))"
+                )
+                value = (
+                    f"(SELECT coalesce(jsonb_agg({value.format(v='element')} ORDER BY position), '[]') "
+                    f"FROM jsonb_array_elements({v}) WITH ORDINALITY AS elements (element, position))"
+                )
+            else:
+                valid, value = valid.format(v=v), value.format(v=v)
+            errors.append(f"WHEN jsonb_typeof({v}) <> 'null' AND NOT ({valid}) THEN '{name}: {message}'")
+            values.append(
+                f"CASE WHEN coalesce(jsonb_typeof({v}), 'null') = 'null' THEN '{{}}'::jsonb "
+                f"ELSE jsonb_build_object('{name}', {value}) END"
+            )
+
+        return f"CASE {' '.join(errors)} END", ' || '.join(['metadata', *values])
+
+    def validate_many(self, items: list) -> tuple:
+        """Validate a batch, returning ``(results, errors)`` keyed by position."""
+        from pydantic import ValidationError
+
+        results, errors = {}, {}
+        for index, data in enumerate(items):
+            try:
+                results[index] = self(data)
+            except (MetadataValidationError, ValidationError) as e:
+                errors[index] = str(e)
+
+        return results, errors
+
+
+@lru_cache(maxsize=None)
+def get_validator_for_schema(schema) -> MetadataValidator:
+    return MetadataValidator(schema)
+
+
+@lru_cache(maxsize=None)
+def get_validator_for_type_name(type_name: str = None) -> MetadataValidator:
+    # The schemas pull in pydantic, load them on first validation rather
+    # than whenever views or serializers are imported.
+    from interview.inventory.schemas import METADATA_SCHEMAS, InventoryMetaData
+
+    return get_validator_for_schema(METADATA_SCHEMAS.get(type_name, InventoryMetaData))
+
+
+# Type names per id, tagged with the version of the ``inventory-types``
+# response cache tag they were read under. The tag lives in the shared cache
+# and is bumped whenever a type is saved or deleted, so other workers notice
+# renames too.
+_type_names_cache = {'version': None, 'names': {}}
+
+
+def _type_names() -> dict:
+    [version] = response_cache.tag_versions(['inventory-types'])
+    if _type_names_cache['version'] != version:
+        # Version first: names read after a bump are at worst reloaded once more.
+        _type_names_cache['names'] = dict(InventoryType.objects.values_list('id', 'name'))
+        _type_names_cache['version'] = version
+
+    return _type_names_cache['names']
+
+
+def clear_type_cache() -> None:
+    _type_names_cache['version'] = None
+
+
+def get_metadata_validator(type_id: int = None, type_name: str = None) -> MetadataValidator:
+    if type_name is None and type_id is not None:
+        try:
+            type_id = int(type_id)
+        except (TypeError, ValueError):
+            type_id = None
+        type_name = _type_names().get(type_id)
+        if type_name is None and type_id is not None:
+            # Type committed in another process before it bumped the tag.
+            clear_type_cache()
+            type_name = _type_names().get(type_id)
+
+    return get_validator_for_type_name(type_name)
+
+
+def validate_metadata_batch(items: list) -> tuple:
+    """
+    Validate ``(type_id, metadata)`` pairs, grouped so each type's validator
+    is resolved once. Returns ``(results, errors)`` keyed by position.
+    """
+    by_type = {}
+    for index, (type_id, metadata) in enumerate(items):
+        by_type.setdefault(type_id, []).append(index)
+
+    results, errors = {}, {}
+    for type_id, indexes in by_type.items():
+        validator = get_metadata_validator(type_id)
+        batch_results, batch_errors = validator.validate_many([items[index][1] for index in indexes])
+        results.update({indexes[position]: value for position, value in batch_results.items()})
+        errors.update({indexes[position]: error for position, error in batch_errors.items()})
+
+    return results, errors
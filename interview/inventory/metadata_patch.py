@@ -0,0 +1,79 @@
+import json
+
+from django.db import connection, transaction
+
+from interview.core.jsonpatch import JSONPatchError, json_patch_sql, merge_patch_sql
+from interview.core.response_cache import response_cache
+from interview.inventory.metadata import get_metadata_validator
+from interview.inventory.models import Inventory
+from interview.inventory.natural_keys import metadata_key_members, store_natural_keys
+
+
+class MetadataPatchConflict(JSONPatchError):
+    pass
+
+
+def patch_inventory_metadata(inventory_id: int, patch, json_patch: bool = False) -> dict:
+    """
+    Apply a merge patch (or, with ``json_patch``, a JSON patch) to one
+    inventory's metadata inside the database.
+
+    The patch becomes a single ``UPDATE ... RETURNING``, so concurrent edits
+    to different keys both land and the document never makes a round trip
+    before the write. The result is validated against the type's schema
+    afterwards and the transaction rolls back when it does not conform.
+    Natural keys built from metadata are refreshed when the patch touches
+    their members. Raises ``Inventory.DoesNotExist``, ``JSONPatchError``,
+    ``MetadataPatchConflict`` when a ``test`` operation fails and
+    ``MetadataValidationError``.
+    """
+    if json_patch:
+        sql, params, condition, condition_params = json_patch_sql('metadata', patch)
+    else:
+        (sql, params), condition, condition_params = merge_patch_sql('metadata', patch), 'true', []
+    table = Inventory._meta.db_table
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            UPDATE {table} SET metadata = {sql}, updated_at = now()
+            WHERE id = %s AND deleted_at IS NULL AND {condition}
+            RETURNING type_id, metadata, updated_at, name, language_id
+            ''',
+            [*params, inventory_id, *condition_params],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            if not Inventory.objects.filter(id=inventory_id).exists():
+                raise Inventory.DoesNotExist(f'Inventory {inventory_id} does not exist')
+            raise MetadataPatchConflict('A test operation failed')
+
+        type_id, metadata, updated_at, name, language_id = row
+        metadata = json.loads(metadata) if isinstance(metadata, str) else metadata
+        validated = get_metadata_validator(type_id)(metadata)
+        if validated != metadata:
+            # The validator normalized a value (e.g. a numeric string), store that form.
+            cursor.execute(f'UPDATE {table} SET metadata = %s::jsonb WHERE id = %s', [json.dumps(validated), inventory_id])
+        if _touched_members(patch, json_patch) & metadata_key_members():
+            store_natural_keys(
+                {inventory_id: {'name': name, 'type': type_id, 'language': language_id, 'metadata': validated}}
+            )
+
+    response_cache.invalidate('inventory')
+
+    return {'id': inventory_id, 'metadata': validated, 'updated_at': updated_at}
+
+
+def _touched_members(patch, json_patch: bool) -> set:
+    # Top-level metadata members a patch may change, ``{''}`` standing for
+    # the whole document.
+    if not json_patch:
+        return set(patch) if isinstance(patch, dict) else {''}
+
+    members = set()
+    for operation in patch:
+        for path in (operation.get('path'), operation.get('from')):
+            if path is not None:
+                members.add(path.split('/')[1].replace('~1', '/').replace('~0', '~') if path else '')
+
+    return members
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.7 on 2026-10-19 05:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventory",
+            name="natural_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=128, null=True, unique=True
+            ),
+        ),
+    ]
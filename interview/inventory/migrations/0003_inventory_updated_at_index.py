@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-19 05:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0002_inventory_natural_key"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="inventory",
+            index=models.Index(
+                fields=["updated_at", "id"], name="inventory_i_updated_806441_idx"
+            ),
+        ),
+    ]
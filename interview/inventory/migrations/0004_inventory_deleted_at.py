@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-19 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0003_inventory_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventory",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.1.7 on 2026-10-19 06:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0004_inventory_deleted_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventoryNeighbor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "inventory",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbors",
+                        to="inventory.inventory",
+                    ),
+                ),
+                (
+                    "neighbor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="inventory.inventory",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="InventoryFeature",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("feature", models.CharField(max_length=255)),
+                (
+                    "inventory",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="features",
+                        to="inventory.inventory",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="inventoryneighbor",
+            index=models.Index(
+                fields=["inventory", "-score"], name="inventory_neighbor_score_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="inventoryneighbor",
+            constraint=models.UniqueConstraint(
+                fields=("inventory", "neighbor"), name="inventory_neighbor_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="inventoryfeature",
+            constraint=models.UniqueConstraint(
+                fields=("feature", "inventory"), name="inventory_feature_unique"
+            ),
+        ),
+    ]
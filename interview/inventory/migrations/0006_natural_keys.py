@@ -0,0 +1,107 @@
+# Generated by Django 4.1.7 on 2026-10-19 07:00
+
+import hashlib
+import json
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# INVENTORY_NATURAL_KEYS as of this migration, frozen so later settings or
+# code changes cannot change what it backfills.
+NATURAL_KEYS = {
+    "name_type_language": ("name", "type", "language"),
+    "external_id": ("metadata.external_id",),
+}
+BATCH_SIZE = 2000
+
+
+def build_natural_key(key, parts, item):
+    values = []
+    for part in parts:
+        value = item
+        for segment in part.split("."):
+            value = value.get(segment) if isinstance(value, dict) else None
+        if value is None:
+            return None
+        values.append(value)
+
+    digest = hashlib.sha1(json.dumps(values, default=str).encode()).hexdigest()
+    return f"{key}:{digest}"
+
+
+def backfill_natural_keys(apps, schema_editor):
+    # Keys set by the upsert API are kept, then every title gets the keys
+    # its values provide. Titles are visited oldest first, so among
+    # duplicates the oldest keeps a contested key.
+    Inventory = apps.get_model("inventory", "Inventory")
+    InventoryNaturalKey = apps.get_model("inventory", "InventoryNaturalKey")
+    db = schema_editor.connection.alias
+
+    rows = (
+        Inventory.objects.using(db)
+        .order_by("id")
+        .values_list("id", "natural_key", "name", "type_id", "language_id", "metadata")
+    )
+    batch = []
+    for inventory_id, natural_key, name, type_id, language_id, metadata in rows.iterator(chunk_size=BATCH_SIZE):
+        item = {"name": name, "type": type_id, "language": language_id, "metadata": metadata}
+        keys = {}
+        if natural_key:
+            keys[natural_key.split(":", 1)[0]] = natural_key
+        for key, parts in NATURAL_KEYS.items():
+            value = build_natural_key(key, parts, item)
+            if value is not None:
+                keys.setdefault(key, value)
+        batch.extend(
+            InventoryNaturalKey(inventory_id=inventory_id, key=key, value=value) for key, value in keys.items()
+        )
+        if len(batch) >= BATCH_SIZE:
+            InventoryNaturalKey.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    InventoryNaturalKey.objects.using(db).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0005_similarity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventoryNaturalKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=32)),
+                ("value", models.CharField(max_length=128, unique=True)),
+                (
+                    "inventory",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="natural_keys",
+                        to="inventory.inventory",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="inventorynaturalkey",
+            constraint=models.UniqueConstraint(
+                fields=("inventory", "key"), name="inventory_natural_key_unique"
+            ),
+        ),
+        migrations.RunPython(backfill_natural_keys, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="inventory",
+            name="natural_key",
+        ),
+    ]
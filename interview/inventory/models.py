@@ -1,6 +1,6 @@
 from django.db import models
 
-from interview.core.behaviors import IsActiveModel, NameModel, TimestampedModel, UniqueNameModel
+from interview.core.behaviors import IsActiveModel, NameModel, SoftDeleteModel, TimestampedModel, UniqueNameModel
 
 
 class InventoryTag(UniqueNameModel, TimestampedModel, IsActiveModel, models.Model):
@@ -27,7 +27,7 @@ class InventoryType(UniqueNameModel, TimestampedModel, models.Model):
         return self.name
 
 
-class Inventory(NameModel, TimestampedModel, models.Model):
+class Inventory(NameModel, TimestampedModel, SoftDeleteModel, models.Model):
     type = models.ForeignKey(
         InventoryType,
         on_delete=models.CASCADE,
@@ -43,6 +43,7 @@ class Inventory(NameModel, TimestampedModel, models.Model):
     
     class Meta:
         verbose_name_plural = 'Inventories'
+        indexes = [models.Index(fields=['updated_at', 'id'])]
 
     def __str__(self) -> str:
         return self.name
@@ -53,4 +54,51 @@ class Inventory(NameModel, TimestampedModel, models.Model):
     
     @classmethod
     def get_by_language(cls, language_id: int):
-        return cls.objects.filter(language_id=language_id)
\ No newline at end of file
+        return cls.objects.filter(language_id=language_id)
+
+
+class InventoryNaturalKey(models.Model):
+    """
+    One row per configured INVENTORY_NATURAL_KEYS key an inventory's values
+    provide, so partner feeds can be re-applied idempotently whichever key
+    they match on. The first title to claim a key keeps it.
+    """
+    inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='natural_keys')
+    key = models.CharField(max_length=32)
+    value = models.CharField(max_length=128, unique=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['inventory', 'key'], name='inventory_natural_key_unique')]
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class InventoryFeature(models.Model):
+    """
+    Inverted index for related titles: one row per actor (``actor:<name>``)
+    or tag (``tag:<id>``) of a live inventory. Maintained by
+    ``interview.inventory.similarity``.
+    """
+    inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='features')
+    feature = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['feature', 'inventory'], name='inventory_feature_unique')]
+
+    def __str__(self) -> str:
+        return self.feature
+
+
+class InventoryNeighbor(models.Model):
+    """The ``SIMILARITY_TOP_K`` most similar live titles per inventory, by ``score``."""
+    inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='neighbors')
+    neighbor = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['inventory', 'neighbor'], name='inventory_neighbor_unique')]
+        indexes = [models.Index(fields=['inventory', '-score'], name='inventory_neighbor_score_idx')]
+
+    def __str__(self) -> str:
+        return f'{self.inventory_id} -> {self.neighbor_id}'
@@ -0,0 +1,193 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from interview.inventory.models import Inventory, InventoryNaturalKey
+
+
+# json.dumps(values, default=str) without building an encoder per call.
+KEY_ENCODER = json.JSONEncoder(default=str)
+
+# Inventory fields the configured natural keys are built from.
+NATURAL_KEY_FIELDS = {'name', 'type', 'type_id', 'language', 'language_id', 'metadata'}
+
+
+def resolve_natural_key(key: str = None) -> tuple:
+    key = key or settings.INVENTORY_DEFAULT_NATURAL_KEY
+    if key not in settings.INVENTORY_NATURAL_KEYS:
+        raise ValueError(f'Unknown natural key "{key}"')
+
+    return key, settings.INVENTORY_NATURAL_KEYS[key]
+
+
+def build_natural_key(key: str, parts: tuple, item: dict) -> str:
+    values = []
+    for part in parts:
+        value = item
+        for segment in part.split('.'):
+            value = value.get(segment) if isinstance(value, dict) else None
+        if value is None:
+            raise ValueError(f'Missing natural key part "{part}"')
+        values.append(value)
+
+    digest = hashlib.sha1(KEY_ENCODER.encode(values).encode()).hexdigest()
+
+    return f'{key}:{digest}'
+
+
+def natural_keys(item: dict, first: str = None) -> list:
+    """
+    Every configured natural key ``item`` provides, the ``first`` key's
+    (which must be provided) ahead of the others in settings order.
+    """
+    configured = settings.INVENTORY_NATURAL_KEYS
+    keys = []
+    if first is not None:
+        keys.append(build_natural_key(first, configured[first], item))
+    for key, parts in configured.items():
+        if key == first:
+            continue
+        try:
+            keys.append(build_natural_key(key, parts, item))
+        except ValueError:
+            continue
+
+    return keys
+
+
+def metadata_key_members() -> set:
+    """Top-level metadata members the configured natural keys read, plus ``''`` (the whole document)."""
+    return {''} | {
+        part.split('.')[1]
+        for parts in settings.INVENTORY_NATURAL_KEYS.values()
+        for part in parts
+        if part.startswith('metadata.')
+    }
+
+
+def natural_key_item(inventory: Inventory) -> dict:
+    """An inventory's values in the item shape natural keys are built from."""
+    return {
+        'name': inventory.name,
+        'type': inventory.type_id,
+        'language': inventory.language_id,
+        'metadata': inventory.metadata,
+    }
+
+
+def store_natural_keys(items: dict) -> None:
+    """
+    Store the natural keys of ``items``, inventory ids to item dicts, and
+    drop the ones their new values no longer produce. A key already held by
+    another title stays with that title.
+    """
+    if not items:
+        return
+    wanted = {
+        (inventory_id, value.split(':', 1)[0]): value
+        for inventory_id, item in items.items()
+        for value in natural_keys(item)
+    }
+
+    with transaction.atomic(savepoint=False):
+        stored = InventoryNaturalKey.objects.filter(inventory_id__in=items).values_list(
+            'id', 'inventory_id', 'key', 'value'
+        )
+        stale, kept = [], set()
+        for pk, inventory_id, key, value in stored:
+            if wanted.get((inventory_id, key)) == value:
+                kept.add((inventory_id, key))
+            else:
+                stale.append(pk)
+        if stale:
+            InventoryNaturalKey.objects.filter(id__in=stale).delete()
+        InventoryNaturalKey.objects.bulk_create(
+            [
+                InventoryNaturalKey(inventory_id=inventory_id, key=key, value=value)
+                for (inventory_id, key), value in wanted.items()
+                if (inventory_id, key) not in kept
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def sync_natural_keys(ids) -> None:
+    """``store_natural_keys`` for inventories written without a model save."""
+    rows = Inventory.all_objects.filter(id__in=list(ids)).values_list(
+        'id', 'name', 'type_id', 'language_id', 'metadata'
+    )
+    store_natural_keys({
+        inventory_id: {'name': name, 'type': type_id, 'language': language_id, 'metadata': metadata}
+        for inventory_id, name, type_id, language_id, metadata in rows
+    })
+
+
+def match_natural_keys(keys: dict) -> dict:
+    """
+    The title each entry of ``keys`` (any hashable to a list of natural
+    keys, best first) resolves to, by its first stored key.
+    """
+    values = {value for candidates in keys.values() for value in candidates}
+    stored = dict(InventoryNaturalKey.objects.filter(value__in=values).values_list('value', 'inventory_id'))
+
+    matches = {}
+    for entry, candidates in keys.items():
+        for value in candidates:
+            if value in stored:
+                matches[entry] = stored[value]
+                break
+
+    return matches
+
+
+def claim_natural_keys(claims: dict) -> dict:
+    """
+    Store the natural keys of titles about to be created, ``claims``
+    mapping the ids reserved for them to their keys. Returns the reserved
+    ids that lost a key to a title of another transaction, mapped to the
+    title holding the first such key: their items belong to that title, and
+    the keys they did claim are given back.
+
+    The unique index on ``value`` serializes writers per key, not per
+    catalog: inserting a key another open transaction inserted waits for it
+    and, once it commits, skips the key. Keys go in sorted order so two
+    writers cannot deadlock. A key two titles of ``claims`` share stays
+    with one of them, as in ``store_natural_keys``.
+    """
+    rows = sorted({(value, inventory_id) for inventory_id, values in claims.items() for value in values})
+    if not rows:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            INSERT INTO {InventoryNaturalKey._meta.db_table} (inventory_id, key, value)
+            SELECT claimed.inventory_id, split_part(claimed.value, ':', 1), claimed.value
+            FROM unnest(%s::varchar[], %s::bigint[]) AS claimed (value, inventory_id)
+            ORDER BY claimed.value
+            ON CONFLICT (value) DO NOTHING
+            RETURNING value
+            ''',
+            [[value for value, _ in rows], [inventory_id for _, inventory_id in rows]],
+        )
+        inserted = {row[0] for row in cursor.fetchall()}
+    taken = {value for value, _ in rows if value not in inserted}
+    if not taken:
+        return {}
+
+    owners = dict(
+        InventoryNaturalKey.objects.filter(value__in=taken).exclude(inventory_id__in=claims).values_list(
+            'value', 'inventory_id'
+        )
+    )
+    lost = {}
+    for inventory_id, values in claims.items():
+        owner = next((owners[value] for value in values if value in owners), None)
+        if owner is not None:
+            lost[inventory_id] = owner
+    if lost:
+        InventoryNaturalKey.objects.filter(inventory_id__in=lost).delete()
+
+    return lost
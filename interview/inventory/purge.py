@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from interview.core.models import Tombstone
+from interview.core.response_cache import response_cache
+from interview.inventory.facets import inventory_facets
+from interview.inventory.models import Inventory
+from interview.order.calendar import clear_closed_periods
+from interview.order.events import publish_removed_orders
+from interview.order.facets import order_facets
+from interview.order.models import ArchivedOrder, Order
+
+
+def purge_deleted_inventory(grace_days: int, chunk_size: int, max_items: int = None, progress=None) -> dict:
+    """
+    Hard delete inventory soft deleted more than ``grace_days`` ago.
+
+    Dependent orders, archived orders and tag links are removed in
+    transactions of at most ``chunk_size`` rows, so no single statement has
+    to cascade over a popular title's full order history. Each chunk is one
+    raw DELETE, with the tombstones, ``deleted`` events and calendar rollup
+    clears the per row delete signals would send written for the chunk.
+    """
+    cutoff = timezone.now() - timedelta(days=grace_days)
+    inventory_ids = list(
+        Inventory.all_objects.dead()
+        .filter(deleted_at__lt=cutoff)
+        .order_by('deleted_at')
+        .values_list('id', flat=True)[:max_items]
+    )
+
+    counts = {'inventory': 0, 'orders': 0, 'archived_orders': 0}
+    for inventory_id in inventory_ids:
+        counts['orders'] += _delete_in_chunks(Order.objects.filter(inventory_id=inventory_id), chunk_size)
+        counts['archived_orders'] += _delete_in_chunks(
+            ArchivedOrder.objects.filter(inventory_id=inventory_id), chunk_size
+        )
+        with transaction.atomic():
+            Inventory.tags.through.objects.filter(inventory_id=inventory_id).delete()
+            counts['inventory'] += Inventory.all_objects.filter(id=inventory_id).delete()[1].get(Inventory._meta.label, 0)
+        if progress is not None:
+            progress(counts['inventory'])
+
+    if any(counts.values()):
+        inventory_facets.invalidate()
+        order_facets.invalidate()
+        response_cache.invalidate('inventory', 'orders')
+
+    return counts
+
+
+def _delete_in_chunks(queryset, chunk_size: int) -> int:
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by('id')[:chunk_size])
+            if not rows:
+                return deleted
+
+            ids = [row.id for row in rows]
+            if model is Order:
+                Order.tags.through.objects.filter(order_id__in=ids).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {model._meta.db_table} WHERE id = ANY(%s)', [ids])
+            if model is Order:
+                Tombstone.objects.bulk_create([Tombstone(resource='orders', object_id=pk) for pk in ids])
+                publish_removed_orders('deleted', rows)
+            clear_closed_periods(*[day for row in rows for day in (row.start_date, row.embargo_date)])
+        deleted += len(ids)
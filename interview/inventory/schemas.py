@@ -1,5 +1,7 @@
 
 from decimal import Decimal
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -7,4 +9,25 @@ class InventoryMetaData(BaseModel):
     year: int
     actors: list[str]
     imdb_rating: Decimal
-    rotten_tomatoes_rating: int
\ No newline at end of file
+    rotten_tomatoes_rating: int
+
+
+class MovieMetaData(InventoryMetaData):
+    film_locations: list[str] = []
+
+
+class EpisodeMetaData(InventoryMetaData):
+    season: Optional[int] = None
+    episode: Optional[int] = None
+
+
+class VersionMetaData(InventoryMetaData):
+    edition: Optional[str] = None
+
+
+# Keyed by InventoryType.name, other types use InventoryMetaData.
+METADATA_SCHEMAS = {
+    'Movie': MovieMetaData,
+    'Episode': EpisodeMetaData,
+    'Version': VersionMetaData,
+}
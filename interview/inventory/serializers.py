@@ -1,6 +1,30 @@
+from collections import Counter
+
+from django.conf import settings
 from rest_framework import serializers
 
-from interview.inventory.models import Inventory, InventoryLanguage, InventoryTag, InventoryType
+from interview.inventory.metadata import validate_metadata_batch
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryNeighbor, InventoryTag, InventoryType
+
+
+def validate_references(*references) -> None:
+    """Check ``(field, model, ids)`` references with one query per model."""
+    for field, model, ids in references:
+        if not ids:
+            continue
+        missing = ids - set(model.objects.filter(id__in=ids).values_list('id', flat=True))
+        if missing:
+            raise serializers.ValidationError({field: f'Unknown ids: {sorted(missing)}'})
+
+
+def validate_batch_patch_items(items: list) -> list:
+    if len(items) > settings.BATCH_PATCH_MAX_ITEMS:
+        raise serializers.ValidationError(f'At most {settings.BATCH_PATCH_MAX_ITEMS} patches per request')
+    duplicates = sorted(pk for pk, count in Counter(item['id'] for item in items).items() if count > 1)
+    if duplicates:
+        raise serializers.ValidationError(f'Duplicate ids: {duplicates}')
+
+    return items
 
 
 class InventoryTagSerializer(serializers.ModelSerializer):
@@ -32,4 +56,72 @@ class InventorySerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Inventory
-        fields = ['id', 'name', 'type', 'language', 'tags', 'metadata']
\ No newline at end of file
+        fields = ['id', 'name', 'type', 'language', 'tags', 'metadata', 'updated_at']
+
+
+class RelatedInventorySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='neighbor_id')
+    name = serializers.CharField(source='neighbor.name')
+    type = InventoryTypeSerializer(source='neighbor.type')
+    language = InventoryLanguageSerializer(source='neighbor.language')
+
+    class Meta:
+        model = InventoryNeighbor
+        fields = ['id', 'name', 'type', 'language', 'score']
+
+
+class InventoryUpsertItemSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    type = serializers.IntegerField()
+    language = serializers.IntegerField()
+    tags = serializers.ListField(child=serializers.IntegerField(), required=False)
+    metadata = serializers.JSONField()
+
+
+class InventoryUpsertSerializer(serializers.Serializer):
+    key = serializers.CharField(required=False)
+    items = InventoryUpsertItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items):
+        # One lookup per reference table for the whole batch instead of a
+        # PrimaryKeyRelatedField query per item.
+        validate_references(
+            ('type', InventoryType, {item['type'] for item in items}),
+            ('language', InventoryLanguage, {item['language'] for item in items}),
+            ('tags', InventoryTag, {tag for item in items for tag in item.get('tags', [])}),
+        )
+
+        # Metadata is validated once per batch against each type's schema.
+        results, errors = validate_metadata_batch([(item['type'], item['metadata']) for item in items])
+        if errors:
+            raise serializers.ValidationError(
+                [{'metadata': [errors[index]]} if index in errors else {} for index in range(len(items))]
+            )
+        for index, item in enumerate(items):
+            item['metadata'] = results[index]
+
+        return items
+
+
+class InventoryPatchItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    updated_at = serializers.DateTimeField(required=False)
+    name = serializers.CharField(max_length=255, required=False)
+    type = serializers.IntegerField(required=False)
+    language = serializers.IntegerField(required=False)
+    metadata = serializers.JSONField(required=False)
+
+
+class InventoryBatchPatchSerializer(serializers.Serializer):
+    items = InventoryPatchItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items):
+        validate_batch_patch_items(items)
+        # Metadata is checked against the row's resulting type once the rows
+        # are loaded, see interview.inventory.batch.
+        validate_references(
+            ('type', InventoryType, {item['type'] for item in items if 'type' in item}),
+            ('language', InventoryLanguage, {item['language'] for item in items if 'language' in item}),
+        )
+
+        return items
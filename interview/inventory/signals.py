@@ -0,0 +1,107 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from interview.core.models import Tombstone
+from interview.core.response_cache import response_cache
+from interview.core.signals import is_active_changed, soft_deleted, touch_on_m2m_changed
+from interview.inventory.facets import inventory_facets
+from interview.inventory.metadata import clear_type_cache
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryTag, InventoryType
+from interview.inventory.natural_keys import NATURAL_KEY_FIELDS, natural_key_item, store_natural_keys
+
+
+@receiver(post_save, sender=Inventory)
+def update_facets_on_inventory_save(sender, instance: Inventory, created: bool, **kwargs):
+    if created:
+        inventory_facets['types'].adjust(instance.type_id, 1)
+        inventory_facets['languages'].adjust(instance.language_id, 1)
+    else:
+        # The previous type/language is unknown here, so recount lazily.
+        inventory_facets['types'].invalidate()
+        inventory_facets['languages'].invalidate()
+
+
+@receiver(post_save, sender=Inventory)
+def store_inventory_natural_keys(sender, instance: Inventory, update_fields, **kwargs):
+    # Titles created or edited through the API can be matched by the upsert
+    # API and the CSV import like the ones they created.
+    if update_fields is not None and not NATURAL_KEY_FIELDS & set(update_fields):
+        return
+    store_natural_keys({instance.pk: natural_key_item(instance)})
+
+
+@receiver(post_delete, sender=Inventory)
+def update_facets_on_inventory_delete(sender, instance: Inventory, **kwargs):
+    if instance.deleted_at is not None:
+        # Already dropped from the counts when it was soft deleted.
+        return
+
+    inventory_facets['types'].adjust(instance.type_id, -1)
+    inventory_facets['languages'].adjust(instance.language_id, -1)
+    # Tag links are removed by the cascade without an m2m_changed signal.
+    inventory_facets['tags'].invalidate()
+
+
+@receiver(m2m_changed, sender=Inventory.tags.through)
+def update_facets_on_inventory_tags_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    inventory_facets['tags'].m2m_changed(action, instance, reverse, pk_set)
+
+
+@receiver(post_delete, sender=InventoryTag)
+@receiver(post_delete, sender=InventoryType)
+@receiver(post_delete, sender=InventoryLanguage)
+def update_facets_on_reference_delete(sender, instance, **kwargs):
+    inventory_facets.invalidate()
+
+
+@receiver(post_delete, sender=Inventory)
+def record_inventory_tombstone(sender, instance: Inventory, **kwargs):
+    if instance.deleted_at is None:
+        Tombstone.record('inventory', instance.pk)
+
+
+@receiver(soft_deleted, sender=Inventory)
+def handle_inventory_soft_delete(sender, instance: Inventory, **kwargs):
+    # Soft deleted rows leave the change feed and facet counts right away,
+    # the purge job removes them for good later.
+    Tombstone.record('inventory', instance.pk)
+    inventory_facets.invalidate()
+
+
+@receiver(m2m_changed, sender=Inventory.tags.through)
+def touch_inventory_on_tags_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    touch_on_m2m_changed(Inventory, 'inventories', instance, action, reverse, pk_set)
+
+
+@receiver(post_save, sender=InventoryType)
+@receiver(post_delete, sender=InventoryType)
+def clear_metadata_type_cache(sender, **kwargs):
+    clear_type_cache()
+
+
+@receiver(post_save, sender=Inventory)
+@receiver(post_delete, sender=Inventory)
+@receiver(soft_deleted, sender=Inventory)
+@receiver(m2m_changed, sender=Inventory.tags.through)
+def invalidate_inventory_responses(sender, **kwargs):
+    # Order responses embed inventory, so they are keyed on this tag too.
+    response_cache.invalidate('inventory')
+
+
+@receiver(post_save, sender=InventoryTag)
+@receiver(post_delete, sender=InventoryTag)
+@receiver(is_active_changed, sender=InventoryTag)
+def invalidate_inventory_tag_responses(sender, **kwargs):
+    response_cache.invalidate('inventory-tags')
+
+
+@receiver(post_save, sender=InventoryType)
+@receiver(post_delete, sender=InventoryType)
+def invalidate_inventory_type_responses(sender, **kwargs):
+    response_cache.invalidate('inventory-types')
+
+
+@receiver(post_save, sender=InventoryLanguage)
+@receiver(post_delete, sender=InventoryLanguage)
+def invalidate_inventory_language_responses(sender, **kwargs):
+    response_cache.invalidate('inventory-languages')
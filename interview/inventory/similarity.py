@@ -0,0 +1,269 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from interview.core.horizon import change_horizon
+from interview.core.counts import table_estimate
+from interview.inventory.models import Inventory, InventoryFeature, InventoryNeighbor
+
+
+PAIRS_TABLE = 'inventory_similarity_pairs'
+
+FEATURES_SQL = '''
+INSERT INTO {features} (inventory_id, feature)
+SELECT DISTINCT inventory.id, left('actor:' || lower(btrim(actor)), 255)
+FROM {inventory} inventory
+CROSS JOIN LATERAL jsonb_array_elements_text(
+    CASE WHEN jsonb_typeof(inventory.metadata -> 'actors') = 'array' THEN inventory.metadata -> 'actors' ELSE '[]' END
+) actor
+WHERE inventory.id = ANY(%(ids)s) AND inventory.deleted_at IS NULL AND btrim(actor) <> ''
+UNION
+SELECT inventory.id, 'tag:' || tags.inventorytag_id
+FROM {inventory} inventory JOIN {tags} tags ON tags.inventory_id = inventory.id
+WHERE inventory.id = ANY(%(ids)s) AND inventory.deleted_at IS NULL
+'''
+
+# Shared features are weighted by kind and by rarity (a smoothed idf), and
+# features with more than SIMILARITY_MAX_POSTINGS titles are skipped: they
+# say little and would make every title a candidate of every other. Both
+# titles of a pair are read by primary key, never the whole table.
+PAIRS_SQL = '''
+SELECT shared.inventory_id, shared.neighbor_id,
+    shared.score
+    + CASE WHEN source.type_id = neighbor.type_id THEN %(type_weight)s ELSE 0 END
+    + %(year_weight)s * coalesce(greatest(0, 1 - abs(
+        CASE WHEN jsonb_typeof(source.metadata -> 'year') = 'number' THEN (source.metadata ->> 'year')::float END
+        - CASE WHEN jsonb_typeof(neighbor.metadata -> 'year') = 'number' THEN (neighbor.metadata ->> 'year')::float END
+    ) / %(year_window)s), 0) AS score
+FROM (
+    SELECT source.inventory_id, other.inventory_id AS neighbor_id,
+        sum(
+            CASE WHEN left(source.feature, 6) = 'actor:' THEN %(actor_weight)s ELSE %(tag_weight)s END
+            * ln(1 + %(total)s::float / postings.count)
+        ) AS score
+    FROM {features} source
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS count FROM (
+            SELECT 1 FROM {features} posting WHERE posting.feature = source.feature LIMIT %(max_postings)s + 1
+        ) capped
+    ) postings
+    JOIN {features} other ON other.feature = source.feature AND other.inventory_id <> source.inventory_id
+    WHERE source.inventory_id = ANY(%(ids)s) AND postings.count <= %(max_postings)s
+    GROUP BY source.inventory_id, other.inventory_id
+) shared
+JOIN {inventory} source ON source.id = shared.inventory_id AND source.deleted_at IS NULL
+JOIN {inventory} neighbor ON neighbor.id = shared.neighbor_id AND neighbor.deleted_at IS NULL
+'''
+
+# The best SIMILARITY_TOP_K of {scored} pairs (a table, or the query above)
+# per title.
+TOP_K_SQL = '''
+INSERT INTO {neighbors} (inventory_id, neighbor_id, score)
+SELECT inventory_id, neighbor_id, score FROM (
+    SELECT *, row_number() OVER (PARTITION BY inventory_id ORDER BY score DESC, neighbor_id) AS position
+    FROM {scored} scored
+) ranked
+WHERE position <= %(top_k)s
+'''
+
+# Lists of other titles that hold a refreshed title whose score dropped (or
+# that it no longer pairs with, e.g. once deleted). Such a list may now miss
+# a candidate below its old cut-off, so it is recomputed in full.
+STALE_SQL = '''
+DELETE FROM {neighbors} listed
+WHERE listed.neighbor_id = ANY(%(ids)s) AND NOT listed.inventory_id = ANY(%(ids)s)
+AND NOT EXISTS (
+    SELECT 1 FROM {pairs} pair
+    WHERE pair.inventory_id = listed.neighbor_id AND pair.neighbor_id = listed.inventory_id
+    AND pair.score >= listed.score
+)
+RETURNING listed.inventory_id
+'''
+
+# Similarity is symmetric, offer each refreshed title to its candidates'
+# lists, which are trimmed back to SIMILARITY_TOP_K below.
+REVERSE_SQL = '''
+INSERT INTO {neighbors} (inventory_id, neighbor_id, score)
+SELECT neighbor_id, inventory_id, score FROM {pairs}
+WHERE inventory_id = ANY(%(ids)s) AND NOT neighbor_id = ANY(%(ids)s)
+ON CONFLICT (inventory_id, neighbor_id) DO UPDATE SET score = EXCLUDED.score
+RETURNING inventory_id
+'''
+
+TRIM_SQL = '''
+DELETE FROM {neighbors} WHERE id IN (
+    SELECT id FROM (
+        SELECT id, row_number() OVER (PARTITION BY inventory_id ORDER BY score DESC, neighbor_id) AS position
+        FROM {neighbors} WHERE inventory_id = ANY(%(ids)s)
+    ) ranked
+    WHERE position > %(top_k)s
+)
+'''
+
+
+def _format(sql: str, **kwargs) -> str:
+    return sql.format(
+        **kwargs,
+        inventory=Inventory._meta.db_table,
+        tags=Inventory.tags.through._meta.db_table,
+        features=InventoryFeature._meta.db_table,
+        neighbors=InventoryNeighbor._meta.db_table,
+        pairs=PAIRS_TABLE,
+    )
+
+
+def _parameters(ids: list) -> dict:
+    weights = settings.SIMILARITY_WEIGHTS
+    return {
+        'ids': ids,
+        'total': max(table_estimate(Inventory), 1),
+        'max_postings': settings.SIMILARITY_MAX_POSTINGS,
+        'top_k': settings.SIMILARITY_TOP_K,
+        'year_window': float(settings.SIMILARITY_YEAR_WINDOW),
+        'actor_weight': weights['actor'],
+        'tag_weight': weights['tag'],
+        'type_weight': weights['type'],
+        'year_weight': weights['year'],
+    }
+
+
+def _create_pairs_table(cursor) -> None:
+    cursor.execute(
+        f'CREATE TEMPORARY TABLE IF NOT EXISTS {PAIRS_TABLE} '
+        '(inventory_id bigint, neighbor_id bigint, score float) ON COMMIT DROP'
+    )
+
+
+def _score(cursor, params: dict, keep_pairs: bool = False) -> None:
+    """
+    Replace the neighbour lists of the titles in ``params['ids']``. With
+    ``keep_pairs`` every scored pair is kept in the pairs table as well.
+    """
+    cursor.execute(_format('DELETE FROM {neighbors} WHERE inventory_id = ANY(%(ids)s)'), params)
+    if not keep_pairs:
+        cursor.execute(_format(TOP_K_SQL, scored=f'({_format(PAIRS_SQL)})'), params)
+        return
+
+    cursor.execute(f'TRUNCATE {PAIRS_TABLE}')
+    cursor.execute(f'INSERT INTO {PAIRS_TABLE} (inventory_id, neighbor_id, score) {_format(PAIRS_SQL)}', params)
+    cursor.execute(_format(TOP_K_SQL, scored=PAIRS_TABLE), params)
+
+
+def refresh_similarity(ids: list) -> dict:
+    """
+    Rebuild the features and neighbour lists of the inventories in ``ids``
+    and bring the other titles' lists up to date with them.
+
+    Deleted (or soft deleted) ids lose their features and neighbours. The
+    refreshed titles are merged into the lists of the titles they pair
+    with, and lists that held one whose score dropped are recomputed.
+    """
+    ids = list(ids)
+    if not ids:
+        return {'refreshed': 0, 'recomputed': 0}
+    params = _parameters(ids)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        _create_pairs_table(cursor)
+        cursor.execute(_format('DELETE FROM {features} WHERE inventory_id = ANY(%(ids)s)'), params)
+        cursor.execute(_format(FEATURES_SQL), params)
+        _score(cursor, params, keep_pairs=True)
+
+        cursor.execute(_format(STALE_SQL), params)
+        stale = sorted({row[0] for row in cursor.fetchall()})
+        cursor.execute(_format(REVERSE_SQL), params)
+        offered = sorted({row[0] for row in cursor.fetchall()})
+        cursor.execute(_format(TRIM_SQL), {**params, 'ids': offered})
+        if stale:
+            _score(cursor, {**params, 'ids': stale})
+
+    return {'refreshed': len(ids), 'recomputed': len(stale)}
+
+
+def rebuild_similarity(batch_size: int = None, progress=None) -> dict:
+    """
+    Rebuild the whole index, ``batch_size`` titles per transaction: every
+    live title's features first, then its neighbour list. The current lists
+    keep being served until each is replaced.
+    """
+    batch_size = batch_size or settings.SIMILARITY_BATCH_SIZE
+    ids = list(Inventory.objects.order_by('id').values_list('id', flat=True))
+    batches = [ids[start:start + batch_size] for start in range(0, len(ids), batch_size)]
+    if progress:
+        progress(0, total=len(ids) * 2)
+
+    done = 0
+    for batch in batches:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(_format('DELETE FROM {features} WHERE inventory_id = ANY(%(ids)s)'), {'ids': batch})
+            cursor.execute(_format(FEATURES_SQL), {'ids': batch})
+        done += len(batch)
+        if progress:
+            progress(done)
+
+    with transaction.atomic():
+        InventoryFeature.objects.filter(inventory__deleted_at__isnull=False).delete()
+        InventoryNeighbor.objects.filter(
+            Q(inventory__deleted_at__isnull=False) | Q(neighbor__deleted_at__isnull=False)
+        ).delete()
+    for batch in batches:
+        with transaction.atomic(), connection.cursor() as cursor:
+            _score(cursor, _parameters(batch))
+        done += len(batch)
+        if progress:
+            progress(done)
+
+    return {'refreshed': len(ids), 'recomputed': 0}
+
+
+def sync_similarity(watermark=None, full: bool = False, progress=None) -> dict:
+    """
+    Bring the index up to date with inventory writes after ``watermark``, an
+    ``[updated_at, id]`` pair from a previous run, or rebuild it in full
+    when there is none. Every write path bumps ``updated_at`` (soft deletes
+    and tag changes included), so the changes are read by keyset like the
+    change feeds. Returns the counts and the new ``watermark``.
+    """
+    watermark = _parse_watermark(watermark)
+    if full or watermark is None:
+        latest = _changed_since(None, 1, latest=True)
+        counts = rebuild_similarity(progress=progress)
+        watermark = latest[0] if latest else None
+    else:
+        counts = {'refreshed': 0, 'recomputed': 0}
+        while True:
+            keys = _changed_since(watermark, settings.SIMILARITY_BATCH_SIZE)
+            if not keys:
+                break
+            for name, count in refresh_similarity([key[1] for key in keys]).items():
+                counts[name] += count
+            watermark = keys[-1]
+            if progress:
+                progress(counts['refreshed'])
+
+    if watermark is not None:
+        watermark = [watermark[0].isoformat(), watermark[1]]
+
+    return {**counts, 'watermark': watermark}
+
+
+def _changed_since(watermark, limit: int, latest: bool = False) -> list:
+    # Rows past the change horizon are held back, as in the change feeds, so
+    # transactions that commit out of timestamp order are not skipped.
+    queryset = Inventory.all_objects.filter(updated_at__lte=change_horizon())
+    if watermark is not None:
+        updated_at, last_id = watermark
+        queryset = queryset.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id),
+            updated_at__gte=updated_at,
+        )
+    ordering = ('-updated_at', '-id') if latest else ('updated_at', 'id')
+
+    return list(queryset.order_by(*ordering).values_list('updated_at', 'id')[:limit])
+
+
+def _parse_watermark(watermark):
+    if watermark is None:
+        return None
+    return parse_datetime(watermark[0]), int(watermark[1])
@@ -0,0 +1,50 @@
+import pytest
+
+from interview.inventory.models import InventoryNaturalKey
+
+
+pytestmark = pytest.mark.django_db
+
+CHANGELIST = '/admin/inventory/inventory/'
+
+
+def listed(response) -> list:
+    return [inventory.name for inventory in response.context['cl'].result_list]
+
+
+@pytest.mark.parametrize('titles', [1, 10])
+def test_changelist_queries_do_not_grow_with_rows(admin_client, make_inventory, max_queries, titles):
+    for number in range(titles):
+        make_inventory(f'Alien {number}')
+
+    # Session, user, the type and language filters, the count estimate,
+    # the exact count below the threshold and the page.
+    with max_queries(7):
+        response = admin_client.get(CHANGELIST)
+
+    assert response.status_code == 200
+    assert len(listed(response)) == titles
+
+
+def test_changelist_filters(admin_client, make_inventory, max_queries):
+    make_inventory('Alien')
+    make_inventory('Aliens').soft_delete()
+
+    with max_queries(7):
+        response = admin_client.get(CHANGELIST, {'deleted': 'no'})
+
+    assert listed(response) == ['Alien']
+    assert listed(admin_client.get(CHANGELIST, {'deleted': 'yes'})) == ['Aliens']
+
+
+def test_search_by_natural_key(admin_client, make_inventory, max_queries):
+    alien = make_inventory('Alien')
+    make_inventory('Aliens')
+    key = InventoryNaturalKey.objects.filter(inventory=alien).values_list('value', flat=True).first()
+
+    with max_queries(7):
+        response = admin_client.get(CHANGELIST, {'q': key})
+
+    assert listed(response) == ['Alien']
+    assert listed(admin_client.get(CHANGELIST, {'q': key[:-1]})) == []
+    assert listed(admin_client.get(CHANGELIST, {'q': str(alien.id)})) == ['Alien']
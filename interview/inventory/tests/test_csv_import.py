@@ -0,0 +1,126 @@
+import io
+import json
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+
+from conftest import METADATA
+from interview.core.jobs import claim, run
+from interview.core.models import Job
+from interview.inventory.csv_import import CSVImportError, import_inventory_csv
+from interview.inventory.metadata import MetadataValidationError, get_validator_for_type_name
+from interview.inventory.models import Inventory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def upload(api_client, content: str, **data):
+    return api_client.post(
+        '/inventory/import/csv/',
+        {'file': SimpleUploadedFile('catalog.csv', content.encode(), content_type='text/csv'), **data},
+        format='multipart',
+    )
+
+
+def test_csv_import_is_queued_and_run_by_a_job(api_client, inventory_type, inventory_language):
+    catalog = (
+        'name,type,language,metadata_year,metadata_actors,metadata_imdb_rating,metadata_rotten_tomatoes_rating\n'
+        f'Aliens,{inventory_type.name},{inventory_language.name},1986,"[""Sigourney Weaver""]",8.4,97\n'
+    )
+    response = upload(api_client, catalog)
+
+    assert response.status_code == 202
+    job = Job.objects.get(id=response.data['id'])
+    assert job.kind == 'inventory.import_csv'
+    assert default_storage.exists(job.payload['path'])
+
+    run(claim('worker'))
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.SUCCEEDED
+    assert (job.result['rows'], job.result['created']) == (1, 1)
+    assert Inventory.objects.get().name == 'Aliens'
+    assert not default_storage.exists(job.payload['path'])
+
+
+def test_rejected_csv_is_reported_in_the_job_result(api_client, inventory_type, inventory_language):
+    response = upload(api_client, f'name,type,language\nAliens,Podcast,{inventory_language.name}\n')
+
+    run(claim('worker'))
+
+    job = Job.objects.get(id=response.data['id'])
+    assert job.status == Job.Status.SUCCEEDED
+    assert job.result['invalid'] == 1
+    assert job.result['errors'] == [{'line': 2, 'error': 'Unknown type "Podcast"'}]
+
+
+def test_csv_import_rejects_unknown_keys_upfront(api_client):
+    response = upload(api_client, 'name,type,language\n', key='isbn')
+
+    assert response.status_code == 400
+    assert not Job.objects.exists()
+
+
+@pytest.mark.parametrize('type_name', ['Movie', 'Episode', None])
+@pytest.mark.parametrize('changes', [
+    {},
+    {'year': '1980', 'imdb_rating': ' 8.50 ', 'rotten_tomatoes_rating': 98.7},
+    {'actors': [1, 'Tom Skerritt'], 'external_id': 'tt0078748'},
+    {'year': True},
+    {'year': 'soon'},
+    {'year': None},
+    {'actors': 'Sigourney Weaver'},
+    {'actors': [['Sigourney Weaver']]},
+    {'imdb_rating': '8,5'},
+    {'film_locations': ['Shepperton'], 'season': None, 'episode': '2', 'edition': 3},
+    {'film_locations': None, 'season': 'first'},
+])
+def test_sql_metadata_checks_agree_with_the_validators(type_name, changes):
+    validator = get_validator_for_type_name(type_name)
+    metadata = {**METADATA, **changes}
+    error, normalized = validator.sql
+    with connection.cursor() as cursor:
+        # OFFSET 0 keeps the planner from folding the casts of invalid values.
+        cursor.execute(
+            f'SELECT {error}, CASE WHEN {error} IS NULL THEN ({normalized})::text END '
+            'FROM (SELECT %s::jsonb AS metadata OFFSET 0) staged',
+            [json.dumps(metadata)],
+        )
+        sql_error, sql_metadata = cursor.fetchone()
+
+    try:
+        expected = validator(metadata)
+    except MetadataValidationError:
+        assert sql_error is not None
+    else:
+        assert sql_error is None
+        assert json.loads(sql_metadata) == expected
+
+
+def test_invalid_metadata_is_reported_by_line(inventory_type, inventory_language):
+    header = 'name,type,language,metadata_year,metadata_actors,metadata_imdb_rating,metadata_rotten_tomatoes_rating\n'
+    rows = [
+        f'Alien,{inventory_type.name},{inventory_language.name},1979,"[""Sigourney Weaver""]",8.5,98\n',
+        f'Aliens,{inventory_type.name},{inventory_language.name},soon,"[""Sigourney Weaver""]",8.4,97\n',
+        f'Alien 3,{inventory_type.name},{inventory_language.name},1992,,6.4,44\n',
+    ]
+
+    with pytest.raises(CSVImportError) as error:
+        import_inventory_csv(io.StringIO(header + ''.join(rows)))
+    assert error.value.invalid == 2
+    assert error.value.errors == [
+        {'line': 3, 'error': 'year: value is not a valid integer'},
+        {'line': 4, 'error': 'actors: field required'},
+    ]
+
+    result = import_inventory_csv(io.StringIO(header + ''.join(rows)), skip_invalid=True)
+    assert (result['created'], result['invalid']) == (1, 2)
+    assert Inventory.objects.get().metadata == METADATA
@@ -0,0 +1,31 @@
+import pytest
+from django.core.cache import caches
+
+from interview.inventory.facets import inventory_facets
+from interview.inventory.models import InventoryTag
+
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test_counters_live_in_shared_cache(settings, inventory, inventory_tag):
+    inventory.tags.add(inventory_tag)
+    counter = inventory_facets['tags']
+
+    assert counter.counts() == {inventory_tag.id: 1}
+    assert caches[settings.FACETS_CACHE_ALIAS].get(counter.value_key(inventory_tag.id)) == 1
+
+
+def test_remove_only_decrements_linked_values(make_inventory, inventory_tag):
+    unlinked = InventoryTag.objects.create(name='Remastered')
+    first, second = make_inventory('Alien'), make_inventory('Aliens')
+    first.tags.add(inventory_tag)
+    second.tags.add(inventory_tag, unlinked)
+    counter = inventory_facets['tags']
+    assert counter.counts() == {inventory_tag.id: 2, unlinked.id: 1}
+
+    first.tags.remove(inventory_tag, unlinked)
+    assert counter.counts() == {inventory_tag.id: 1, unlinked.id: 1}
+
+    inventory_tag.inventories.remove(first, second)
+    assert counter.counts() == {inventory_tag.id: 0, unlinked.id: 1}
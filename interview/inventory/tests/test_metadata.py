@@ -0,0 +1,79 @@
+import pytest
+
+from conftest import METADATA
+from interview.core.response_cache import response_cache
+from interview.inventory.metadata import (
+    MetadataValidationError,
+    get_metadata_validator,
+    get_validator_for_type_name,
+    validate_metadata_batch,
+)
+from interview.inventory.models import InventoryType
+
+
+@pytest.mark.parametrize('type_name, extra, expected', [
+    # Defaults are not written back.
+    ('Movie', {}, {}),
+    ('Movie', {'film_locations': ['Shepperton']}, {'film_locations': ['Shepperton']}),
+    ('Episode', {'season': '2', 'episode': None}, {'season': 2, 'episode': None}),
+    ('Version', {'edition': "Director's Cut"}, {'edition': "Director's Cut"}),
+    ('Podcast', {'season': 'first'}, {'season': 'first'}),
+])
+def test_each_type_has_its_schema(type_name, extra, expected):
+    validator = get_validator_for_type_name(type_name)
+
+    assert validator({**METADATA, **extra}) == {**METADATA, **expected}
+
+
+@pytest.mark.parametrize('type_name, extra', [
+    ('Movie', {'film_locations': 'Shepperton'}),
+    ('Episode', {'season': 'first'}),
+    (None, {'year': None}),
+])
+def test_schema_errors_are_raised(type_name, extra):
+    with pytest.raises(MetadataValidationError):
+        get_validator_for_type_name(type_name)({**METADATA, **extra})
+
+
+def test_unknown_keys_are_kept():
+    data = {**METADATA, 'imdb_rating': '8.5', 'external_id': 'tt0078748', 'notes': {'cut': 'theatrical'}}
+
+    assert get_validator_for_type_name('Movie')(data) == {
+        **METADATA, 'external_id': 'tt0078748', 'notes': {'cut': 'theatrical'}
+    }
+
+
+@pytest.mark.django_db
+def test_validators_are_resolved_by_type_id(inventory_type):
+    episode = InventoryType.objects.create(name='Episode')
+
+    results, errors = validate_metadata_batch([
+        (inventory_type.id, {**METADATA, 'season': 'first'}),
+        (episode.id, {**METADATA, 'season': 'first'}),
+        (None, METADATA),
+    ])
+
+    assert results == {0: {**METADATA, 'season': 'first'}, 2: METADATA}
+    assert list(errors) == [1]
+
+
+@pytest.mark.django_db
+def test_renamed_types_are_picked_up(inventory_type):
+    assert get_metadata_validator(inventory_type.id).schema.__name__ == 'MovieMetaData'
+
+    inventory_type.name = 'Episode'
+    inventory_type.save()
+
+    assert get_metadata_validator(inventory_type.id).schema.__name__ == 'EpisodeMetaData'
+
+
+@pytest.mark.django_db
+def test_types_renamed_by_other_workers_are_picked_up(inventory_type):
+    assert get_metadata_validator(inventory_type.id).schema.__name__ == 'MovieMetaData'
+
+    # As another worker would: no signal here, only the shared tag bump.
+    InventoryType.objects.filter(id=inventory_type.id).update(name='Episode')
+    assert get_metadata_validator(inventory_type.id).schema.__name__ == 'MovieMetaData'
+    response_cache.bump(['inventory-types'])
+
+    assert get_metadata_validator(inventory_type.id).schema.__name__ == 'EpisodeMetaData'
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from interview.core.models import Tombstone
+from interview.inventory.models import Inventory
+from interview.inventory.purge import purge_deleted_inventory
+from interview.order import events
+from interview.order.archive import archive_inactive_orders
+from interview.order.calendar import order_calendar
+from interview.order.models import ArchivedOrder, Order, OrderCalendarRollup
+
+
+pytestmark = pytest.mark.django_db
+
+
+def soft_delete(inventory, days_ago: int):
+    inventory.soft_delete()
+    Inventory.all_objects.filter(id=inventory.id).update(deleted_at=timezone.now() - timedelta(days=days_ago))
+
+
+def test_purge_waits_for_the_grace_period(make_inventory):
+    expired, recent, live = make_inventory('Alien'), make_inventory('Aliens'), make_inventory('Alien 3')
+    soft_delete(expired, 8)
+    soft_delete(recent, 6)
+
+    counts = purge_deleted_inventory(grace_days=7, chunk_size=10)
+
+    assert counts == {'inventory': 1, 'orders': 0, 'archived_orders': 0}
+    assert set(Inventory.all_objects.values_list('id', flat=True)) == {recent.id, live.id}
+
+
+def test_purge_deletes_orders_in_bounded_chunks(inventory, make_order):
+    for _ in range(5):
+        make_order()
+    soft_delete(inventory, 8)
+
+    with CaptureQueriesContext(connection) as queries:
+        counts = purge_deleted_inventory(grace_days=7, chunk_size=2)
+
+    assert counts['orders'] == 5
+    deletes = [query['sql'] for query in queries if query['sql'].startswith(f'DELETE FROM {Order._meta.db_table} ')]
+    assert len(deletes) == 3
+    assert not Order.objects.exists()
+
+
+def test_purge_cleans_up_dependents(
+    monkeypatch, inventory, inventory_tag, make_order, order_tag, django_capture_on_commit_callbacks
+):
+    published = []
+    monkeypatch.setattr(events, '_notify', published.extend)
+    inventory.tags.add(inventory_tag)
+    order, archived = make_order(), make_order(is_active=False)
+    order.tags.add(order_tag)
+    Order.objects.filter(id=archived.id).update(updated_at=timezone.now() - timedelta(days=100))
+    archive_inactive_orders(90, batch_size=10)
+    order_calendar(order.start_date, order.start_date, 'day')
+    soft_delete(inventory, 8)
+    published.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        counts = purge_deleted_inventory(grace_days=7, chunk_size=10)
+
+    assert counts == {'inventory': 1, 'orders': 1, 'archived_orders': 1}
+    assert not ArchivedOrder.objects.exists()
+    assert not Order.tags.through.objects.exists()
+    assert not Inventory.tags.through.objects.exists()
+    assert Tombstone.objects.filter(resource='orders', object_id=order.id).exists()
+    assert not Tombstone.objects.filter(resource='orders', object_id=archived.id).exists()
+    assert [(event['event'], event['id']) for event in published] == [('deleted', order.id)]
+    assert not OrderCalendarRollup.objects.exists()
@@ -0,0 +1,90 @@
+import pytest
+
+from interview.inventory.models import Inventory, InventoryFeature, InventoryNeighbor
+from interview.inventory.similarity import rebuild_similarity, refresh_similarity
+
+
+pytestmark = pytest.mark.django_db
+
+
+def neighbors(title) -> list:
+    return list(
+        InventoryNeighbor.objects.filter(inventory=title).order_by('-score', 'neighbor_id').values_list(
+            'neighbor_id', flat=True
+        )
+    )
+
+
+@pytest.fixture
+def cast(make_inventory):
+    def make(name, *actors):
+        return make_inventory(name, metadata={'year': 1979, 'actors': list(actors)})
+    return make
+
+
+@pytest.fixture
+def catalog(cast):
+    titles = cast('Alien', 'Weaver', 'Skerritt'), cast('Aliens', 'Weaver', 'Skerritt'), cast('Alien 3', 'Weaver')
+    rebuild_similarity(batch_size=2)
+    return titles
+
+
+def test_rebuild_ranks_by_shared_features(catalog):
+    alien, aliens, alien3 = catalog
+
+    assert neighbors(alien) == [aliens.id, alien3.id]
+    assert neighbors(alien3) == [alien.id, aliens.id]
+
+
+def test_refresh_after_a_write(catalog):
+    alien, aliens, alien3 = catalog
+    before = InventoryNeighbor.objects.get(inventory=alien, neighbor=alien3).score
+    alien3.metadata = {'year': 1979, 'actors': ['Weaver', 'Skerritt', 'Dutton']}
+    alien3.save()
+
+    assert refresh_similarity([alien3.id]) == {'refreshed': 1, 'recomputed': 0}
+    assert set(InventoryFeature.objects.filter(inventory=alien3).values_list('feature', flat=True)) == {
+        'actor:weaver', 'actor:skerritt', 'actor:dutton'
+    }
+    # Offered to the other lists with its new score.
+    assert InventoryNeighbor.objects.get(inventory=alien, neighbor=alien3).score > before
+    assert neighbors(aliens) == [alien.id, alien3.id]
+
+
+def test_refresh_after_a_soft_delete(catalog):
+    alien, aliens, alien3 = catalog
+    aliens.soft_delete()
+
+    assert refresh_similarity([aliens.id]) == {'refreshed': 1, 'recomputed': 2}
+    assert not InventoryFeature.objects.filter(inventory=aliens).exists()
+    assert not InventoryNeighbor.objects.filter(inventory=aliens).exists()
+    assert not InventoryNeighbor.objects.filter(neighbor=aliens).exists()
+    assert neighbors(alien) == [alien3.id]
+
+
+def test_refresh_recomputes_lists_that_held_a_dropped_title(settings, catalog):
+    settings.SIMILARITY_TOP_K = 1
+    alien, aliens, alien3 = catalog
+    rebuild_similarity()
+    assert neighbors(alien) == [aliens.id]
+
+    Inventory.objects.filter(id=aliens.id).update(metadata={'year': 1979, 'actors': ['Henriksen']})
+
+    assert refresh_similarity([aliens.id]) == {'refreshed': 1, 'recomputed': 1}
+    # Alien 3 was below the cut-off of the old list.
+    assert neighbors(alien) == [alien3.id]
+
+
+def test_refresh_trims_lists_to_top_k(settings, cast, catalog):
+    settings.SIMILARITY_TOP_K = 1
+    alien, aliens, alien3 = catalog
+    rebuild_similarity()
+    Inventory.objects.filter(id=alien.id).update(metadata={'year': 1979, 'actors': ['Weaver', 'Skerritt', 'Hurt']})
+    refresh_similarity([alien.id])
+    assert neighbors(alien) == [aliens.id]
+
+    director_cut = cast('Alien (Director\'s Cut)', 'Weaver', 'Skerritt', 'Hurt')
+    refresh_similarity([director_cut.id])
+
+    assert neighbors(alien) == [director_cut.id]
+    assert InventoryNeighbor.objects.filter(inventory=alien).count() == 1
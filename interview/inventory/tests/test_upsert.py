@@ -0,0 +1,147 @@
+import io
+import json
+import threading
+
+import pytest
+from django.db import connection, transaction
+
+from conftest import METADATA
+from interview.inventory.csv_import import import_inventory_csv
+from interview.inventory.models import Inventory
+from interview.inventory.upsert import upsert_inventory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def item(inventory_type, inventory_language, name='Alien', **metadata):
+    return {
+        'name': name,
+        'type': inventory_type.id,
+        'language': inventory_language.id,
+        'metadata': {**METADATA, **metadata},
+    }
+
+
+def test_matches_titles_created_without_it(inventory, inventory_type, inventory_language):
+    counts = upsert_inventory([item(inventory_type, inventory_language, year=1980)])
+
+    assert counts == {'created': 0, 'updated': 1, 'unchanged': 0}
+    assert Inventory.objects.get().metadata['year'] == 1980
+
+
+def test_follows_renames_made_without_it(inventory, inventory_type, inventory_language):
+    inventory.name = 'Alien (1979)'
+    inventory.save()
+
+    counts = upsert_inventory([item(inventory_type, inventory_language, name='Alien (1979)')])
+
+    assert counts == {'created': 0, 'updated': 0, 'unchanged': 1}
+
+
+def test_switching_keys_does_not_duplicate(inventory_type, inventory_language):
+    upsert_inventory([item(inventory_type, inventory_language, external_id='tt0078748')], key='external_id')
+    renamed = item(inventory_type, inventory_language, name='Alien: Director\'s Cut', external_id='tt0078748')
+    upsert_inventory([renamed], key='external_id')
+
+    counts = upsert_inventory([item(inventory_type, inventory_language, name='Alien: Director\'s Cut')])
+
+    assert counts == {'created': 0, 'updated': 1, 'unchanged': 0}
+    assert Inventory.objects.count() == 1
+
+
+def test_csv_import_matches_existing_titles(inventory, inventory_type, inventory_language):
+    catalog = io.StringIO(
+        'name,type,language,metadata_year,metadata_actors,metadata_imdb_rating,metadata_rotten_tomatoes_rating\n'
+        f'Alien,{inventory_type.name},{inventory_language.name},1980,"[""Sigourney Weaver""]",8.5,98\n'
+        f'Aliens,{inventory_type.name},{inventory_language.name},1986,"[""Sigourney Weaver""]",8.4,97\n'
+    )
+
+    result = import_inventory_csv(catalog)
+
+    assert (result['created'], result['updated']) == (1, 1)
+    assert Inventory.objects.get(id=inventory.id).metadata['year'] == 1980
+    assert upsert_inventory([item(inventory_type, inventory_language, name='Aliens', year=1986)])['created'] == 0
+
+
+def test_metadata_patch_adds_external_id_key(api_client, inventory, inventory_type, inventory_language):
+    response = api_client.patch(
+        f'/inventory/{inventory.id}/metadata/',
+        json.dumps({'external_id': 'tt0078748'}),
+        content_type='application/merge-patch+json',
+    )
+    assert response.status_code == 200
+
+    renamed = item(inventory_type, inventory_language, name='Alien (1979)', external_id='tt0078748')
+    assert upsert_inventory([renamed], key='external_id')['updated'] == 1
+    assert Inventory.objects.get().name == 'Alien (1979)'
+
+
+def test_upsert_view(api_client, inventory, inventory_type, inventory_language, inventory_tag):
+    items = [
+        {**item(inventory_type, inventory_language, year=1980), 'tags': [inventory_tag.id]},
+        item(inventory_type, inventory_language, name='Aliens'),
+    ]
+
+    response = api_client.post('/inventory/upsert/', {'items': items}, format='json')
+
+    assert response.status_code == 200
+    assert response.json() == {'key': 'name_type_language', 'created': 1, 'updated': 1, 'unchanged': 0}
+    assert list(Inventory.objects.get(id=inventory.id).tags.all()) == [inventory_tag]
+
+
+@pytest.fixture
+def open_upsert(inventory_type, inventory_language):
+    """Upsert ``Alien`` from another connection and hold its transaction open until ``release`` is set."""
+    held, release = threading.Event(), threading.Event()
+
+    def writer():
+        try:
+            with transaction.atomic():
+                upsert_inventory([item(inventory_type, inventory_language)])
+                held.set()
+                release.wait(10)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    assert held.wait(10)
+    yield release
+    release.set()
+    thread.join()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unrelated_upserts_do_not_wait_for_each_other(open_upsert, inventory_type, inventory_language):
+    with connection.cursor() as cursor:
+        cursor.execute("SET lock_timeout = '2s'")
+    try:
+        assert upsert_inventory([item(inventory_type, inventory_language, name='Aliens')])['created'] == 1
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('RESET lock_timeout')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_upserts_of_a_new_title_create_it_once(open_upsert, inventory_type, inventory_language):
+    threading.Timer(0.2, open_upsert.set).start()
+
+    counts = upsert_inventory([item(inventory_type, inventory_language)])
+
+    assert counts == {'created': 0, 'updated': 0, 'unchanged': 1}
+    assert Inventory.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_csv_import_of_a_new_title_creates_it_once(open_upsert, inventory_type, inventory_language):
+    threading.Timer(0.2, open_upsert.set).start()
+    metadata = json.dumps(METADATA).replace('"', '""')
+    catalog = io.StringIO(
+        f'name,type,language,metadata\nAlien,{inventory_type.name},{inventory_language.name},"{metadata}"\n'
+    )
+
+    result = import_inventory_csv(catalog)
+
+    assert (result['created'], result['updated'], result['unchanged']) == (0, 0, 1)
+    assert Inventory.objects.count() == 1
@@ -0,0 +1,152 @@
+"""
+Every inventory endpoint with a ``query_budget``. The test plugin runs
+requests in raise mode, so a view going over its budget fails here.
+"""
+import json
+
+import pytest
+
+from conftest import METADATA
+from interview.core.models import Job
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryNeighbor, InventoryTag, InventoryType
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def catalog(make_inventory, inventory_tag):
+    titles = [make_inventory(name) for name in ('Alien', 'Aliens', 'Alien 3')]
+    for title in titles:
+        title.tags.add(inventory_tag)
+    return titles
+
+
+def test_list(api_client, catalog):
+    response = api_client.get('/inventory/', {'limit': 2})
+    assert response.status_code == 200
+    assert [item['name'] for item in response.data['results']] == ['Alien', 'Aliens']
+
+    response = api_client.get('/inventory/', {'ids': f'{catalog[2].id},{catalog[0].id}'})
+    assert response.status_code == 200
+
+
+def test_create_rejects_invalid_metadata(api_client, inventory_type, inventory_language):
+    response = api_client.post('/inventory/', {
+        'name': 'Alien', 'type': {'id': inventory_type.id, 'name': inventory_type.name},
+        'language': {'id': inventory_language.id, 'name': inventory_language.name},
+        'tags': [], 'metadata': {'year': 'soon'},
+    }, format='json')
+
+    assert response.status_code == 400
+
+
+def test_retrieve(api_client, catalog):
+    response = api_client.get(f'/inventory/{catalog[0].id}/')
+
+    assert response.status_code == 200
+    assert [tag['name'] for tag in response.data['tags']] == ['Classic']
+
+
+def test_update(api_client, catalog):
+    response = api_client.patch(f'/inventory/{catalog[0].id}/', {'name': 'Alien (1979)'}, format='json')
+
+    assert response.status_code == 200
+    assert Inventory.objects.get(id=catalog[0].id).name == 'Alien (1979)'
+
+
+def test_delete(api_client, catalog):
+    response = api_client.delete(f'/inventory/{catalog[0].id}/')
+
+    assert response.status_code == 204
+    assert not Inventory.objects.filter(id=catalog[0].id).exists()
+
+
+def test_metadata_patch(api_client, catalog):
+    response = api_client.patch(
+        f'/inventory/{catalog[0].id}/metadata/', json.dumps({'year': 1980}), content_type='application/merge-patch+json'
+    )
+
+    assert response.status_code == 200
+
+
+def test_related(api_client, catalog):
+    InventoryNeighbor.objects.create(inventory=catalog[0], neighbor=catalog[1], score=0.9)
+
+    response = api_client.get(f'/inventory/{catalog[0].id}/related/')
+
+    assert response.status_code == 200
+    assert [item['id'] for item in response.data] == [catalog[1].id]
+
+
+def test_batch_patch(api_client, catalog):
+    items = [{'id': title.id, 'name': f'{title.name}!'} for title in catalog]
+
+    response = api_client.patch('/inventory/batch/', items, format='json')
+
+    assert response.status_code == 200
+    assert Inventory.objects.filter(name__endswith='!').count() == 3
+
+
+def test_import(api_client, inventory_type, inventory_language):
+    items = [{'name': 'Alien', 'type': inventory_type.id, 'language': inventory_language.id, 'metadata': METADATA}]
+
+    response = api_client.post('/inventory/import/', items, format='json')
+
+    assert response.status_code == 202
+    assert Job.objects.get().kind == 'inventory.import'
+
+
+def test_upsert(api_client, catalog, inventory_type, inventory_language):
+    items = [
+        {'name': name, 'type': inventory_type.id, 'language': inventory_language.id, 'metadata': METADATA}
+        for name in ('Alien', 'Prometheus')
+    ]
+
+    response = api_client.post('/inventory/upsert/', items, format='json')
+
+    assert response.status_code == 200
+
+
+def test_facets(api_client, catalog, inventory_tag):
+    response = api_client.get('/inventory/facets/')
+    assert response.status_code == 200
+
+    response = api_client.get('/inventory/facets/', {'tags': inventory_tag.id})
+    assert response.status_code == 200
+
+
+def test_changes(api_client, catalog, settings):
+    settings.CHANGES_FEED_SAFETY_LAG = 0
+
+    response = api_client.get('/changes/inventory/')
+
+    assert response.status_code == 200
+    assert len(response.data['changed']) == 3
+
+
+@pytest.mark.parametrize('path, model, field', [
+    ('tags', InventoryTag, 'name'),
+    ('languages', InventoryLanguage, 'name'),
+    ('types', InventoryType, 'name'),
+])
+def test_reference_endpoints(api_client, path, model, field):
+    response = api_client.post(f'/inventory/{path}/', {field: 'Noir'}, format='json')
+    assert response.status_code == 201
+    pk = response.data['id']
+
+    assert api_client.get(f'/inventory/{path}/').status_code == 200
+    assert api_client.get(f'/inventory/{path}/{pk}/').status_code == 200
+    assert api_client.patch(f'/inventory/{path}/{pk}/', {field: 'Neo-noir'}, format='json').status_code == 200
+    assert api_client.delete(f'/inventory/{path}/{pk}/').status_code == 204
+    assert not model.objects.filter(id=pk).exists()
+
+
+def test_metadata_patch_that_does_not_fit_is_a_bad_request(api_client, catalog):
+    response = api_client.patch(
+        f'/inventory/{catalog[0].id}/metadata/',
+        json.dumps([{'op': 'add', 'path': '/actors/lead', 'value': 'Ripley'}]),
+        content_type='application/json-patch+json',
+    )
+
+    assert response.status_code == 400
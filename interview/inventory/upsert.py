@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from interview.core.response_cache import response_cache
+from interview.inventory.facets import inventory_facets
+from interview.inventory.models import Inventory
+from interview.inventory.natural_keys import (
+    claim_natural_keys,
+    match_natural_keys,
+    natural_keys,
+    resolve_natural_key,
+    store_natural_keys,
+)
+
+
+UPSERT_FIELDS = ['name', 'type', 'language', 'metadata', 'deleted_at']
+
+
+def upsert_inventory(items: list, key: str = None, batch_size: int = None) -> dict:
+    """
+    Insert or update validated inventory items matched on their natural keys.
+
+    ``items`` are dicts with ``name``, ``type``, ``language`` (ids),
+    ``metadata`` and optionally ``tags`` (ids). An item matches the title
+    holding its ``key`` natural key or, failing that, any other configured
+    key it provides, so feeds can switch keys without duplicating titles.
+    Rows whose stored values already match are left untouched and reported
+    as unchanged. New titles claim their keys before they are inserted, so
+    concurrent writers only wait for each other on the keys they share.
+    """
+    key, _ = resolve_natural_key(key)
+    batch_size = batch_size or settings.INVENTORY_UPSERT_BATCH_SIZE
+
+    # Later duplicates of the same key win.
+    keyed = {}
+    for item in items:
+        keys = natural_keys(item, first=key)
+        keyed[keys[0]] = (keys, item)
+    keyed = list(keyed.values())
+
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0}
+    for start in range(0, len(keyed), batch_size):
+        batch_counts = _upsert_batch(keyed[start:start + batch_size])
+        for name, count in batch_counts.items():
+            counts[name] += count
+
+    if counts['created'] or counts['updated']:
+        inventory_facets.invalidate()
+        response_cache.invalidate('inventory')
+
+    return counts
+
+
+@transaction.atomic
+def _upsert_batch(batch: list) -> dict:
+    matches = match_natural_keys({index: keys for index, (keys, _) in enumerate(batch)})
+    new = [index for index in range(len(batch)) if index not in matches]
+    reserved = dict(zip(new, _reserve_ids(len(new))))
+    # Keys claimed meanwhile by a title another writer created: match it.
+    lost = claim_natural_keys({reserved[index]: batch[index][0] for index in new})
+    for index in new:
+        if reserved[index] in lost:
+            matches[index] = lost[reserved.pop(index)]
+
+    # Items reaching the same title through different keys, the later wins.
+    matched = {}
+    for index in sorted(matches):
+        matched[matches[index]] = batch[index][1]
+
+    existing = Inventory.all_objects.filter(id__in=matched).in_bulk()
+    existing_tags = {}
+    for inventory_id, tag_id in Inventory.tags.through.objects.filter(inventory_id__in=matched).values_list(
+        'inventory_id', 'inventorytag_id'
+    ):
+        existing_tags.setdefault(inventory_id, set()).add(tag_id)
+
+    counts = {'created': len(reserved), 'updated': 0, 'unchanged': 0}
+    to_update, written, tag_changes = [], {}, {}
+    now = timezone.now()
+    for inventory_id, item in matched.items():
+        row = existing[inventory_id]
+        tags = set(item['tags']) if item.get('tags') is not None else None
+        # A re-sent soft deleted item is restored.
+        fields_changed = (
+            row.deleted_at is not None
+            or row.name != item['name']
+            or row.type_id != item['type']
+            or row.language_id != item['language']
+            or row.metadata != item['metadata']
+        )
+        tags_changed = tags is not None and tags != existing_tags.get(inventory_id, set())
+        if not fields_changed and not tags_changed:
+            counts['unchanged'] += 1
+            continue
+        counts['updated'] += 1
+        if tags_changed:
+            tag_changes[inventory_id] = tags
+        if fields_changed:
+            row.name, row.type_id, row.language_id = item['name'], item['type'], item['language']
+            row.metadata, row.deleted_at, row.updated_at = item['metadata'], None, now
+            to_update.append(row)
+            written[inventory_id] = item
+
+    if to_update:
+        Inventory.all_objects.bulk_update(to_update, UPSERT_FIELDS + ['updated_at'])
+        store_natural_keys(written)
+    Inventory.objects.bulk_create([
+        Inventory(
+            id=inventory_id,
+            name=batch[index][1]['name'],
+            type_id=batch[index][1]['type'],
+            language_id=batch[index][1]['language'],
+            metadata=batch[index][1]['metadata'],
+        )
+        for index, inventory_id in reserved.items()
+    ])
+    for index, inventory_id in reserved.items():
+        item = batch[index][1]
+        written[inventory_id] = item
+        if item.get('tags'):
+            tag_changes[inventory_id] = set(item['tags'])
+
+    if tag_changes:
+        _replace_tags(tag_changes, touch=[pk for pk in tag_changes if pk not in written])
+
+    return counts
+
+
+def _reserve_ids(count: int) -> list:
+    if not count:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [Inventory._meta.db_table, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _replace_tags(tag_changes: dict, touch: list) -> None:
+    through = Inventory.tags.through
+
+    # Tag-only changes skip the writes above, bump updated_at for change feeds.
+    Inventory.touch(touch)
+    through.objects.filter(inventory_id__in=tag_changes).delete()
+    through.objects.bulk_create(
+        [
+            through(inventory_id=inventory_id, inventorytag_id=tag_id)
+            for inventory_id, tags in tag_changes.items()
+            for tag_id in tags
+        ],
+        ignore_conflicts=True,
+    )
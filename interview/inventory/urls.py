@@ -1,14 +1,21 @@
 
 from django.urls import path
-from interview.inventory.views import InventoryLanguageListCreateView, InventoryLanguageRetrieveUpdateDestroyView, InventoryListCreateView, InventoryRetrieveUpdateDestroyView, InventoryTagListCreateView, InventoryTagRetrieveUpdateDestroyView, InventoryTypeListCreateView, InventoryTypeRetrieveUpdateDestroyView
+from interview.inventory.views import InventoryBatchPatchView, InventoryCSVImportView, InventoryFacetsView, InventoryImportView, InventoryLanguageListCreateView, InventoryLanguageRetrieveUpdateDestroyView, InventoryListCreateView, InventoryMetadataPatchView, InventoryRelatedView, InventoryRetrieveUpdateDestroyView, InventoryTagListCreateView, InventoryTagRetrieveUpdateDestroyView, InventoryTypeListCreateView, InventoryTypeRetrieveUpdateDestroyView, InventoryUpsertView
 from interview.order.views import OrderListCreateView, OrderTagListCreateView
 
 
 urlpatterns = [
     path('<int:id>/', InventoryRetrieveUpdateDestroyView.as_view(), name='inventory-detail'),
+    path('<int:id>/metadata/', InventoryMetadataPatchView.as_view(), name='inventory-metadata'),
+    path('<int:id>/related/', InventoryRelatedView.as_view(), name='inventory-related'),
     path('languages/<int:id>/', InventoryLanguageRetrieveUpdateDestroyView.as_view(), name='inventory-languages-detail'),
     path('tags/<int:id>/', InventoryTagRetrieveUpdateDestroyView.as_view(), name='inventory-tags-detail'),
     path('types/<int:id>/', InventoryTypeRetrieveUpdateDestroyView.as_view(), name='inventory-types-detail'),
+    path('batch/', InventoryBatchPatchView.as_view(), name='inventory-batch'),
+    path('import/csv/', InventoryCSVImportView.as_view(), name='inventory-import-csv'),
+    path('import/', InventoryImportView.as_view(), name='inventory-import'),
+    path('upsert/', InventoryUpsertView.as_view(), name='inventory-upsert'),
+    path('facets/', InventoryFacetsView.as_view(), name='inventory-facets'),
     path('languages/', InventoryLanguageListCreateView.as_view(), name='inventory-languages-list'),
     path('tags/', InventoryTagListCreateView.as_view(), name='inventory-tags-list'),
     path('types/', InventoryTypeListCreateView.as_view(), name='inventory-types-list'),
@@ -1,23 +1,51 @@
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import DataError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.views import APIView
 
-from interview.inventory.models import Inventory, InventoryLanguage, InventoryTag, InventoryType
-from interview.inventory.schemas import InventoryMetaData
-from interview.inventory.serializers import InventoryLanguageSerializer, InventorySerializer, InventoryTagSerializer, InventoryTypeSerializer
+from interview.core.batch import BatchPatchError
+from interview.core.changes import ChangeFeedView
+from interview.core.facets import parse_facet_filters, serialize_counts
+from interview.core.jobs import enqueue
+from interview.core.jsonpatch import JSON_PATCH_MEDIA_TYPE, MERGE_PATCH_MEDIA_TYPE, JSONPatchError, JSONPatchParser, MergePatchParser
+from interview.core.multiget import multiget_data, parse_ids
+from interview.core.pagination import CountStrategyPagination
+from interview.core.response_cache import cache_response
+from interview.core.serializers import JobSerializer
+from interview.inventory.batch import batch_patch_inventory
+from interview.inventory.facets import INVENTORY_FACET_FILTERS, inventory_facets
+from interview.inventory.models import Inventory, InventoryLanguage, InventoryNeighbor, InventoryTag, InventoryType
+from interview.inventory.metadata import MetadataValidationError, get_metadata_validator
+from interview.inventory.metadata_patch import MetadataPatchConflict, patch_inventory_metadata
+from interview.inventory.serializers import InventoryBatchPatchSerializer, InventoryLanguageSerializer, InventorySerializer, InventoryTagSerializer, InventoryTypeSerializer, InventoryUpsertSerializer, RelatedInventorySerializer
+from interview.inventory.natural_keys import resolve_natural_key
+from interview.inventory.upsert import upsert_inventory
 
 
 class InventoryListCreateView(APIView):
-    queryset = Inventory.objects.all()
+    queryset = Inventory.objects.select_related('type', 'language').prefetch_related('tags')
     serializer_class = InventorySerializer
+    pagination_class = CountStrategyPagination
+    count_tags = ('inventory',)
+    query_budget = {'get': 4, 'post': 6}
+    throttle_scope = {'get': 'expensive', 'post': 'cheap'}
     
     def post(self, request: Request, *args, **kwargs) -> Response:
+        inventory_type = request.data.get('type')
+        if isinstance(inventory_type, dict):
+            validator = get_metadata_validator(inventory_type.get('id'), inventory_type.get('name'))
+        else:
+            validator = get_metadata_validator(inventory_type)
         try:
-            metadata = InventoryMetaData(**request.data['metadata'])
-        except Exception as e:
+            request.data['metadata'] = validator(request.data.get('metadata'))
+        except MetadataValidationError as e:
             return Response({'error': str(e)}, status=400)
         
-        request.data['metadata'] = metadata.dict()
         serializer = self.serializer_class(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=400)
@@ -26,7 +54,21 @@ class InventoryListCreateView(APIView):
         
         return Response(serializer.data, status=201)
     
+    @cache_response('inventory', 'inventory-tags', 'inventory-types', 'inventory-languages')
     def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            ids = parse_ids(request.query_params.get('ids'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        if ids is not None:
+            serializer = self.serializer_class(self.get_queryset().filter(id__in=ids), many=True)
+            return Response(multiget_data(ids, {item['id']: item for item in serializer.data}), status=200)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(self.get_queryset().order_by('id'), request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(self.serializer_class(page, many=True).data)
+
         serializer = self.serializer_class(self.get_queryset(), many=True)
         
         return Response(serializer.data, status=200)
@@ -35,9 +77,125 @@ class InventoryListCreateView(APIView):
         return self.queryset.all()
     
 
-class InventoryRetrieveUpdateDestroyView(APIView):
+class InventoryUpsertView(APIView):
+    serializer_class = InventoryUpsertSerializer
+    # Per batch of INVENTORY_UPSERT_BATCH_SIZE items, not per item.
+    query_budget = 14
+    throttle_scope = 'expensive'
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        data = {'items': request.data} if isinstance(request.data, list) else request.data
+        serializer = self.serializer_class(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        try:
+            key, _ = resolve_natural_key(serializer.validated_data.get('key'))
+            counts = upsert_inventory(serializer.validated_data['items'], key=key)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        return Response({'key': key, **counts}, status=200)
+
+
+class InventoryImportView(APIView):
+    serializer_class = InventoryUpsertSerializer
+    query_budget = 4
+    throttle_scope = 'expensive'
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        data = {'items': request.data} if isinstance(request.data, list) else request.data
+        serializer = self.serializer_class(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        try:
+            key, _ = resolve_natural_key(serializer.validated_data.get('key'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        job = enqueue('inventory.import', items=serializer.validated_data['items'], key=key)
+
+        return Response(JobSerializer(job).data, status=202)
+
+
+class InventoryBatchPatchView(APIView):
+    serializer_class = InventoryBatchPatchSerializer
+    # Grows with the distinct sets of changed fields, not with the patches.
+    query_budget = 20
+    throttle_scope = 'expensive'
+
+    def patch(self, request: Request, *args, **kwargs) -> Response:
+        data = {'items': request.data} if isinstance(request.data, list) else request.data
+        serializer = self.serializer_class(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        try:
+            result = batch_patch_inventory(serializer.validated_data['items'])
+        except BatchPatchError as e:
+            return Response({'error': str(e), 'errors': e.errors}, status=e.status)
+        result.pop('changed')
+
+        return Response(result, status=200)
+
+
+class InventoryCSVImportView(APIView):
+    """
+    Stores an uploaded catalog and queues an ``inventory.import_csv`` job to
+    merge it, the job's result has the counts or why the file was rejected.
+    """
+    query_budget = 2
+    throttle_scope = 'expensive'
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload the catalog as the "file" field'}, status=400)
+
+        try:
+            key, _ = resolve_natural_key(request.data.get('key'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        skip_invalid = str(request.data.get('skip_invalid', '')).lower() in ('1', 'true', 'yes')
+        path = default_storage.save(f'{settings.INVENTORY_CSV_UPLOAD_DIR}/{uuid.uuid4().hex}.csv', upload)
+        job = enqueue('inventory.import_csv', path=path, key=key, skip_invalid=skip_invalid)
+
+        return Response(JobSerializer(job).data, status=202)
+
+
+class InventoryFacetsView(APIView):
     queryset = Inventory.objects.all()
+    query_budget = 4
+    throttle_scope = 'expensive'
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            filters = parse_facet_filters(request.query_params, INVENTORY_FACET_FILTERS)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        counts = inventory_facets.counts(self.get_queryset().filter(**filters), filters)
+
+        return Response(serialize_counts(counts), status=200)
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+
+class InventoryChangesView(ChangeFeedView):
+    resource = 'inventory'
+    queryset = Inventory.objects.select_related('type', 'language').prefetch_related('tags')
+    serializer_class = InventorySerializer
+    query_budget = 5
+    throttle_scope = 'expensive'
+
+
+class InventoryRetrieveUpdateDestroyView(APIView):
+    queryset = Inventory.objects.select_related('type', 'language').prefetch_related('tags')
     serializer_class = InventorySerializer
+    # Renames refresh the natural keys: read, drop stale, insert new.
+    query_budget = {'get': 2, 'patch': 6, 'delete': 3}
+    throttle_scope = 'cheap'
     
     def get(self, request: Request, *args, **kwargs) -> Response:
         inventory = self.get_queryset(id=kwargs['id'])
@@ -56,8 +214,10 @@ class InventoryRetrieveUpdateDestroyView(APIView):
         return Response(serializer.data, status=200)
     
     def delete(self, request: Request, *args, **kwargs) -> Response:
-        inventory = self.get_queryset(id=kwargs['id'])
-        inventory.delete()
+        # Nothing is serialized, so skip the joins and the tags prefetch.
+        inventory = Inventory.objects.get(id=kwargs['id'])
+        # Orders and tag links are removed later by the purge job.
+        inventory.soft_delete()
         
         return Response(status=204)
     
@@ -65,9 +225,64 @@ class InventoryRetrieveUpdateDestroyView(APIView):
         return self.queryset.get(**kwargs)
 
 
+class InventoryMetadataPatchView(APIView):
+    parser_classes = [MergePatchParser, JSONPatchParser, JSONParser]
+    # One more to normalize the stored metadata, two to refresh natural keys.
+    query_budget = 6
+    throttle_scope = 'cheap'
+
+    def patch(self, request: Request, *args, **kwargs) -> Response:
+        # Plain JSON is treated as a merge patch, or a JSON patch when it is a list.
+        json_patch = request.content_type.startswith(JSON_PATCH_MEDIA_TYPE) or (
+            not request.content_type.startswith(MERGE_PATCH_MEDIA_TYPE) and isinstance(request.data, list)
+        )
+        try:
+            result = patch_inventory_metadata(kwargs['id'], request.data, json_patch=json_patch)
+        except Inventory.DoesNotExist as e:
+            return Response({'error': str(e)}, status=404)
+        except MetadataPatchConflict as e:
+            return Response({'error': str(e)}, status=409)
+        except (JSONPatchError, MetadataValidationError) as e:
+            return Response({'error': str(e)}, status=400)
+        except DataError as e:
+            # The patch does not fit the stored document, e.g. a member
+            # name used as an array index.
+            return Response({'error': str(e).strip()}, status=400)
+
+        return Response(result, status=200)
+
+
+class InventoryRelatedView(APIView):
+    queryset = InventoryNeighbor.objects.filter(neighbor__deleted_at__isnull=True).select_related(
+        'neighbor__type', 'neighbor__language'
+    )
+    serializer_class = RelatedInventorySerializer
+    query_budget = 2
+    throttle_scope = 'cheap'
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            limit = int(request.query_params.get('limit', settings.SIMILARITY_TOP_K))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=400)
+        limit = max(1, min(limit, settings.SIMILARITY_TOP_K))
+
+        neighbors = list(self.get_queryset(inventory_id=kwargs['id'])[:limit])
+        if not neighbors and not Inventory.objects.filter(id=kwargs['id']).exists():
+            return Response({'error': f'Inventory {kwargs["id"]} does not exist'}, status=404)
+        serializer = self.serializer_class(neighbors, many=True)
+
+        return Response(serializer.data, status=200)
+
+    def get_queryset(self, **kwargs):
+        return self.queryset.filter(**kwargs).order_by('-score', 'neighbor_id')
+
+
 class InventoryTagListCreateView(APIView):
     queryset = InventoryTag.objects.all()
     serializer_class = InventoryTagSerializer
+    query_budget = {'get': 1, 'post': 2}
+    throttle_scope = 'cheap'
     
     def post(self, request: Request, *args, **kwargs) -> Response:
         serializer = self.serializer_class(data=request.data)
@@ -90,6 +305,8 @@ class InventoryTagListCreateView(APIView):
 class InventoryTagRetrieveUpdateDestroyView(APIView):
     queryset = InventoryTag.objects.all()
     serializer_class = InventoryTagSerializer
+    query_budget = {'get': 1, 'patch': 3, 'delete': 3}
+    throttle_scope = 'cheap'
     
     def get(self, request: Request, *args, **kwargs) -> Response:
         inventory_tag = self.get_queryset(id=kwargs['id'])
@@ -120,6 +337,8 @@ class InventoryTagRetrieveUpdateDestroyView(APIView):
 class InventoryLanguageListCreateView(APIView):
     queryset = InventoryLanguage.objects.all()
     serializer_class = InventoryLanguageSerializer
+    query_budget = {'get': 1, 'post': 2}
+    throttle_scope = 'cheap'
     
     def post(self, request: Request, *args, **kwargs) -> Response:
         serializer = self.serializer_class(data=request.data)
@@ -142,6 +361,8 @@ class InventoryLanguageListCreateView(APIView):
 class InventoryLanguageRetrieveUpdateDestroyView(APIView):
     queryset = InventoryLanguage.objects.all()
     serializer_class = InventoryLanguageSerializer
+    query_budget = {'get': 1, 'patch': 3, 'delete': 3}
+    throttle_scope = 'cheap'
     
     def get(self, request: Request, *args, **kwargs) -> Response:
         inventory = self.get_queryset(id=kwargs['id'])
@@ -172,6 +393,8 @@ class InventoryLanguageRetrieveUpdateDestroyView(APIView):
 class InventoryTypeListCreateView(APIView):
     queryset = InventoryType.objects.all()
     serializer_class = InventoryTypeSerializer
+    query_budget = {'get': 1, 'post': 2}
+    throttle_scope = 'cheap'
     
     def post(self, request: Request, *args, **kwargs) -> Response:
         serializer = self.serializer_class(data=request.data)
@@ -194,6 +417,8 @@ class InventoryTypeListCreateView(APIView):
 class InventoryTypeRetrieveUpdateDestroyView(APIView):
     queryset = InventoryType.objects.all()
     serializer_class = InventoryTypeSerializer
+    query_budget = {'get': 1, 'patch': 3, 'delete': 3}
+    throttle_scope = 'cheap'
     
     def get(self, request: Request, *args, **kwargs) -> Response:
         inventory = self.get_queryset(id=kwargs['id'])
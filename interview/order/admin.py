@@ -1,3 +1,50 @@
 from django.contrib import admin
 
-# Register your models here.
+from interview.core.counts import EstimatedCountPaginator
+from interview.order.models import ArchivedOrder, Order, OrderTag
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    # 'inventory' renders Inventory.__str__, joined in by list_select_related
+    # instead of Order.__str__ loading it per row.
+    list_display = ('id', 'inventory', 'start_date', 'embargo_date', 'is_active', 'updated_at')
+    list_select_related = ('inventory',)
+    # start_date ranges prune partitions, is_active=False has a partial index.
+    list_filter = ('is_active', ('start_date', admin.DateFieldListFilter), 'tags')
+    ordering = ('-updated_at', '-id')
+    sortable_by = ('id', 'updated_at', 'start_date')
+    search_fields = ('=id', '=inventory__id')
+    search_help_text = 'Exact order or inventory id.'
+    raw_id_fields = ('inventory',)
+    autocomplete_fields = ('tags',)
+    readonly_fields = ('created_at', 'updated_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(OrderTag)
+class OrderTagAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'is_active')
+    list_filter = ('is_active',)
+    ordering = ('name',)
+    search_fields = ('name',)
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    list_display = ('id', 'inventory', 'start_date', 'embargo_date', 'archived_at')
+    list_select_related = ('inventory',)
+    list_filter = (('start_date', admin.DateFieldListFilter),)
+    ordering = ('-id',)
+    sortable_by = ('id',)
+    search_fields = ('=id', '=inventory__id')
+    raw_id_fields = ('inventory',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
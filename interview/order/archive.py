@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from interview.order.models import ArchivedOrder, Order
+
+
+# Sent once per batch with the archived ``orders``. Archived rows are not
+# deleted as far as the rest of the app is concerned, so the batch skips
+# the delete signals (tombstones, ``deleted`` events, calendar rollup
+# clears) and its receivers only do what moving rows out of Order needs.
+orders_archived = Signal()
+
+
+def archive_inactive_orders(inactive_days: int, batch_size: int, max_batches: int = None, progress=None) -> int:
+    """
+    Move orders inactive for ``inactive_days`` (by ``updated_at``) and their
+    tag links into ArchivedOrder, one bounded transaction per batch. Rows
+    locked by other writers are skipped and picked up on a later run. Each
+    batch sends ``orders_archived`` instead of the delete signals.
+    """
+    cutoff = timezone.now() - timedelta(days=inactive_days)
+    through = Order.tags.through
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            orders = list(
+                Order.objects.select_for_update(skip_locked=True)
+                .filter(is_active=False, updated_at__lt=cutoff)
+                .order_by('updated_at')[:batch_size]
+            )
+            if not orders:
+                break
+
+            ids = [order.id for order in orders]
+            tag_ids = {}
+            for order_id, tag_id in through.objects.filter(order_id__in=ids).values_list('order_id', 'ordertag_id'):
+                tag_ids.setdefault(order_id, []).append(tag_id)
+
+            ArchivedOrder.objects.bulk_create(
+                [
+                    ArchivedOrder(
+                        id=order.id,
+                        inventory_id=order.inventory_id,
+                        start_date=order.start_date,
+                        embargo_date=order.embargo_date,
+                        is_active=order.is_active,
+                        tag_ids=sorted(tag_ids.get(order.id, [])),
+                        created_at=order.created_at,
+                        updated_at=order.updated_at,
+                    )
+                    for order in orders
+                ],
+                ignore_conflicts=True,
+            )
+            through.objects.filter(order_id__in=ids).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {Order._meta.db_table} WHERE id = ANY(%s)', [ids])
+            orders_archived.send(sender=Order, orders=orders)
+
+        archived += len(ids)
+        batches += 1
+        if progress is not None:
+            progress(archived)
+
+    return archived
@@ -0,0 +1,75 @@
+from rest_framework import serializers
+
+from interview.core.fanout import fan_out
+from interview.inventory.models import Inventory
+from interview.order.models import Order
+
+
+DATE_FIELD = serializers.DateField()
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+def assemble_orders(orders: list) -> list:
+    """
+    ``OrderSerializer`` output for already loaded ``orders``.
+
+    Once the page of orders is known, its inventory (with type and
+    language), the order tags and the inventory tags are independent
+    queries. They are sent concurrently with ``fan_out`` as flat
+    ``values()`` rows and stitched here, skipping model instances and the
+    nested serializers.
+    """
+    if not orders:
+        return []
+    order_ids = [order.id for order in orders]
+    inventory_ids = list({order.inventory_id for order in orders})
+
+    inventories, order_tags, inventory_tags = fan_out(
+        lambda: _inventories(inventory_ids),
+        lambda: _tags(Order.tags.through, 'order_id', 'ordertag', order_ids),
+        lambda: _tags(Inventory.tags.through, 'inventory_id', 'inventorytag', inventory_ids),
+    )
+    for inventory_id, inventory in inventories.items():
+        inventory['tags'] = inventory_tags.get(inventory_id, [])
+
+    return [
+        {
+            'id': order.id,
+            'inventory': inventories[order.inventory_id],
+            'start_date': DATE_FIELD.to_representation(order.start_date),
+            'embargo_date': DATE_FIELD.to_representation(order.embargo_date),
+            'tags': order_tags.get(order.id, []),
+            'is_active': order.is_active,
+            'updated_at': DATETIME_FIELD.to_representation(order.updated_at),
+        }
+        for order in orders
+    ]
+
+
+def _inventories(inventory_ids: list) -> dict:
+    rows = Inventory.all_objects.filter(id__in=inventory_ids).values_list(
+        'id', 'name', 'type_id', 'type__name', 'language_id', 'language__name', 'metadata', 'updated_at'
+    )
+    return {
+        inventory_id: {
+            'id': inventory_id,
+            'name': name,
+            'type': {'id': type_id, 'name': type_name},
+            'language': {'id': language_id, 'name': language_name},
+            'tags': [],
+            'metadata': metadata,
+            'updated_at': DATETIME_FIELD.to_representation(updated_at),
+        }
+        for inventory_id, name, type_id, type_name, language_id, language_name, metadata, updated_at in rows
+    }
+
+
+def _tags(through, owner: str, tag: str, owner_ids: list) -> dict:
+    rows = through.objects.filter(**{f'{owner}__in': owner_ids}).order_by(owner, f'{tag}_id').values_list(
+        owner, f'{tag}_id', f'{tag}__name', f'{tag}__is_active'
+    )
+    tags = {}
+    for owner_id, tag_id, name, is_active in rows:
+        tags.setdefault(owner_id, []).append({'id': tag_id, 'name': name, 'is_active': is_active})
+
+    return tags
@@ -0,0 +1,45 @@
+from interview.core.batch import apply_batch_patch
+from interview.core.response_cache import response_cache
+from interview.core.signals import is_active_changed
+from interview.order.calendar import clear_closed_periods
+from interview.order.events import publish_order_events
+from interview.order.models import Order
+
+
+def batch_patch_orders(patches: list) -> dict:
+    """
+    Apply validated order patches (``inventory``, ``start_date``,
+    ``embargo_date`` and ``is_active``) atomically, see ``apply_batch_patch``.
+    """
+    stored = {}
+
+    def remember_dates(rows, patches):
+        # The rows are updated in place, keep the dates they are moved from.
+        for patch in patches:
+            if 'start_date' in patch or 'embargo_date' in patch:
+                row = rows[patch['id']]
+                stored[row.pk] = (row, row.start_date, row.embargo_date)
+
+    result = apply_batch_patch(
+        Order.objects.filter(inventory__deleted_at__isnull=True), patches, validate=remember_dates
+    )
+    if not result['updated']:
+        return result
+
+    moved = [stored[pk] for pk, fields in result['changed'].items() if pk in stored]
+    clear_closed_periods(*[day for row, *dates in moved for day in (*dates, row.start_date, row.embargo_date)])
+
+    # bulk_update sends no post_save, so mirror what a save or
+    # set_is_active() would have triggered.
+    toggled = {True: [], False: []}
+    for patch in patches:
+        if 'is_active' in result['changed'].get(patch['id'], ()):
+            toggled[patch['is_active']].append(patch['id'])
+    for is_active, pks in toggled.items():
+        if pks:
+            is_active_changed.send(sender=Order, pks=pks, is_active=is_active)
+
+    publish_order_events('updated', [pk for pk, fields in result['changed'].items() if 'is_active' not in fields])
+    response_cache.invalidate('orders')
+
+    return result
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+REMOVED_EVENTS = ('deleted', 'archived')
+
+
+class Subscription:
+
+    def __init__(self, loop, tags: set = None, is_active: bool = None, events: set = None):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=settings.ORDER_EVENTS_QUEUE_SIZE)
+        self.tags = tags
+        self.is_active = is_active
+        self.events = events
+
+    def matches(self, event: dict) -> bool:
+        if self.events and event['event'] not in self.events:
+            return False
+        # A removed order's tags are gone with it, and a subscriber filtering
+        # on them still has to learn it went away.
+        if event['event'] in REMOVED_EVENTS:
+            return True
+        if self.is_active is not None and event['is_active'] is not self.is_active:
+            return False
+        if self.tags and not self.tags.intersection(event['tags']):
+            return False
+        return True
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer, drop rather than grow without bound.
+            pass
+
+
+class OrderEventBroker:
+    """
+    Fans order events out to in-process SSE subscribers.
+
+    On PostgreSQL a single daemon thread per process LISTENs on the events
+    channel over its own connection and hands notifications to subscriber
+    queues on their event loops.
+    """
+
+    def __init__(self):
+        self.subscriptions = set()
+        self.lock = threading.Lock()
+        self.listener = None
+
+    def subscribe(self, **filters) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), **filters)
+        with self.lock:
+            self.subscriptions.add(subscription)
+            if connections['default'].vendor == 'postgresql' and self.listener is None:
+                self.listener = threading.Thread(target=self._listen, name='order-events', daemon=True)
+                self.listener.start()
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def dispatch(self, event: dict) -> None:
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+
+    def _listen(self) -> None:
+        while True:
+            listener = connections.create_connection('default')
+            try:
+                listener.ensure_connection()
+                raw = listener.connection
+                raw.autocommit = True
+                with raw.cursor() as cursor:
+                    cursor.execute(f'LISTEN {settings.ORDER_EVENTS_CHANNEL}')
+
+                while True:
+                    if select.select([raw], [], [], 5) == ([], [], []):
+                        continue
+                    raw.poll()
+                    while raw.notifies:
+                        self.dispatch(json.loads(raw.notifies.pop(0).payload))
+            except Exception:
+                logger.exception('Order event listener failed, reconnecting')
+                time.sleep(1)
+            finally:
+                listener.close()
+
+
+broker = OrderEventBroker()
@@ -0,0 +1,145 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from interview.order.models import ArchivedOrder, Order, OrderCalendarRollup
+
+
+STEPS = {OrderCalendarRollup.Bucket.DAY: 1, OrderCalendarRollup.Bucket.WEEK: 7}
+
+# Orders starting and hitting embargo per period, in total and per tag.
+# Archived orders count too, so moving an order to the archive leaves
+# closed periods as they were. generate_series fills in empty periods.
+CALENDAR_SQL = '''
+WITH events AS (
+    SELECT id, date_trunc(%(bucket)s, start_date::timestamp)::date AS period, 1 AS starting, 0 AS embargoed
+    FROM {orders} WHERE start_date >= %(start)s AND start_date < %(end)s
+    UNION ALL
+    SELECT id, date_trunc(%(bucket)s, embargo_date::timestamp)::date, 0, 1
+    FROM {orders} WHERE embargo_date >= %(start)s AND embargo_date < %(end)s
+    UNION ALL
+    SELECT id, date_trunc(%(bucket)s, start_date::timestamp)::date, 1, 0
+    FROM {archived} WHERE start_date >= %(start)s AND start_date < %(end)s
+    UNION ALL
+    SELECT id, date_trunc(%(bucket)s, embargo_date::timestamp)::date, 0, 1
+    FROM {archived} WHERE embargo_date >= %(start)s AND embargo_date < %(end)s
+),
+tags AS (
+    SELECT order_id, ordertag_id AS tag_id FROM {order_tags}
+    WHERE order_id IN (SELECT id FROM events)
+    UNION ALL
+    SELECT archived.id, tag.value::bigint FROM {archived} archived
+    CROSS JOIN LATERAL jsonb_array_elements_text(archived.tag_ids) tag
+    WHERE archived.id IN (SELECT id FROM events)
+)
+SELECT periods.period::date, NULL::bigint, coalesce(sum(events.starting), 0), coalesce(sum(events.embargoed), 0)
+FROM generate_series(%(start)s::timestamp, %(last)s::timestamp, %(step)s::interval) periods (period)
+LEFT JOIN events ON events.period = periods.period
+GROUP BY periods.period
+UNION ALL
+SELECT events.period, tags.tag_id, sum(events.starting), sum(events.embargoed)
+FROM events JOIN tags ON tags.order_id = events.id
+GROUP BY events.period, tags.tag_id
+'''
+
+
+def period_of(day: date, bucket: str) -> date:
+    if bucket == OrderCalendarRollup.Bucket.WEEK:
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def closed_before() -> date:
+    """Periods ending on or before this day are closed and kept as rollups."""
+    return timezone.localdate() - timedelta(days=settings.ORDER_CALENDAR_ROLLUP_DELAY)
+
+
+def order_calendar(start: date, end: date, bucket: str) -> list:
+    """
+    ``{'period', 'starting', 'embargoed', 'tags'}`` for every ``bucket``
+    period overlapping ``[start, end]``, ``tags`` mapping tag ids (as
+    strings, like the stored JSON) to ``[starting, embargoed]``.
+
+    Closed periods are read from ``OrderCalendarRollup`` and only missing
+    or still open ones are aggregated, in one query over the smallest range
+    covering them. Newly aggregated closed periods are stored.
+    """
+    step = timedelta(days=STEPS[bucket])
+    first, last = period_of(start, bucket), period_of(end, bucket)
+    periods = [first + step * index for index in range((last - first) // step + 1)]
+    closed = [period for period in periods if period + step <= closed_before()]
+
+    counts = {}
+    if closed:
+        rollups = OrderCalendarRollup.objects.filter(
+            bucket=bucket, period__gte=closed[0], period__lte=closed[-1]
+        ).values_list('period', 'starting', 'embargoed', 'tags')
+        for period, starting, embargoed, tags in rollups:
+            counts[period] = {'starting': starting, 'embargoed': embargoed, 'tags': tags}
+
+    missing = [period for period in periods if period not in counts]
+    if missing:
+        aggregated = aggregate(missing[0], missing[-1], bucket)
+        counts.update((period, aggregated[period]) for period in missing)
+        OrderCalendarRollup.objects.bulk_create(
+            [
+                OrderCalendarRollup(bucket=bucket, period=period, **aggregated[period])
+                for period in missing if period + step <= closed_before()
+            ],
+            ignore_conflicts=True,
+        )
+
+    return [{'period': period, **counts[period]} for period in periods]
+
+
+def aggregate(first: date, last: date, bucket: str) -> dict:
+    """Counts per period from ``first`` to ``last`` (both period starts), from the order tables."""
+    step = STEPS[bucket]
+    params = {
+        'bucket': str(bucket),
+        'start': first,
+        'last': last,
+        'end': last + timedelta(days=step),
+        'step': f'{step} days',
+    }
+    sql = CALENDAR_SQL.format(
+        orders=Order._meta.db_table,
+        archived=ArchivedOrder._meta.db_table,
+        order_tags=Order.tags.through._meta.db_table,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    counts = {}
+    for period, tag_id, starting, embargoed in rows:
+        if tag_id is None:
+            counts.setdefault(period, {'tags': {}}).update(starting=starting, embargoed=embargoed)
+    for period, tag_id, starting, embargoed in rows:
+        if tag_id is not None:
+            counts[period]['tags'][str(tag_id)] = [starting, embargoed]
+
+    return counts
+
+
+def clear_rollups(*days) -> int:
+    """
+    Drop the rollups of the periods holding ``days`` so they are aggregated
+    again, for writes that land in closed periods.
+    """
+    periods = {period_of(day, bucket) for day in days if day is not None for bucket in STEPS}
+    if not periods:
+        return 0
+
+    return OrderCalendarRollup.objects.filter(period__in=periods).delete()[0]
+
+
+def clear_closed_periods(*days) -> int:
+    """``clear_rollups`` when any of ``days`` is in a closed period."""
+    days = [day for day in days if day is not None]
+    if not days or min(days) >= closed_before():
+        return 0
+
+    return clear_rollups(*days)
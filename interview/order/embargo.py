@@ -0,0 +1,65 @@
+import logging
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from interview.core.signals import is_active_changed
+from interview.order.models import Order
+
+
+logger = logging.getLogger(__name__)
+
+# Found through order_order_active_embargo_idx. Rows other sweepers or
+# writers hold are skipped, and (id, start_date) keeps the update on the
+# row's own partition.
+EXPIRE_SQL = '''
+WITH expired AS (
+    SELECT id, start_date FROM {orders}
+    WHERE is_active AND embargo_date < %s
+    ORDER BY embargo_date
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+)
+UPDATE {orders} orders SET is_active = false, updated_at = %s
+FROM expired
+WHERE orders.id = expired.id AND orders.start_date = expired.start_date
+RETURNING orders.id
+'''
+
+
+def expire_embargoed_orders(batch_size: int, max_batches: int = None, today=None, progress=None) -> dict:
+    """
+    Deactivate active orders whose ``embargo_date`` is before ``today``, one
+    ``UPDATE ... RETURNING`` of at most ``batch_size`` rows per transaction.
+
+    Safe to run from several nodes at once: each batch skips rows locked by
+    another, so no order is deactivated twice. Every batch sends
+    ``is_active_changed``, which publishes ``deactivated`` order events and
+    invalidates cached order responses once it commits.
+    """
+    today = today or timezone.localdate()
+    sql = EXPIRE_SQL.format(orders=Order._meta.db_table)
+    started = time.monotonic()
+    expired = batches = 0
+    while max_batches is None or batches < max_batches:
+        batch_started = time.monotonic()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [today, batch_size, timezone.now()])
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                break
+            is_active_changed.send(sender=Order, pks=ids, is_active=False)
+
+        expired += len(ids)
+        batches += 1
+        logger.debug('Expired %d orders in %.1fms', len(ids), (time.monotonic() - batch_started) * 1000)
+        if progress is not None:
+            progress(expired)
+
+    metrics = {'expired': expired, 'batches': batches, 'seconds': round(time.monotonic() - started, 3)}
+    logger.info(
+        'Embargo sweep expired %(expired)d orders in %(batches)d batches (%(seconds).3fs)', metrics, extra={'metrics': metrics}
+    )
+
+    return metrics
@@ -0,0 +1,86 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from interview.order.models import Order
+
+
+def publish_order_events(event: str, pks) -> None:
+    """
+    Publish ``event`` for the given orders once the current transaction commits.
+
+    On PostgreSQL events go through ``pg_notify`` so every process listening on
+    ``ORDER_EVENTS_CHANNEL`` sees them; other backends dispatch in-process.
+    """
+    pks = list(pks)
+    if pks:
+        transaction.on_commit(lambda: _notify(build_order_events(event, pks)))
+
+
+def publish_removed_orders(event: str, orders) -> None:
+    """
+    Publish ``event`` (``deleted`` or ``archived``) for ``orders`` once the
+    current transaction commits.
+
+    The rows and their tag links are gone by then, so events are built from
+    the instances now and carry no tags. Subscribers get them whatever their
+    ``tags`` and ``is_active`` filters (see ``Subscription.matches``).
+    """
+    events = [
+        {
+            'event': event,
+            'id': order.pk,
+            'inventory_id': order.inventory_id,
+            'start_date': order.start_date,
+            'embargo_date': order.embargo_date,
+            'is_active': order.is_active,
+        }
+        for order in orders
+    ]
+    if events:
+        transaction.on_commit(lambda: _notify(events))
+
+
+def build_order_events(event: str, pks: list) -> list:
+    # Flat rows rather than instances, sweeps publish hundreds at a time.
+    orders = Order.objects.filter(pk__in=pks).values_list(
+        'pk', 'inventory_id', 'start_date', 'embargo_date', 'is_active'
+    )
+    tags = {}
+    for order_id, tag_id in Order.tags.through.objects.filter(order_id__in=pks).values_list('order_id', 'ordertag_id'):
+        tags.setdefault(order_id, []).append(tag_id)
+
+    return [
+        {
+            'event': event,
+            'id': pk,
+            'inventory_id': inventory_id,
+            'start_date': start_date,
+            'embargo_date': embargo_date,
+            'is_active': is_active,
+            'tags': tags.get(pk, []),
+        }
+        for pk, inventory_id, start_date, embargo_date, is_active in orders
+    ]
+
+
+def _notify(events: list) -> None:
+    if connection.vendor != 'postgresql':
+        # The broker and its asyncio machinery are only needed here and by
+        # the SSE app, keep them out of every process that saves an order.
+        from interview.order.broker import broker
+
+        for event in events:
+            broker.dispatch(event)
+        return
+
+    if not events:
+        return
+    # One notification per event, sent in a single round trip.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload',
+            [settings.ORDER_EVENTS_CHANNEL, [json.dumps(event, cls=DjangoJSONEncoder) for event in events]],
+        )
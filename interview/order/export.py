@@ -0,0 +1,32 @@
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef
+
+from interview.core.export import Column, TableExport
+from interview.order.models import Order
+
+
+def order_queryset():
+    tags = Order.tags.through.objects.filter(order_id=OuterRef('pk')).values('ordertag_id')
+
+    return (
+        Order.objects.filter(inventory__deleted_at__isnull=True)
+        .order_by('id')
+        .annotate(tag_ids=ArraySubquery(tags))
+        .values('id', 'inventory_id', 'start_date', 'embargo_date', 'is_active', 'tag_ids', 'created_at', 'updated_at')
+    )
+
+
+order_export = TableExport(
+    'orders',
+    order_queryset,
+    [
+        Column('id', 'int'),
+        Column('inventory_id', 'int'),
+        Column('start_date', 'date'),
+        Column('embargo_date', 'date'),
+        Column('is_active', 'bool'),
+        Column('tags', 'int_list', 'tag_ids'),
+        Column('created_at', 'timestamp'),
+        Column('updated_at', 'timestamp'),
+    ],
+)
@@ -0,0 +1,12 @@
+from interview.core.facets import FacetSet
+from interview.order.models import Order
+
+
+# Orders of soft deleted inventory are left out, as in the order list.
+order_facets = FacetSet('order', Order, base_filters={'inventory__deleted_at__isnull': True}, tags='tags')
+
+ORDER_FACET_FILTERS = {
+    'inventory': 'inventory_id',
+    'is_active': 'is_active',
+    'tags': 'tags__id__in',
+}
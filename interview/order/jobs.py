@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db import transaction
+
+from interview.order.archive import archive_inactive_orders
+from interview.order.embargo import expire_embargoed_orders
+from interview.order.models import Order
+
+
+def bulk_deactivate(job, ids: list) -> dict:
+    batch_size = settings.ORDER_DEACTIVATE_BATCH_SIZE
+    deactivated = 0
+
+    job.set_progress(0, total=len(ids))
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        with transaction.atomic():
+            deactivated += Order.set_is_active(batch, False)
+        job.set_progress(start + len(batch))
+
+    return {'deactivated': deactivated}
+
+
+def archive(job, inactive_days: int = None, batch_size: int = None) -> dict:
+    archived = archive_inactive_orders(
+        inactive_days if inactive_days is not None else settings.ORDER_ARCHIVE_INACTIVE_DAYS,
+        batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE,
+        progress=job.set_progress,
+    )
+
+    return {'archived': archived}
+
+
+def expire_embargoes(job, batch_size: int = None, max_batches: int = None) -> dict:
+    return expire_embargoed_orders(
+        batch_size or settings.ORDER_EMBARGO_BATCH_SIZE,
+        max_batches,
+        progress=job.set_progress,
+    )
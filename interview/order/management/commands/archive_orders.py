@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interview.order.archive import archive_inactive_orders
+
+
+class Command(BaseCommand):
+    help = 'Move long-inactive orders and their tag links to the archive table in batches.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inactive-days', type=int, default=settings.ORDER_ARCHIVE_INACTIVE_DAYS)
+        parser.add_argument('--batch-size', type=int, default=settings.ORDER_ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        archived = archive_inactive_orders(
+            options['inactive_days'],
+            options['batch_size'],
+            options['max_batches'],
+            progress=lambda count: self.stdout.write(f'Archived {count} orders'),
+        )
+        self.stdout.write(f'Done, archived {archived} orders')
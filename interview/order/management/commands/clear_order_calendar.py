@@ -0,0 +1,21 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from interview.order.models import OrderCalendarRollup
+
+
+class Command(BaseCommand):
+    help = 'Drop order calendar rollups so closed periods are aggregated again, e.g. after backdated bulk edits.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, default=None, help='Only periods from this day (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        rollups = OrderCalendarRollup.objects.all()
+        if options['since']:
+            rollups = rollups.filter(period__gte=options['since'])
+        deleted = rollups.delete()[0]
+
+        self.stdout.write(f'Dropped {deleted} rollups')
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from interview.order.embargo import expire_embargoed_orders
+
+
+class Command(BaseCommand):
+    help = 'Deactivate active orders whose embargo date has passed, in batches. Safe to run on several nodes.'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.ORDER_EMBARGO_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        result = expire_embargoed_orders(
+            options['batch_size'],
+            options['max_batches'],
+            progress=lambda count: self.stdout.write(f'Expired {count} orders'),
+        )
+        self.stdout.write(f'Done, expired {result["expired"]} orders in {result["batches"]} batches ({result["seconds"]}s)')
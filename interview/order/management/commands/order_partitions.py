@@ -0,0 +1,83 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from interview.order.models import Order
+from interview.order.partitions import (
+    detach_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    next_period,
+    period_start,
+    scanned_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Maintain the start_date range partitions of the order table: create '
+        'future partitions, list them, detach old ones and check pruning.'
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--premake', type=int, default=settings.ORDER_PARTITION_PREMAKE,
+                            help='Number of future partitions to keep ahead of today.')
+        parser.add_argument('--list', action='store_true', help='List partitions and estimated rows.')
+        parser.add_argument('--detach-before', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                            help='Detach partitions that end on or before this date.')
+        parser.add_argument('--drop', action='store_true',
+                            help='With --detach-before, drop detached partitions and their tag links.')
+        parser.add_argument('--explain', nargs=2, type=date.fromisoformat, metavar=('START', 'END'),
+                            help='Show which partitions a start_date range query scans.')
+
+    def handle(self, *args, **options):
+        table = Order._meta.db_table
+        interval = settings.ORDER_PARTITION_INTERVAL
+        with connection.cursor() as cursor:
+            if connection.vendor != 'postgresql' or not is_partitioned(cursor, table):
+                raise CommandError(f'{table} is not a partitioned table')
+
+            if options['list']:
+                for name, start, end, rows in list_partitions(cursor, table):
+                    bounds = f'{start} .. {end}' if start else 'DEFAULT'
+                    self.stdout.write(f'{name:<32} {bounds:<26} ~{rows} rows')
+                return
+
+            if options['explain']:
+                start, end = options['explain']
+                scanned = scanned_partitions(
+                    cursor,
+                    f'SELECT id FROM {table} WHERE start_date >= %s AND start_date < %s',
+                    [start, end],
+                )
+                total = len(list_partitions(cursor, table))
+                self.stdout.write(f'Scans {len(scanned)} of {total} partitions: {", ".join(scanned)}')
+                return
+
+            if options['detach_before']:
+                self.detach(cursor, table, options['detach_before'], options['drop'])
+                return
+
+            last = period_start(date.today(), interval)
+            for _ in range(options['premake']):
+                last = next_period(last, interval)
+            with transaction.atomic():
+                names = ensure_partitions(cursor, table, date.today(), last, interval)
+            self.stdout.write(f'Partitions present through {last}: {len(names)}')
+
+    def detach(self, cursor, table: str, before: date, drop: bool):
+        tags_table = Order.tags.through._meta.db_table
+        for name, start, end, _ in list_partitions(cursor, table):
+            if end is None or end > before:
+                continue
+
+            with transaction.atomic():
+                detach_partition(cursor, table, name)
+                if drop:
+                    cursor.execute(f'DELETE FROM {tags_table} WHERE order_id IN (SELECT id FROM {name})')
+                    cursor.execute(f'DROP TABLE {name}')
+            self.stdout.write(f'{"Dropped" if drop else "Detached"} {name} ({start} .. {end})')
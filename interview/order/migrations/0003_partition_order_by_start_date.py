@@ -0,0 +1,118 @@
+from datetime import date
+
+from django.db import migrations, models
+
+
+TABLE = "order_order"
+# Frozen copies of ORDER_PARTITION_INTERVAL ('month') and
+# ORDER_PARTITION_PREMAKE when this migration was written, and of the
+# partition helpers, so later changes to either do not change its result.
+# `manage.py order_partitions` takes over from here.
+PREMAKE = 12
+
+
+def _next_month(start):
+    if start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+
+def _create_partitions(execute, first, last):
+    start = date(first.year, first.month, 1)
+    while start <= last:
+        end = _next_month(start)
+        execute(
+            f"CREATE TABLE {TABLE}_p{start:%Y_%m} PARTITION OF {TABLE}_partitioned "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        start = end
+
+
+def _restore_keys(schema_editor, model, primary_key):
+    execute = schema_editor.execute
+    execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    execute(
+        f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    )
+    execute(
+        f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')"
+    )
+    execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY ({primary_key})"
+    )
+    execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_inventory_id_fk_inventory_id "
+        "FOREIGN KEY (inventory_id) REFERENCES inventory_inventory (id) DEFERRABLE INITIALLY DEFERRED"
+    )
+    for statement in schema_editor._model_indexes_sql(model):
+        execute(statement)
+
+
+def partition_orders(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    execute = schema_editor.execute
+    execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    execute(
+        f"CREATE TABLE {TABLE}_partitioned (LIKE {TABLE} INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (start_date)"
+    )
+    execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE}_partitioned DEFAULT")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(start_date), MAX(start_date) FROM {TABLE}")
+        first, last = cursor.fetchone()
+    today = date.today()
+    last = max(last or today, today)
+    last = date(last.year, last.month, 1)
+    for _ in range(PREMAKE):
+        last = _next_month(last)
+    _create_partitions(execute, first or today, last)
+
+    execute(f"INSERT INTO {TABLE}_partitioned SELECT * FROM {TABLE}")
+    # Also drops the tag links' foreign key, which cannot target a partitioned id.
+    execute(f"DROP TABLE {TABLE} CASCADE")
+    execute(f"ALTER TABLE {TABLE}_partitioned RENAME TO {TABLE}")
+    _restore_keys(schema_editor, apps.get_model("order", "Order"), "id, start_date")
+
+
+def unpartition_orders(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    execute = schema_editor.execute
+    execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    execute(f"CREATE TABLE {TABLE}_unpartitioned (LIKE {TABLE})")
+    execute(f"INSERT INTO {TABLE}_unpartitioned SELECT * FROM {TABLE}")
+    execute(f"DROP TABLE {TABLE} CASCADE")
+    execute(f"ALTER TABLE {TABLE}_unpartitioned RENAME TO {TABLE}")
+    _restore_keys(schema_editor, apps.get_model("order", "Order"), "id")
+    execute(
+        "ALTER TABLE order_order_tags ADD CONSTRAINT order_order_tags_order_id_fk_order_order_id "
+        f"FOREIGN KEY (order_id) REFERENCES {TABLE} (id) DEFERRABLE INITIALLY DEFERRED"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0002_order_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="order",
+                    name="tags",
+                    field=models.ManyToManyField(
+                        db_constraint=False, related_name="orders", to="order.ordertag"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(partition_orders, unpartition_orders),
+            ],
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.1.7 on 2026-10-19 05:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0003_inventory_updated_at_index"),
+        ("order", "0003_partition_order_by_start_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("start_date", models.DateField()),
+                ("embargo_date", models.DateField()),
+                ("is_active", models.BooleanField(default=False)),
+                ("tag_ids", models.JSONField(default=list)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["updated_at"],
+                name="order_order_inactive_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedorder",
+            name="inventory",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_orders",
+                to="inventory.inventory",
+            ),
+        ),
+    ]
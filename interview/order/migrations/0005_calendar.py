@@ -0,0 +1,66 @@
+# Generated by Django 4.1.7 on 2026-10-19 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0004_archivedorder"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderCalendarRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "bucket",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week")], max_length=8
+                    ),
+                ),
+                ("period", models.DateField()),
+                ("starting", models.PositiveIntegerField(default=0)),
+                ("embargoed", models.PositiveIntegerField(default=0)),
+                ("tags", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(fields=["start_date"], name="order_archived_start_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(
+                fields=["embargo_date"], name="order_archived_embargo_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["start_date"], name="order_order_start_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["embargo_date"], name="order_order_embargo_date_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ordercalendarrollup",
+            constraint=models.UniqueConstraint(
+                fields=("bucket", "period"), name="order_calendar_rollup_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.7 on 2026-10-19 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0005_calendar"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["embargo_date"],
+                name="order_order_active_embargo_idx",
+            ),
+        ),
+    ]
@@ -18,7 +18,86 @@ class Order(TimestampedModel, IsActiveModel, models.Model):
     )
     start_date = models.DateField()
     embargo_date = models.DateField()
-    tags = models.ManyToManyField(OrderTag, related_name='orders')
+    # No FK constraint from the tag links to orders: order_order is range
+    # partitioned on start_date, so its primary key is (id, start_date).
+    tags = models.ManyToManyField(OrderTag, related_name='orders', db_constraint=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(is_active=False),
+                name='order_order_inactive_idx',
+            ),
+            models.Index(fields=['start_date'], name='order_order_start_date_idx'),
+            models.Index(fields=['embargo_date'], name='order_order_embargo_date_idx'),
+            models.Index(
+                fields=['embargo_date'],
+                condition=models.Q(is_active=True),
+                name='order_order_active_embargo_idx',
+            ),
+        ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        order = super().from_db(db, field_names, values)
+        # The dates as stored, so a save that moves the order out of a closed
+        # calendar period can clear that period too.
+        order.stored_dates = (order.__dict__.get('start_date'), order.__dict__.get('embargo_date'))
+        return order
+
+    def __str__(self) -> str:
+        return f'{self.inventory.name} - {self.start_date}'
+
+
+class ArchivedOrder(models.Model):
+    """Cold copy of a long-inactive order, moved out of the hot order table."""
+    id = models.BigIntegerField(primary_key=True)
+    inventory = models.ForeignKey(
+        Inventory,
+        on_delete=models.CASCADE,
+        related_name='archived_orders'
+    )
+    start_date = models.DateField()
+    embargo_date = models.DateField()
+    is_active = models.BooleanField(default=False)
+    tag_ids = models.JSONField(default=list)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_date'], name='order_archived_start_idx'),
+            models.Index(fields=['embargo_date'], name='order_archived_embargo_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.inventory.name} - {self.start_date} (archived)'
+
+
+class OrderCalendarRollup(models.Model):
+    """
+    Order calendar counts of a closed period, live and archived orders
+    together. ``tags`` maps tag ids to ``[starting, embargoed]``.
+    """
+
+    class Bucket(models.TextChoices):
+        DAY = 'day'
+        WEEK = 'week'
+
+    bucket = models.CharField(max_length=8, choices=Bucket.choices)
+    period = models.DateField()
+    starting = models.PositiveIntegerField(default=0)
+    embargoed = models.PositiveIntegerField(default=0)
+    tags = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'period'], name='order_calendar_rollup_unique'),
+        ]
+
     def __str__(self) -> str:
-        return f'{self.inventory.name} - {self.start_date}'
\ No newline at end of file
+        return f'{self.bucket} {self.period}'
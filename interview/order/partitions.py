@@ -0,0 +1,116 @@
+import json
+import re
+from datetime import date
+
+
+PARTITION_BOUND_RE = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+def period_start(day: date, interval: str) -> date:
+    if interval == 'year':
+        return date(day.year, 1, 1)
+    return date(day.year, day.month, 1)
+
+
+def next_period(start: date, interval: str) -> date:
+    if interval == 'year':
+        return date(start.year + 1, 1, 1)
+    if start.month == 12:
+        return date(start.year + 1, 1, 1)
+    return date(start.year, start.month + 1, 1)
+
+
+def partition_name(table: str, start: date, interval: str) -> str:
+    if interval == 'year':
+        return f'{table}_p{start:%Y}'
+    return f'{table}_p{start:%Y_%m}'
+
+
+def is_partitioned(cursor, table: str) -> bool:
+    cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [table])
+    row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def list_partitions(cursor, table: str) -> list:
+    """``(name, start, end, estimated_rows)`` per partition, start/end None for DEFAULT."""
+    cursor.execute(
+        '''
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid), child.reltuples
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = %s::regclass
+        ORDER BY child.relname
+        ''',
+        [table],
+    )
+    partitions = []
+    for name, bound, rows in cursor.fetchall():
+        match = PARTITION_BOUND_RE.search(bound)
+        start, end = (date.fromisoformat(match[1]), date.fromisoformat(match[2])) if match else (None, None)
+        partitions.append((name, start, end, max(int(rows), 0)))
+
+    return partitions
+
+
+def create_partition(cursor, table: str, start: date, interval: str, parent: str = None) -> str:
+    """
+    Create and attach the partition holding ``[start, next period)``.
+
+    Rows that already landed in the DEFAULT partition for that range are moved
+    into the new partition first, otherwise attaching would fail. ``parent``
+    overrides the table attached to while it is still being built under a
+    temporary name.
+    """
+    parent = parent or table
+    name = partition_name(table, start, interval)
+    end = next_period(start, interval)
+    cursor.execute('SELECT to_regclass(%s)', [name])
+    if cursor.fetchone()[0] is not None:
+        return name
+
+    cursor.execute(f'CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f'''
+        WITH moved AS (
+            DELETE FROM {table}_default WHERE start_date >= %s AND start_date < %s RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+        ''',
+        [start, end],
+    )
+    cursor.execute(f"ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+
+    return name
+
+
+def ensure_partitions(cursor, table: str, first: date, last: date, interval: str, parent: str = None) -> list:
+    created = []
+    start = period_start(first, interval)
+    while start <= last:
+        created.append(create_partition(cursor, table, start, interval, parent))
+        start = next_period(start, interval)
+
+    return created
+
+
+def detach_partition(cursor, table: str, name: str) -> None:
+    cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {name}')
+
+
+def scanned_partitions(cursor, sql: str, params: list) -> list:
+    """Relations the planner keeps for ``sql``, to verify partition pruning."""
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    relations = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if 'Relation Name' in node:
+            relations.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+
+    return sorted(set(relations))
@@ -1,7 +1,9 @@
+from django.conf import settings
 from rest_framework import serializers
-from interview.inventory.serializers import InventorySerializer
+from interview.inventory.models import Inventory
+from interview.inventory.serializers import InventorySerializer, validate_batch_patch_items, validate_references
 
-from interview.order.models import Order, OrderTag
+from interview.order.models import ArchivedOrder, Order, OrderCalendarRollup, OrderTag
 
 
 class OrderTagSerializer(serializers.ModelSerializer):
@@ -17,4 +19,62 @@ class OrderSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Order
-        fields = ['id', 'inventory', 'start_date', 'embargo_date', 'tags', 'is_active']
\ No newline at end of file
+        fields = ['id', 'inventory', 'start_date', 'embargo_date', 'tags', 'is_active', 'updated_at']
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    inventory = InventorySerializer()
+    tags = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedOrder
+        fields = ['id', 'inventory', 'start_date', 'embargo_date', 'tags', 'is_active', 'archived', 'updated_at']
+
+    def get_tags(self, archived_order: ArchivedOrder) -> list:
+        # The view preloads every referenced tag into the context once.
+        tags = self.context['tags']
+        return OrderTagSerializer(
+            [tags[tag_id] for tag_id in archived_order.tag_ids if tag_id in tags], many=True
+        ).data
+
+    def get_archived(self, archived_order: ArchivedOrder) -> bool:
+        return True
+
+
+class OrderBulkDeactivateSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class OrderPatchItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    updated_at = serializers.DateTimeField(required=False)
+    inventory = serializers.IntegerField(required=False)
+    start_date = serializers.DateField(required=False)
+    embargo_date = serializers.DateField(required=False)
+    is_active = serializers.BooleanField(required=False)
+
+
+class OrderBatchPatchSerializer(serializers.Serializer):
+    items = OrderPatchItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, items):
+        validate_batch_patch_items(items)
+        validate_references(('inventory', Inventory, {item['inventory'] for item in items if 'inventory' in item}))
+
+        return items
+
+
+class OrderCalendarQuerySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    bucket = serializers.ChoiceField(choices=OrderCalendarRollup.Bucket.choices, default=OrderCalendarRollup.Bucket.DAY)
+
+    def validate(self, data):
+        if data['end'] < data['start']:
+            raise serializers.ValidationError('end must not be before start')
+        days = 7 if data['bucket'] == OrderCalendarRollup.Bucket.WEEK else 1
+        if (data['end'] - data['start']).days // days + 1 > settings.ORDER_CALENDAR_MAX_PERIODS:
+            raise serializers.ValidationError(f'At most {settings.ORDER_CALENDAR_MAX_PERIODS} periods per request')
+
+        return data
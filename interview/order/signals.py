@@ -0,0 +1,123 @@
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from interview.core.models import Tombstone
+from interview.core.response_cache import response_cache
+from interview.core.signals import is_active_changed, soft_deleted, touch_on_m2m_changed
+from interview.inventory.models import Inventory
+from interview.order.calendar import clear_closed_periods, closed_before
+from interview.order.archive import orders_archived
+from interview.order.events import publish_order_events, publish_removed_orders
+from interview.order.facets import order_facets
+from interview.order.models import ArchivedOrder, Order, OrderTag
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=OrderTag)
+@receiver(orders_archived, sender=Order)
+def update_facets_on_order_delete(sender, **kwargs):
+    # Tag links are removed by the cascade without an m2m_changed signal.
+    order_facets.invalidate()
+
+
+@receiver(soft_deleted, sender=Inventory)
+def update_facets_on_inventory_soft_delete(sender, **kwargs):
+    # Its orders leave the counts along with the list.
+    order_facets.invalidate()
+
+
+@receiver(m2m_changed, sender=Order.tags.through)
+def update_facets_on_order_tags_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    order_facets['tags'].m2m_changed(action, instance, reverse, pk_set)
+
+
+@receiver(post_delete, sender=Order)
+def record_order_tombstone(sender, instance: Order, **kwargs):
+    Tombstone.record('orders', instance.pk)
+
+
+@receiver(m2m_changed, sender=Order.tags.through)
+def touch_order_on_tags_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    touch_on_m2m_changed(Order, 'orders', instance, action, reverse, pk_set)
+
+
+@receiver(post_save, sender=Order)
+def publish_order_saved(sender, instance: Order, created: bool, **kwargs):
+    publish_order_events('created' if created else 'updated', [instance.pk])
+
+
+@receiver(post_delete, sender=Order)
+def publish_order_deleted(sender, instance: Order, **kwargs):
+    publish_removed_orders('deleted', [instance])
+
+
+@receiver(orders_archived, sender=Order)
+def publish_orders_archived(sender, orders: list, **kwargs):
+    publish_removed_orders('archived', orders)
+
+
+@receiver(is_active_changed, sender=Order)
+def publish_order_is_active_changed(sender, pks, is_active: bool, **kwargs):
+    publish_order_events('activated' if is_active else 'deactivated', pks)
+
+
+@receiver(m2m_changed, sender=Order.tags.through)
+def publish_order_tags_changed(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        publish_order_events('updated', [instance.pk])
+    elif pk_set:
+        publish_order_events('updated', pk_set)
+
+
+def _calendar_dates(model, instance) -> list:
+    # Parsed in case the instance was built from strings or datetimes.
+    return [model._meta.get_field(name).to_python(getattr(instance, name)) for name in ('start_date', 'embargo_date')]
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=ArchivedOrder)
+def clear_closed_calendar_periods(sender, instance, **kwargs):
+    # Past periods are cached as rollups, only backdated writes touch them.
+    # A save also clears the periods the order moved out of. Archiving sends
+    # no post_delete, the calendar counts archived orders as well.
+    dates = _calendar_dates(sender, instance)
+    clear_closed_periods(*dates, *getattr(instance, 'stored_dates', ()))
+    if sender is Order:
+        instance.stored_dates = tuple(dates)
+
+
+@receiver(m2m_changed, sender=Order.tags.through)
+def clear_closed_calendar_periods_on_tags_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    # Closed periods also hold per tag counts.
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        clear_closed_periods(*_calendar_dates(Order, instance))
+        return
+    orders = instance.orders.all() if action == 'pre_clear' else Order.objects.filter(id__in=pk_set or ())
+    cutoff = closed_before()
+    closed = orders.filter(Q(start_date__lt=cutoff) | Q(embargo_date__lt=cutoff))
+    clear_closed_periods(*[day for dates in closed.values_list('start_date', 'embargo_date') for day in dates])
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+@receiver(is_active_changed, sender=Order)
+@receiver(m2m_changed, sender=Order.tags.through)
+@receiver(orders_archived, sender=Order)
+@receiver(post_delete, sender=ArchivedOrder)
+def invalidate_order_responses(sender, **kwargs):
+    response_cache.invalidate('orders')
+
+
+@receiver(post_save, sender=OrderTag)
+@receiver(post_delete, sender=OrderTag)
+@receiver(is_active_changed, sender=OrderTag)
+def invalidate_order_tag_responses(sender, **kwargs):
+    response_cache.invalidate('order-tags')
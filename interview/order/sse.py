@@ -0,0 +1,84 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from interview.order.broker import broker
+
+
+def parse_filters(query_string: bytes) -> dict:
+    params = {key: values[-1] for key, values in parse_qs(query_string.decode()).items()}
+    filters = {}
+    if params.get('tags'):
+        filters['tags'] = {int(tag) for tag in params['tags'].split(',') if tag}
+    if params.get('is_active'):
+        filters['is_active'] = params['is_active'].lower() in ('1', 'true', 'yes')
+    if params.get('events'):
+        filters['events'] = set(params['events'].split(','))
+
+    return filters
+
+
+async def order_events_app(scope, receive, send):
+    """
+    ASGI endpoint streaming order events as Server-Sent Events.
+
+    Optional filters: ``?tags=1,2`` (any of), ``?is_active=true|false`` and
+    ``?events=created,updated,activated,deactivated,deleted,archived``.
+    ``deleted`` and ``archived`` events are sent whatever the ``tags`` and
+    ``is_active`` filters.
+    """
+    if scope['method'] != 'GET':
+        await _send_plain(send, 405, b'Method not allowed')
+        return
+
+    try:
+        filters = parse_filters(scope['query_string'])
+    except ValueError:
+        await _send_plain(send, 400, b'Invalid filters')
+        return
+
+    subscription = broker.subscribe(**filters)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n', 'more_body': True})
+
+        while not disconnected.done():
+            received = asyncio.ensure_future(subscription.queue.get())
+            done, _ = await asyncio.wait(
+                {received, disconnected},
+                timeout=settings.ORDER_EVENTS_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if received in done:
+                event = received.result()
+                body = f"event: {event['event']}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+            else:
+                received.cancel()
+                body = ': keepalive\n\n'
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': body.encode(), 'more_body': True})
+    finally:
+        broker.unsubscribe(subscription)
+        disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def _send_plain(send, status: int, body: bytes):
+    await send({'type': 'http.response.start', 'status': status, 'headers': [(b'content-type', b'text/plain')]})
+    await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from interview.order.archive import archive_inactive_orders
+from interview.order.models import Order
+
+
+pytestmark = pytest.mark.django_db
+
+
+def listed(response) -> list:
+    return [order.id for order in response.context['cl'].result_list]
+
+
+@pytest.mark.parametrize('orders', [1, 10])
+def test_order_changelist_queries_do_not_grow_with_rows(admin_client, make_order, max_queries, orders):
+    created = [make_order() for _ in range(orders)]
+
+    # Session, user, the tag filter, the count estimate, the exact count
+    # and the page with its inventory joined in.
+    with max_queries(6):
+        response = admin_client.get('/admin/order/order/')
+
+    assert response.status_code == 200
+    assert sorted(listed(response)) == sorted(order.id for order in created)
+
+
+@pytest.mark.parametrize('orders', [1, 10])
+def test_archived_order_changelist_queries_do_not_grow_with_rows(admin_client, make_order, max_queries, orders):
+    for _ in range(orders):
+        make_order(is_active=False)
+    Order.objects.update(updated_at=timezone.now() - timedelta(days=100))
+    archive_inactive_orders(90, batch_size=100)
+
+    with max_queries(5):
+        response = admin_client.get('/admin/order/archivedorder/')
+
+    assert response.status_code == 200
+    assert len(listed(response)) == orders
+
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from interview.core.models import Tombstone
+from interview.order import events
+from interview.order.archive import archive_inactive_orders
+from interview.order.models import ArchivedOrder, Order
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_archiving_publishes_archived_and_leaves_no_tombstone(
+    make_order, order_tag, monkeypatch, django_capture_on_commit_callbacks
+):
+    published = []
+    monkeypatch.setattr(events, '_notify', published.extend)
+    order, active = make_order(is_active=False), make_order()
+    order.tags.add(order_tag)
+    Order.objects.filter(pk__in=[order.pk, active.pk]).update(updated_at=timezone.now() - timedelta(days=100))
+    published.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert archive_inactive_orders(90, batch_size=10) == 1
+
+    assert list(Order.objects.values_list('pk', flat=True)) == [active.pk]
+    assert ArchivedOrder.objects.get().tag_ids == [order_tag.pk]
+    assert not Tombstone.objects.exists()
+    assert [(event['event'], event['id']) for event in published] == [('archived', order.pk)]
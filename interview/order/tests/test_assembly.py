@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+from django.db import connections
+
+from interview.core.fanout import fan_out
+from interview.order import assembly
+from interview.order.assembly import assemble_orders
+from interview.order.models import Order
+from interview.order.serializers import OrderSerializer
+
+
+# Outside a transaction, so fan_out goes through the pool.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test_assembled_orders_match_the_serializer(
+    settings, monkeypatch, make_order, make_inventory, order_tag, inventory_tag
+):
+    settings.FAN_OUT_WORKERS = 2
+    first, second = make_order(), make_order(inventory=make_inventory('Aliens'))
+    first.tags.add(order_tag)
+    first.inventory.tags.add(inventory_tag)
+    threads = []
+    inventories = assembly._inventories
+    monkeypatch.setattr(
+        assembly, '_inventories', lambda ids: threads.append(threading.current_thread().name) or inventories(ids)
+    )
+    orders = list(Order.objects.order_by('id'))
+
+    assert assemble_orders(orders) == OrderSerializer(orders, many=True).data
+    assert threads[0].startswith('fan-out')
+
+
+def test_pool_threads_close_their_connections(settings):
+    settings.FAN_OUT_WORKERS = 2
+    used = []
+
+    def query():
+        used.append(connections['default'])
+        return Order.objects.count()
+
+    assert fan_out(query, query) == [0, 0]
+    # CONN_MAX_AGE is 0, so no connection is kept once a task is done.
+    assert all(connection.connection is None for connection in used)
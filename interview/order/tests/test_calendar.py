@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+
+from interview.order.archive import archive_inactive_orders
+from interview.order.batch import batch_patch_orders
+from interview.order.calendar import order_calendar
+from interview.order.models import Order, OrderCalendarRollup
+
+
+pytestmark = pytest.mark.django_db
+
+JANUARY, MARCH = date(2023, 1, 10), date(2023, 3, 10)
+
+
+def rolled_up() -> set:
+    return set(OrderCalendarRollup.objects.filter(bucket='day').values_list('period', flat=True))
+
+
+@pytest.fixture
+def rollups(order):
+    def build():
+        order_calendar(JANUARY, JANUARY, 'day')
+        order_calendar(MARCH, MARCH, 'day')
+        return rolled_up()
+
+    return build
+
+
+def test_moving_an_order_clears_the_period_it_left(order, rollups):
+    order = Order.objects.get(pk=order.pk)
+    assert rollups() == {JANUARY, MARCH}
+
+    order.start_date = MARCH
+    order.save()
+
+    assert rolled_up() == set()
+
+
+def test_batch_patch_clears_old_and_new_periods(order, rollups):
+    assert rollups() == {JANUARY, MARCH}
+
+    batch_patch_orders([{'id': order.pk, 'start_date': MARCH}])
+
+    assert rolled_up() == set()
+
+
+def test_tag_changes_clear_the_order_periods(order, order_tag, rollups):
+    assert rollups() == {JANUARY, MARCH}
+    order.tags.add(order_tag)
+    assert rolled_up() == {MARCH}
+
+    assert rollups() == {JANUARY, MARCH}
+    order_tag.orders.clear()
+    assert rolled_up() == {MARCH}
+
+
+def test_archiving_keeps_rollups(make_order, rollups):
+    make_order(is_active=False)
+    assert rollups() == {JANUARY, MARCH}
+    Order.objects.update(updated_at=timezone.now() - timedelta(days=100))
+
+    assert archive_inactive_orders(90, batch_size=10) == 1
+    assert rolled_up() == {JANUARY, MARCH}
+
+
+def test_tagging_an_order_built_from_datetimes(make_order, order_tag, rollups):
+    assert rollups() == {JANUARY, MARCH}
+    order = make_order(start_date=timezone.now() - timedelta(days=30), embargo_date=timezone.now())
+
+    order.tags.add(order_tag)
+    assert rolled_up() == {JANUARY, MARCH}
@@ -0,0 +1,114 @@
+from datetime import date
+
+import pytest
+from django.db import connection, connections
+
+from interview.core.response_cache import response_cache
+from interview.order import events
+from interview.order.embargo import expire_embargoed_orders
+from interview.order.models import Order
+
+
+TODAY = date(2023, 3, 1)
+
+
+@pytest.fixture
+def published(monkeypatch):
+    notified = []
+    monkeypatch.setattr(events, '_notify', notified.extend)
+    return notified
+
+
+def active_ids() -> set:
+    return set(Order.objects.filter(is_active=True).values_list('id', flat=True))
+
+
+@pytest.mark.django_db
+def test_only_active_orders_past_their_embargo_expire(make_order):
+    lapsed = make_order()
+    make_order(is_active=False)
+    running = make_order(embargo_date=date(2023, 4, 1))
+    due_today = make_order(embargo_date=TODAY)
+
+    metrics = expire_embargoed_orders(batch_size=10, today=TODAY)
+
+    assert metrics['expired'] == 1
+    assert metrics['batches'] == 1
+    assert metrics['seconds'] >= 0
+    assert active_ids() == {running.id, due_today.id}
+    assert not Order.objects.get(id=lapsed.id).is_active
+
+
+@pytest.mark.django_db
+def test_batches_are_bounded(make_order):
+    for _ in range(5):
+        make_order()
+    progress = []
+
+    metrics = expire_embargoed_orders(batch_size=2, max_batches=2, today=TODAY, progress=progress.append)
+
+    assert (metrics['expired'], metrics['batches']) == (4, 2)
+    assert progress == [2, 4]
+    assert len(active_ids()) == 1
+
+    metrics = expire_embargoed_orders(batch_size=2, today=TODAY)
+    assert (metrics['expired'], metrics['batches']) == (1, 1)
+    assert active_ids() == set()
+
+
+@pytest.mark.django_db
+def test_expired_orders_are_published_and_invalidate_responses(
+    make_order, published, monkeypatch, django_capture_on_commit_callbacks
+):
+    order = make_order()
+    published.clear()
+    invalidated = []
+    monkeypatch.setattr(response_cache, 'invalidate', lambda *tags: invalidated.extend(tags))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        expire_embargoed_orders(batch_size=10, today=TODAY)
+
+    assert [(event['event'], event['id'], event['is_active']) for event in published] == [
+        ('deactivated', order.id, False)
+    ]
+    assert 'orders' in invalidated
+
+
+@pytest.mark.django_db
+def test_expired_orders_reach_the_change_feed(api_client, settings, make_order):
+    settings.CHANGES_FEED_SAFETY_LAG = 0
+    order = make_order()
+    updated_at = order.updated_at
+    token = api_client.get('/changes/orders/').data['next']
+
+    expire_embargoed_orders(batch_size=10, today=TODAY)
+
+    assert Order.objects.get(id=order.id).updated_at > updated_at
+    response = api_client.get('/changes/orders/', {'since': token})
+    assert [(row['id'], row['is_active']) for row in response.data['changed']] == [(order.id, False)]
+
+
+@pytest.fixture
+def other_session():
+    other = connections.create_connection('default')
+    yield other
+    other.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rows_locked_elsewhere_are_skipped(make_order, other_session):
+    locked, free = make_order(), make_order()
+    with connection.cursor() as cursor:
+        # Fail rather than hang should the sweep wait for the lock.
+        cursor.execute("SET lock_timeout = '5s'")
+
+    with other_session.cursor() as cursor:
+        cursor.execute('BEGIN')
+        cursor.execute(f'SELECT id FROM {Order._meta.db_table} WHERE id = %s FOR UPDATE', [locked.id])
+        metrics = expire_embargoed_orders(batch_size=10, today=TODAY)
+        cursor.execute('ROLLBACK')
+
+    assert metrics['expired'] == 1
+    assert active_ids() == {locked.id}
+    assert expire_embargoed_orders(batch_size=10, today=TODAY)['expired'] == 1
+    assert active_ids() == set()
@@ -0,0 +1,39 @@
+import pytest
+
+from interview.order import events
+from interview.order.broker import Subscription
+
+
+@pytest.fixture
+def published(monkeypatch):
+    notified = []
+    monkeypatch.setattr(events, '_notify', notified.extend)
+    return notified
+
+
+@pytest.mark.django_db
+def test_deleted_event_carries_the_order_as_it_was(order, published, django_capture_on_commit_callbacks):
+    order_id = order.pk
+    order.is_active = False
+    order.save()
+    published.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        order.delete()
+
+    assert published == [{
+        'event': 'deleted',
+        'id': order_id,
+        'inventory_id': order.inventory_id,
+        'start_date': order.start_date,
+        'embargo_date': order.embargo_date,
+        'is_active': False,
+    }]
+
+
+def test_deleted_events_pass_tag_and_state_filters():
+    subscription = Subscription(None, tags={1}, is_active=True)
+
+    assert subscription.matches({'event': 'deleted', 'id': 1, 'is_active': False})
+    assert not subscription.matches({'event': 'updated', 'id': 1, 'is_active': True, 'tags': [2]})
+    assert not Subscription(None, events={'created'}).matches({'event': 'deleted', 'id': 1, 'is_active': True})
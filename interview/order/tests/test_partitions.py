@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+
+from interview.order.models import Order
+from interview.order.partitions import (
+    ensure_partitions,
+    list_partitions,
+    next_period,
+    partition_name,
+    period_start,
+    scanned_partitions,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+TABLE = Order._meta.db_table
+
+
+@pytest.fixture
+def cursor():
+    with connection.cursor() as cursor:
+        ensure_partitions(cursor, TABLE, date(2023, 1, 1), date(2023, 12, 1), 'month')
+        yield cursor
+
+
+@pytest.mark.parametrize('start, end, expected', [
+    (date(2023, 1, 1), date(2023, 2, 1), ['order_order_p2023_01']),
+    (date(2023, 1, 15), date(2023, 3, 10), ['order_order_p2023_01', 'order_order_p2023_02', 'order_order_p2023_03']),
+    (date(2023, 12, 20), date(2024, 1, 5), ['order_order_default', 'order_order_p2023_12']),
+])
+def test_start_date_ranges_scan_only_their_partitions(cursor, start, end, expected):
+    scanned = scanned_partitions(cursor, f'SELECT id FROM {TABLE} WHERE start_date >= %s AND start_date < %s', [start, end])
+
+    assert scanned == expected
+
+
+def test_orm_start_date_filters_are_pruned(cursor):
+    sql, params = Order.objects.filter(start_date__range=(date(2023, 5, 1), date(2023, 5, 31))).query.sql_with_params()
+
+    assert scanned_partitions(cursor, sql, params) == ['order_order_p2023_05']
+
+
+def test_migration_partitions_follow_the_maintenance_command_naming(cursor):
+    # The migration made monthly partitions from today, keep 12 ahead.
+    start = period_start(date.today(), 'month')
+    expected = []
+    for _ in range(13):
+        expected.append((partition_name(TABLE, start, 'month'), start, next_period(start, 'month')))
+        start = next_period(start, 'month')
+
+    partitions = {name: (start, end) for name, start, end, _ in list_partitions(cursor, TABLE)}
+    assert [(name, *partitions.get(name, (None, None))) for name, _, _ in expected] == expected
@@ -0,0 +1,123 @@
+"""
+Every order endpoint with a ``query_budget``. The test plugin runs requests
+in raise mode, so a view going over its budget fails here.
+"""
+import datetime
+
+import pytest
+
+from interview.core.models import Job
+from interview.order.models import ArchivedOrder, Order
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def orders(make_order, order_tag):
+    made = [make_order(start_date=datetime.date(2023, 1, day)) for day in (10, 11, 12)]
+    for order in made:
+        order.tags.add(order_tag)
+    return made
+
+
+def test_list(api_client, orders):
+    response = api_client.get('/orders/', {'limit': 2})
+    assert response.status_code == 200
+    assert [order['id'] for order in response.data['results']] == [orders[0].id, orders[1].id]
+
+    response = api_client.get('/orders/', {'ids': f'{orders[1].id}', 'include_archived': 'true'})
+    assert response.status_code == 200
+
+
+def test_list_with_archived_pages_across_both_tables(api_client, orders, order_tag):
+    ArchivedOrder.objects.create(
+        id=orders[1].id, inventory=orders[1].inventory, start_date=orders[1].start_date,
+        embargo_date=orders[1].embargo_date, is_active=False, tag_ids=[order_tag.id],
+        created_at=orders[1].created_at, updated_at=orders[1].updated_at,
+    )
+    Order.objects.filter(id=orders[1].id).delete()
+
+    response = api_client.get('/orders/', {'include_archived': 'true', 'limit': 2})
+    assert response.status_code == 200
+    assert [(order['id'], order['archived']) for order in response.data['results']] == [
+        (orders[0].id, False), (orders[1].id, True)
+    ]
+    assert response.data['count'] == 3
+    assert response.data['results'][1]['tags'][0]['name'] == 'QC'
+
+    response = api_client.get(response.data['next'])
+    assert [order['id'] for order in response.data['results']] == [orders[2].id]
+    assert response.data['next'] is None
+
+
+def test_list_with_archived_needs_a_limit(api_client, orders):
+    response = api_client.get('/orders/', {'include_archived': 'true'})
+
+    assert response.status_code == 400
+
+
+def test_create_rejects_invalid_orders(api_client):
+    response = api_client.post('/orders/', {'start_date': 'soon'}, format='json')
+
+    assert response.status_code == 400
+
+
+def test_tags(api_client):
+    response = api_client.post('/orders/tags/', {'name': 'Rush'}, format='json')
+    assert response.status_code == 201
+
+    response = api_client.get('/orders/tags/')
+    assert response.status_code == 200
+
+
+def test_facets(api_client, orders, order_tag):
+    assert api_client.get('/orders/facets/').status_code == 200
+    assert api_client.get('/orders/facets/', {'tags': order_tag.id}).status_code == 200
+
+
+def test_facets_leave_out_orders_of_deleted_inventory(
+    api_client, orders, order_tag, make_order, make_inventory, django_capture_on_commit_callbacks
+):
+    deleted = make_order(inventory=make_inventory('Aliens'))
+    deleted.tags.add(order_tag)
+    expected = {'tags': [{'id': order_tag.id, 'count': 4}]}
+    assert api_client.get('/orders/facets/').data == expected
+
+    with django_capture_on_commit_callbacks(execute=True):
+        deleted.inventory.soft_delete()
+
+    expected = {'tags': [{'id': order_tag.id, 'count': 3}]}
+    assert api_client.get('/orders/facets/').data == expected
+    assert api_client.get('/orders/facets/', {'is_active': 'true'}).data == expected
+
+
+def test_calendar(api_client, orders):
+    response = api_client.get('/orders/calendar/', {'start': '2023-01-01', 'end': '2023-01-31'})
+
+    assert response.status_code == 200
+
+
+def test_changes(api_client, orders, settings):
+    settings.CHANGES_FEED_SAFETY_LAG = 0
+
+    response = api_client.get('/changes/orders/')
+
+    assert response.status_code == 200
+    assert len(response.data['changed']) == 3
+
+
+def test_deactivate(api_client, orders):
+    response = api_client.post('/orders/deactivate/', {'ids': [order.id for order in orders]}, format='json')
+
+    assert response.status_code == 202
+    assert Job.objects.get().kind == 'order.deactivate'
+
+
+def test_batch_patch(api_client, orders):
+    items = [{'id': order.id, 'embargo_date': '2023-03-01'} for order in orders]
+
+    response = api_client.patch('/orders/batch/', items, format='json')
+
+    assert response.status_code == 200
+    assert set(Order.objects.values_list('embargo_date', flat=True)) == {datetime.date(2023, 3, 1)}
@@ -1,9 +1,13 @@
 
 from django.urls import path
-from interview.order.views import OrderListCreateView, OrderTagListCreateView
+from interview.order.views import OrderBatchPatchView, OrderBulkDeactivateView, OrderCalendarView, OrderFacetsView, OrderListCreateView, OrderTagListCreateView
 
 
 urlpatterns = [
+    path('batch/', OrderBatchPatchView.as_view(), name='order-batch'),
+    path('calendar/', OrderCalendarView.as_view(), name='order-calendar'),
+    path('deactivate/', OrderBulkDeactivateView.as_view(), name='order-deactivate'),
+    path('facets/', OrderFacetsView.as_view(), name='order-facets'),
     path('tags/', OrderTagListCreateView.as_view(), name='order-detail'),
     path('', OrderListCreateView.as_view(), name='order-list'),
 
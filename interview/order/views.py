@@ -1,15 +1,214 @@
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import generics
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
-from interview.order.models import Order, OrderTag
-from interview.order.serializers import OrderSerializer, OrderTagSerializer
+from interview.core.batch import BatchPatchError
+from interview.core.changes import ChangeFeedView
+from interview.core.counts import cached_count
+from interview.core.facets import parse_facet_filters, serialize_counts
+from interview.core.jobs import enqueue
+from interview.core.multiget import multiget_data, parse_ids
+from interview.core.pagination import CountStrategyPagination
+from interview.core.response_cache import cache_response
+from interview.core.serializers import JobSerializer
+from interview.order.assembly import assemble_orders
+from interview.order.batch import batch_patch_orders
+from interview.order.calendar import order_calendar
+from interview.order.facets import ORDER_FACET_FILTERS, order_facets
+from interview.order.models import ArchivedOrder, Order, OrderTag
+from interview.order.serializers import ArchivedOrderSerializer, OrderBatchPatchSerializer, OrderBulkDeactivateSerializer, OrderCalendarQuerySerializer, OrderSerializer, OrderTagSerializer
 
 # Create your views here.
 class OrderListCreateView(generics.ListCreateAPIView):
-    queryset = Order.objects.all()
+    # Related rows are fetched concurrently by assemble_orders, not joined here.
+    queryset = Order.objects.filter(inventory__deleted_at__isnull=True).order_by('id')
     serializer_class = OrderSerializer
+    pagination_class = CountStrategyPagination
+    count_tags = ('orders', 'inventory')
+    # include_archived pages also read and count the archive.
+    query_budget = {'get': 12, 'post': 8}
+    throttle_scope = {'get': 'expensive', 'post': 'cheap'}
+    archived_queryset = ArchivedOrder.objects.filter(inventory__deleted_at__isnull=True).select_related(
+        'inventory__type', 'inventory__language'
+    ).prefetch_related('inventory__tags')
+
+    @cache_response('orders', 'order-tags', 'inventory', 'inventory-tags', 'inventory-types', 'inventory-languages')
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        include_archived = request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+        try:
+            ids = parse_ids(request.query_params.get('ids'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        if ids is not None:
+            return self.multi_get(ids, include_archived)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if include_archived:
+            return self.list_with_archived(request, queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(assemble_orders(page))
+        return Response(assemble_orders(list(queryset)), status=200)
+
+    def list_with_archived(self, request: Request, queryset) -> Response:
+        """
+        Live and archived orders as one stream ordered by id, which archival
+        keeps. It is paged by keyset, ``?limit=`` with ``?after=<last id>``,
+        so a page reads at most ``limit + 1`` rows from each table.
+        """
+        paginator = self.pagination_class()
+        paginator.max_limit = settings.PAGINATION_MAX_LIMIT
+        try:
+            limit = paginator.get_limit(request)
+            after = int(request.query_params.get('after', 0))
+        except ValueError:
+            return Response({'error': 'after must be an order id'}, status=400)
+        if limit is None:
+            return Response({'error': 'include_archived needs a limit'}, status=400)
+
+        orders = list(queryset.filter(id__gt=after).order_by('id')[:limit + 1])
+        archived = list(self.archived_queryset.filter(id__gt=after).order_by('id')[:limit + 1])
+        page = sorted([*orders, *archived], key=lambda order: order.id)
+        has_next, page = len(page) > limit, page[:limit]
+        page_ids = {order.id for order in page}
+
+        live = assemble_orders([order for order in orders if order.id in page_ids])
+        for order in live:
+            order['archived'] = False
+        results = sorted(
+            [*live, *self.serialize_archived([order for order in archived if order.id in page_ids])],
+            key=lambda order: order['id'],
+        )
+        live_count, live_exact = cached_count(queryset, self.count_tags)
+        archived_count, archived_exact = cached_count(self.archived_queryset, self.count_tags)
+        next_link = None
+        if has_next:
+            url = replace_query_param(request.build_absolute_uri(), paginator.limit_query_param, limit)
+            next_link = replace_query_param(url, 'after', page[-1].id)
+
+        return Response({
+            'count': live_count + archived_count,
+            'count_exact': live_exact and archived_exact,
+            'next': next_link,
+            'previous': None,
+            'results': results,
+        }, status=200)
+
+    def multi_get(self, ids: list, include_archived: bool) -> Response:
+        orders = assemble_orders(list(self.get_queryset().filter(id__in=ids)))
+        found = {order['id']: order for order in orders}
+        missing = [pk for pk in ids if pk not in found]
+        if include_archived:
+            for order in found.values():
+                order['archived'] = False
+            if missing:
+                archived = self.serialize_archived(self.archived_queryset.filter(id__in=missing))
+                found.update({order['id']: order for order in archived})
+
+        return Response(multiget_data(ids, found), status=200)
+
+    def serialize_archived(self, archived_orders) -> list:
+        archived_orders = list(archived_orders)
+        tag_ids = {tag_id for archived_order in archived_orders for tag_id in archived_order.tag_ids}
+        return ArchivedOrderSerializer(
+            archived_orders, many=True, context={'tags': OrderTag.objects.in_bulk(tag_ids)}
+        ).data
     
 
 class OrderTagListCreateView(generics.ListCreateAPIView):
     queryset = OrderTag.objects.all()
+    query_budget = {'get': 1, 'post': 2}
+    throttle_scope = 'cheap'
     serializer_class = OrderTagSerializer
+
+
+class OrderFacetsView(APIView):
+    queryset = Order.objects.filter(inventory__deleted_at__isnull=True)
+    query_budget = 4
+    throttle_scope = 'expensive'
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            filters = parse_facet_filters(request.query_params, ORDER_FACET_FILTERS)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        counts = order_facets.counts(self.get_queryset().filter(**filters), filters)
+
+        return Response(serialize_counts(counts), status=200)
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+
+class OrderCalendarView(APIView):
+    serializer_class = OrderCalendarQuerySerializer
+    query_budget = 4
+    throttle_scope = 'cheap'
+
+    @cache_response('orders', 'order-tags')
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        periods = order_calendar(**serializer.validated_data)
+        tag_ids = {int(tag_id) for period in periods for tag_id in period['tags']}
+        tags = OrderTag.objects.filter(id__in=tag_ids).order_by('id').values('id', 'name') if tag_ids else []
+
+        # Per period tag counts are keyed by tag id, names are listed once.
+        return Response({**serializer.data, 'tags': list(tags), 'periods': periods}, status=200)
+
+
+class OrderChangesView(ChangeFeedView):
+    resource = 'orders'
+    queryset = Order.objects.filter(inventory__deleted_at__isnull=True).select_related(
+        'inventory__type', 'inventory__language'
+    ).prefetch_related('tags', 'inventory__tags')
+    serializer_class = OrderSerializer
+    query_budget = 6
+    throttle_scope = 'expensive'
+
+
+class OrderBulkDeactivateView(APIView):
+    serializer_class = OrderBulkDeactivateSerializer
+    query_budget = 2
+    throttle_scope = 'expensive'
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        job = enqueue('order.deactivate', ids=serializer.validated_data['ids'])
+
+        return Response(JobSerializer(job).data, status=202)
+
+
+class OrderBatchPatchView(APIView):
+    serializer_class = OrderBatchPatchSerializer
+    # Grows with the distinct sets of changed fields, not with the patches.
+    query_budget = 20
+    throttle_scope = 'expensive'
+
+    def patch(self, request: Request, *args, **kwargs) -> Response:
+        data = {'items': request.data} if isinstance(request.data, list) else request.data
+        serializer = self.serializer_class(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+
+        try:
+            result = batch_patch_orders(serializer.validated_data['items'])
+        except BatchPatchError as e:
+            return Response({'error': str(e), 'errors': e.errors}, status=e.status)
+        result.pop('changed')
+
+        return Response(result, status=200)